@@ -2,7 +2,7 @@ import zipfile
 import os
 
 PACKAGE_NAME = "vibe_patch_offline_bundle.zip"
-EXCLUDE_DIRS = {"VibeBackups", "__pycache__"}
+EXCLUDE_DIRS = {"VibeBackups", "__pycache__", ".vibe_cache"}
 EXTRA_DIRS = ["static", "ui", "tests", "fonts"]
 EXTRA_FILES = ["requirements.txt", "README.md", "server.py"]
 
@@ -12,15 +12,27 @@ import logging
 import re
 import os
 import tempfile
+import textwrap
 import argparse
 import shutil
-import subprocess
+import hashlib
+import codecs
+import base64
+import bisect
+import datetime
+import heapq
+import itertools
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from dotenv import load_dotenv
 import google.generativeai as genai
 
 # Make sure send_from_directory is imported
-from flask import Flask, request, send_from_directory, Response, jsonify
+from flask import Flask, request, send_file, send_from_directory, Response, jsonify
 # Assuming vibe_cli is importable and contains _backup
 
 # Setup basic logging config first to ensure messages are seen
@@ -94,6 +106,11 @@ else:
     genai_configured = False
 # --- End Global Configuration for GenAI ---
 
+from vibe_llm import (AdaptiveLimiter, GenerationBusy, GenerationPool, GenerationTimeout,
+                      HedgeCancelled, HedgePolicy, SingleFlight, hedged_call)
+from vibe_providers import (GenerationRequest, ProviderError, build_registry, is_rate_limited,
+                            retry_after_seconds)
+
 
 # -----------------------------------------------------------------------------
 #  Flask setup
@@ -149,7 +166,248 @@ Always output only the patch YAML content. No extra text.
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-app = Flask(__name__)
+# Offline, deterministic provider for tests and benchmarks; never shown
+# in the UI unless explicitly enabled.
+MOCK_LLM_ENABLED = os.getenv("VIBE_ENABLE_MOCK_LLM", "").lower() in ("1", "true", "yes")
+
+# Token budget for the file context sent with /generate-patch prompts.
+# Larger files are sliced to the symbols relevant to the request.
+try:
+    CONTEXT_TOKEN_BUDGET = int(os.getenv("VIBE_CONTEXT_TOKEN_BUDGET", "6000"))
+except ValueError:
+    CONTEXT_TOKEN_BUDGET = 6000
+# Model used for each provider; part of the response cache key.
+LLM_MODELS = {
+    "gemini": os.getenv("VIBE_GEMINI_MODEL", "gemini-1.5-flash-latest"),
+    "anthropic": os.getenv("VIBE_ANTHROPIC_MODEL", "claude-3-opus-20240229"),
+    "openai": os.getenv("VIBE_OPENAI_MODEL", "gpt-4-turbo-preview"),
+    "mock": "mock",
+}
+
+# Responses generated under a different system prompt must not be served
+# from the cache, so its hash is part of every cache key.
+SYSTEM_PROMPT_VERSION = hashlib.sha256(VIBE_SYSTEM_PROMPT.encode('utf-8')).hexdigest()[:12]
+
+
+def _env_int(name, default):
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+# One long-lived client per provider, shared by every request. Clients are
+# created on first use, or at startup by the warm-up thread (see __main__).
+LLM_TIMEOUT = _env_int("VIBE_LLM_TIMEOUT", 120)
+# Longest wait for the next chunk of a provider stream; a stalled stream
+# holds its pool thread at most this long after the deadline.
+LLM_READ_TIMEOUT = _env_int("VIBE_LLM_READ_TIMEOUT", 30)
+LLM_PROVIDERS = build_registry(
+    {"gemini": GOOGLE_API_KEY, "anthropic": ANTHROPIC_API_KEY, "openai": OPENAI_API_KEY},
+    LLM_MODELS, mock_enabled=MOCK_LLM_ENABLED,
+    mock_latency_ms=_env_int("VIBE_MOCK_LLM_LATENCY_MS", 0), timeout=LLM_TIMEOUT,
+    read_timeout=LLM_READ_TIMEOUT)
+# Provider calls run here, never on the HTTP threads that serve /file,
+# /apply and /versions; excess generations are rejected with 503.
+LLM_POOL = GenerationPool(workers=_env_int("VIBE_LLM_WORKERS", 4), timeout=LLM_TIMEOUT)
+# Concurrent identical generations (same response cache key) share one call.
+LLM_FLIGHTS = SingleFlight()
+# Hedging: if the primary provider is slower than its recent
+# VIBE_HEDGE_PERCENTILE latency, /generate-patch also asks
+# VIBE_HEDGE_PROVIDER (or the request's "hedge" provider).
+HEDGE_PROVIDER = os.getenv("VIBE_HEDGE_PROVIDER") or None
+# Automatic re-prompts when a generated patch fails its dry run.
+REPAIR_ATTEMPTS = _env_int("VIBE_REPAIR_ATTEMPTS", 2)
+# Upper bound on a request's own "repair" count; each attempt is a provider call.
+MAX_REPAIR_ATTEMPTS = max(REPAIR_ATTEMPTS, _env_int("VIBE_MAX_REPAIR_ATTEMPTS", 5))
+# /generate-patch/batch limits.
+BATCH_MAX_ITEMS = _env_int("VIBE_BATCH_MAX_ITEMS", 200)
+BATCH_CONCURRENCY = _env_int("VIBE_BATCH_CONCURRENCY", 4)
+BATCH_RATE_LIMIT_RETRIES = _env_int("VIBE_BATCH_RATE_LIMIT_RETRIES", 5)
+BATCH_API_TIMEOUT = _env_int("VIBE_BATCH_API_TIMEOUT", 3600)
+LLM_HEDGE = HedgePolicy(percentile=_env_int("VIBE_HEDGE_PERCENTILE", 95),
+                        default_delay_ms=_env_int("VIBE_HEDGE_DELAY_MS", 8000),
+                        min_samples=_env_int("VIBE_HEDGE_MIN_SAMPLES", 20))
+# HTTP worker threads when served by waitress.
+HTTP_THREADS = _env_int("VIBE_HTTP_THREADS", 16)
+# /events streams hold an HTTP thread each; beyond this many, clients get
+# a 503 and simply go without live updates.
+EVENT_STREAMS_MAX = _env_int("VIBE_EVENT_STREAMS", max(1, HTTP_THREADS // 2))
+_EVENT_STREAM_SLOTS = threading.BoundedSemaphore(EVENT_STREAMS_MAX)
+
+# /static is served by static_asset() below (precompressed, hashed).
+app = Flask(__name__, static_folder=None)
+
+# Symbol index over BASE_DIR, created on first use (BASE_DIR is only final
+# once the command line has been parsed).
+_SYMBOL_INDEX = None
+
+
+def _symbol_index():
+    global _SYMBOL_INDEX
+    if _SYMBOL_INDEX is None or _SYMBOL_INDEX.base_dir != BASE_DIR.resolve():
+        from vibe_index import SymbolIndex
+        _SYMBOL_INDEX = SymbolIndex(BASE_DIR)
+    return _SYMBOL_INDEX
+
+
+def _cache_dir():
+    """BASE_DIR/.vibe_cache, created with a .gitignore so git ignores it."""
+    from vibe_index import CACHE_DIRNAME, ensure_cache_dir
+    return ensure_cache_dir(BASE_DIR / CACHE_DIRNAME)
+
+
+_RESPONSE_CACHE = None
+
+
+def _response_cache():
+    """Persistent /generate-patch response cache under BASE_DIR/.vibe_cache."""
+    global _RESPONSE_CACHE
+    if _RESPONSE_CACHE is None:
+        from vibe_llm import ResponseCache
+        _RESPONSE_CACHE = ResponseCache(
+            _cache_dir() / "llm_responses.sqlite3",
+            ttl=_env_int("VIBE_LLM_CACHE_TTL", 7 * 24 * 3600),
+            max_bytes=_env_int("VIBE_LLM_CACHE_MAX_MB", 64) * 1024 * 1024)
+    return _RESPONSE_CACHE
+
+
+# Cache shared by worker processes: autopep8 results, parsed patch bundles
+# and /versions listings. Memory-only unless --workers > 1 (or
+# VIBE_SHARED_STORE=1), in which case it is backed by a SQLite file.
+SHARED_STORE_PERSISTENT = os.getenv("VIBE_SHARED_STORE", "").lower() in ("1", "true", "yes")
+_SHARED_STORE = None
+
+
+def _shared_store():
+    global _SHARED_STORE
+    if _SHARED_STORE is None:
+        from vibe_store import SharedStore
+        path = _cache_dir() / "shared_store.sqlite3" if SHARED_STORE_PERSISTENT else None
+        _SHARED_STORE = SharedStore(path)
+        vibe_cli.set_format_cache(_SHARED_STORE)
+    return _SHARED_STORE
+
+
+# Monaco and other UI assets; compressed variants are built at startup
+# (or ahead of time with `python vibe_static.py`).
+_STATIC_ASSETS = None
+MONACO_CDN_BASE = 'https://cdn.jsdelivr.net/npm/monaco-editor@0.47.0/min/vs'
+MONACO_LOCAL_BASE = '/static/monaco/min/vs'
+
+
+def _static_assets():
+    global _STATIC_ASSETS
+    if _STATIC_ASSETS is None:
+        from vibe_static import StaticAssets
+        _STATIC_ASSETS = StaticAssets(STATIC_DIR / 'static', STATIC_DIR / '.vibe_cache' / 'static')
+    return _STATIC_ASSETS
+
+
+def _local_monaco():
+    """The vendored Monaco tree is only usable with its editor bundle."""
+    return (STATIC_DIR / 'static' / 'monaco' / 'min' / 'vs' / 'editor' / 'editor.main.js').is_file()
+
+
+def _build_static_assets():
+    try:
+        _static_assets().build()
+    except Exception as e:
+        logging.warning(f"Static asset build failed; serving uncompressed: {e}")
+
+
+def _parse_patch_bundle(patch_text):
+    """vibe_cli.parse_patches, memoised in the shared store by content hash."""
+    store = _shared_store()
+    key = hashlib.sha256(patch_text.encode('utf-8')).hexdigest()
+    cached = store.get("patches", key)
+    if cached is not None:
+        return [(meta, code) for meta, code in cached]
+    patches = vibe_cli.parse_patches(patch_text)
+    try:
+        store.set("patches", key, [[meta, code] for meta, code in patches])
+    except TypeError:
+        pass  # metadata YAML parsed into non-JSON types (e.g. dates)
+    return patches
+
+
+# git history / blob access for BASE_DIR, created on first use.
+_GIT_REPO = None
+GIT_HISTORY_INDEX = os.getenv("VIBE_GIT_HISTORY_INDEX", "").lower() in ("1", "true", "yes")
+
+
+def _git_repo():
+    global _GIT_REPO
+    if _GIT_REPO is None or _GIT_REPO.root != BASE_DIR.resolve():
+        from vibe_git import GitRepo
+        _GIT_REPO = GitRepo(BASE_DIR, auto_index=GIT_HISTORY_INDEX)
+    return _GIT_REPO
+
+
+# /apply preview sessions, committed by id with /sessions/<id>/commit.
+PREVIEW_SESSION_TTL = _env_int("VIBE_PREVIEW_TTL", 30 * 60)
+_PREVIEW_SESSIONS = None
+
+
+def _preview_sessions():
+    global _PREVIEW_SESSIONS
+    if _PREVIEW_SESSIONS is None:
+        from vibe_session import SessionStore
+        directory = _cache_dir() / "sessions" if SHARED_STORE_PERSISTENT else None
+        _PREVIEW_SESSIONS = SessionStore(directory, ttl=PREVIEW_SESSION_TTL)
+    return _PREVIEW_SESSIONS
+
+
+# Undo/redo journal of every save the server makes, created on first use.
+JOURNAL_MAX_ENTRIES = _env_int("VIBE_JOURNAL_ENTRIES", 200)
+_JOURNAL = None
+
+
+def _journal():
+    global _JOURNAL
+    if _JOURNAL is None:
+        from vibe_journal import EditJournal
+        _JOURNAL = EditJournal(_cache_dir() / "journal.jsonl",
+                               max_entries=JOURNAL_MAX_ENTRIES)
+    return _JOURNAL
+
+
+def _journal_record(label, edits):
+    edits = [edit for edit in edits if edit is not None]
+    try:
+        _journal().record(label, edits)
+    except Exception as e:
+        # The file is saved either way; it just can't be undone.
+        logging.warning(f"Could not journal '{label}': {e}", exc_info=True)
+
+
+def _build_user_message(filename, file_content, prompt, token_budget=None):
+    """
+    Build the provider-agnostic user message for /generate-patch. The file
+    content is sliced to the symbols relevant to the prompt (see
+    vibe_context) so large modules stay within the token budget.
+    Returns (message, context_stats).
+    """
+    from vibe_context import build_file_context
+    target_name = filename or 'unspecified_file.py'
+    budget = CONTEXT_TOKEN_BUDGET if token_budget is None else token_budget
+    context, stats = build_file_context(file_content or '', prompt, budget)
+    if not context.strip():
+        context = '# File is empty or not provided.'
+    # File first, request last: everything before the request is a stable
+    # prefix the providers can cache across prompts on the same file.
+    file_block = (
+        f"The user wants to modify the file: '{target_name}'\n"
+        f"Current file content is:\n```python\n{context}\n```\n\n")
+    message = file_block + (
+        f"User's request: \"{prompt}\"\n\n"
+        f"Please generate a Vibe Patch to achieve this. Ensure the `file:` key in the patch is correctly set to '{target_name}'."
+    )
+    if stats["sliced"]:
+        message += " Only use anchors and names from code shown in full above."
+    stats["prompt_chars"] = len(message)
+    stats["prefix_chars"] = len(file_block)
+    return message, stats
 
 
 # -----------------------------------------------------------------------------
@@ -158,261 +416,911 @@ app = Flask(__name__)
 
 @app.route('/generate-patch', methods=['POST'])
 def generate_patch_route():
-    print("--- /generate-patch: VERY FIRST LINE INSIDE FUNCTION ---") # EXTREME DEBUG
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
-        print("--- /generate-patch: ERROR - No JSON data received ---")  # DEBUG
         return jsonify({"error": "Invalid JSON payload"}), 400
 
     prompt = data.get('prompt')
     filename = data.get('filename')
     file_content = data.get('file_content')
     llm_provider = data.get('llm_provider')
-
-    # Ensure VIBE_SYSTEM_PROMPT is accessible here, assumed to be a global
-    # constant
-    print(
-        f"--- /generate-patch ROUTE ENTRY. Provider: '{llm_provider}', Prompt: '{
-            str(prompt)[
-                :30]}...' ---")  # DEBUG
+    logging.info(f"/generate-patch provider '{llm_provider}', prompt '{str(prompt)[:30]}...'")
 
     if not prompt or not llm_provider:
-        print(
-            f"--- /generate-patch: ERROR - Missing prompt or provider. Provider: '{llm_provider}', Prompt given: {
-                bool(prompt)} ---")  # DEBUG
         return jsonify({"error": "Prompt and LLM provider are required"}), 400
 
-    patch_text_response = f"# Error: LLM provider '{llm_provider}' not recognized or failed."
-    final_patch_code = ""  # Initialize to ensure it's defined
-
+    context_budget = data.get('context_budget')
     try:
-        # DEBUG
-        print(
-            f"--- /generate-patch: TRY block entered for provider '{llm_provider}' ---")
-        if llm_provider == "gemini":
-            print("--- /generate-patch: Matched 'gemini' ---")  # DEBUG
-            if not GOOGLE_API_KEY:
-                # DEBUG
-                print("--- /generate-patch: GEMINI_API_KEY IS MISSING/FALSE ---")
-                return jsonify(
-                    {"error": "Gemini API key not configured on server"}), 503
-            print("--- /generate-patch: GEMINI_API_KEY IS PRESENT ---")  # DEBUG
+        context_budget = int(context_budget) if context_budget is not None else None
+    except (TypeError, ValueError):
+        return jsonify({"error": "context_budget must be an integer"}), 400
 
-            try:
-                import google.generativeai as genai
-                # DEBUG
-                print("--- /generate-patch: Successfully imported Google SDK ---")
-            except ImportError as ie:
-                print(
-                    # DEBUG
-                    f"--- /generate-patch: FAILED TO IMPORT GOOGLE SDK: {ie} ---")
-                return jsonify(
-                    {"error": f"Google SDK not installed or found: {ie}"}), 500
-
-            genai.configure(api_key=GOOGLE_API_KEY)
-            model = genai.GenerativeModel('gemini-1.5-flash-latest')
-            print("--- /generate-patch: Google client initialized ---")  # DEBUG
-
-            llm_payload_prompt = (
-                f"{VIBE_SYSTEM_PROMPT}\\n\\n"
-                f"The user wants to modify the file: '{
-                    filename or 'unspecified_file.py'}'\\n"
-                f"Current file content is:\\n```python\\n{
-                    file_content or '# File is empty or not provided.'}\\n```\\n\\n"
-                f"User's request: \"{prompt}\"\\n\\n"
-                f"Please generate a Vibe Patch to achieve this. Ensure the `file:` key in the patch is correctly set to '{
-                    filename or 'unspecified_file.py'}'."
-            )
-            # DEBUG
-            print(
-                f"--- /generate-patch: Sending to Gemini (user prompt snippet): {prompt[:100]}... ---")
-            response = model.generate_content(llm_payload_prompt)
-            patch_text_response = response.text
-            print("--- /generate-patch: Received response from Gemini ---")  # DEBUG
-            if not patch_text_response.strip().startswith("```yaml"):
-                patch_text_response = f"```yaml\\n{
-                    patch_text_response.strip()}\\n```"
-
-        elif llm_provider == "anthropic":
-            print("--- /generate-patch: Matched 'anthropic' ---")  # DEBUG
-            if not ANTHROPIC_API_KEY:
-                # DEBUG
-                print("--- /generate-patch: ANTHROPIC_API_KEY IS MISSING/FALSE ---")
-                return jsonify(
-                    {"error": "Anthropic API key not configured on server"}), 503
+    try:
+        result = _generate_patch(
+            llm_provider, filename, file_content, prompt,
+            context_budget=context_budget,
+            use_cache=not (data.get('cache') is False or
+                           'no-cache' in request.headers.get('Cache-Control', '')),
+            hedge=data.get('hedge'), repair=data.get('repair', REPAIR_ATTEMPTS))
+        return jsonify(result)
+
+    except ProviderError as e:
+        return jsonify({"error": str(e)}), e.status
+    except PatchRepairError as e:
+        return jsonify({"error": f"Generated patch does not apply after {len(e.attempts)} attempt(s): {e}",
+                        "rejected_patch": e.patch_content, "attempts": len(e.attempts),
+                        "attempt_log": e.attempts}), 422
+    except (GenerationTimeout, TimeoutError) as e:
+        logging.warning(f"/generate-patch timed out for '{llm_provider}': {e}")
+        return jsonify({"error": str(e)}), 504
+    except GenerationBusy as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "5"}
+    except Exception as e:
+        logging.error(f"/generate-patch failed for '{llm_provider}': {e}", exc_info=True)
+        return jsonify(
+            {"error": f"Failed to generate patch. Check server logs. Details: {str(e)[:150]}"}), 500
 
-            print("--- /generate-patch: ANTHROPIC_API_KEY IS PRESENT ---")  # DEBUG
 
+def _generate_patch(llm_provider, filename, file_content, prompt, context_budget=None,
+                    use_cache=True, hedge=None, repair=None, first_answer=None):
+    """
+    Produce a validated patch for one file: response cache, coalescing of
+    identical in-flight requests, optional hedging, then the dry-run /
+    repair loop. `first_answer` is model output obtained elsewhere (e.g. a
+    provider batch job) to validate before making any call.
+
+    Returns the /generate-patch response dict. Raises ProviderError,
+    PatchRepairError, GenerationTimeout, GenerationBusy or provider errors.
+    """
+    provider = LLM_PROVIDERS.get(llm_provider)
+    # "repair": N re-prompts at most N times; false returns the raw answer.
+    dry_run, max_repairs = _repair_mode(repair)
+    user_message, context_stats, cache_key = _prepare_request(
+        provider, filename, file_content, prompt, context_budget, validated=dry_run)
+
+    # Identical prompt + identical content sent → serve the stored patch.
+    # Only answers that passed the dry run are stored, so raw requests
+    # always go to the provider.
+    cache = _response_cache()
+    if not use_cache or not dry_run:
+        cache.record_bypass()
+    else:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logging.info(f"/generate-patch cache hit for provider '{llm_provider}'")
+            return {"patch_content": cached["patch_content"],
+                    "context": context_stats, "cached": True}
+
+    secondary = _hedge_secondary(hedge, llm_provider)
+    gen_request = GenerationRequest(
+        VIBE_SYSTEM_PROMPT, user_message, filename=filename, prompt=prompt,
+        prefix_chars=context_stats["prefix_chars"])
+
+    def call_provider(req):
+        started = time.perf_counter()
+        if secondary is None:
+            # Collected from the provider's stream so that, past the
+            # deadline, the pool stops it at the next chunk (or read
+            # timeout) rather than waiting for the whole answer.
             try:
-                from anthropic import Anthropic
-                # DEBUG
-                print("--- /generate-patch: Successfully imported Anthropic SDK ---")
-            except ImportError as ie:
-                print(
-                    # DEBUG
-                    f"--- /generate-patch: FAILED TO IMPORT ANTHROPIC SDK: {ie} ---")
-                return jsonify(
-                    {"error": f"Anthropic SDK not installed or found: {ie}"}), 500
-
-            client = Anthropic(api_key=ANTHROPIC_API_KEY)
-            print("--- /generate-patch: Anthropic client initialized ---")  # DEBUG
-
-            print(
-                f"--- /generate-patch: Sending to Anthropic (user prompt snippet): {
-                    str(prompt)[
-                        :100]}... ---")  # TARGET DEBUG
-
-            user_message_for_anthropic = (
-                f"The user wants to modify the file: '{
-                    filename or 'unspecified_file.py'}'\\n"
-                f"Current file content is:\\n```python\\n{
-                    file_content or '# File is empty or not provided.'}\\n```\\n\\n"
-                f"User's request: \"{prompt}\"\\n\\n"
-                f"Please generate a Vibe Patch to achieve this. Ensure the `file:` key in the patch is correctly set to '{
-                    filename or 'unspecified_file.py'}'."
-            )
-            message = client.messages.create(
-                model="claude-3-opus-20240229",
-                max_tokens=3500,
-                system=VIBE_SYSTEM_PROMPT,
-                messages=[{"role": "user",
-                           "content": user_message_for_anthropic}]
-            )
-            patch_text_response = message.content[0].text
-            print("--- /generate-patch: Received response from Anthropic ---")  # DEBUG
-            if not patch_text_response.strip().startswith("```yaml"):
-                patch_text_response = f"```yaml\\n{
-                    patch_text_response.strip()}\\n```"
-
-        elif llm_provider == "openai":
-            print("--- /generate-patch: Matched 'openai' ---")  # DEBUG
-            if not OPENAI_API_KEY:
-                # DEBUG
-                print("--- /generate-patch: OPENAI_API_KEY IS MISSING/FALSE ---")
-                return jsonify(
-                    {"error": "OpenAI API key not configured on server"}), 503
-            print("--- /generate-patch: OPENAI_API_KEY IS PRESENT ---")  # DEBUG
+                text = "".join(LLM_POOL.stream(lambda: provider.stream(req)))
+            except GenerationTimeout:
+                LLM_HEDGE.record_latency(llm_provider, (time.perf_counter() - started) * 1000,
+                                         censored=True)
+                raise
+            LLM_HEDGE.record_latency(llm_provider, (time.perf_counter() - started) * 1000)
+            return text, llm_provider, False
+        try:
+            winner, text, hedged = hedged_call(
+                LLM_POOL,
+                [(llm_provider, _hedge_arm(provider, req)),
+                 (secondary.name, _hedge_arm(secondary, req))],
+                delay=LLM_HEDGE.delay_ms(llm_provider) / 1000,
+                accept=_accept_generated_patch, timeout=LLM_TIMEOUT,
+                on_cancel=lambda name, ms: LLM_HEDGE.record_latency(name, ms, censored=True))
+        except Exception:
+            LLM_HEDGE.record_outcome(None, True)
+            raise
+        LLM_HEDGE.record_outcome(winner, hedged)
+        return text, winner, hedged
+
+    def generate():
+        # Dry-run every answer against the file; on failure, send the
+        # error back to the model, at most `max_repairs` times.
+        started = time.perf_counter()
+        req, attempts = gen_request, []
+        while True:
+            t0 = time.perf_counter()
+            if first_answer is not None and not attempts:
+                text, winner, hedged = first_answer, llm_provider, False
+            else:
+                text, winner, hedged = call_provider(req)
+            t1 = time.perf_counter()
+            patch_content = _strip_code_fence(text)
+            error = None
+            try:
+                if dry_run:
+                    _dry_run_bundle(patch_content, filename, file_content)
+            except Exception as e:
+                error = str(e) or type(e).__name__
+            attempts.append({"provider": winner, "error": error,
+                             "generation_ms": round((t1 - t0) * 1000, 1),
+                             "validation_ms": round((time.perf_counter() - t1) * 1000, 1)})
+            if error is None:
+                break
+            logging.info(f"/generate-patch attempt {len(attempts)} does not apply: {error}")
+            if len(attempts) > max_repairs:
+                raise PatchRepairError(error, patch_content, attempts)
+            req = GenerationRequest(
+                VIBE_SYSTEM_PROMPT, _repair_message(user_message, patch_content, error),
+                filename=filename, prompt=prompt, prefix_chars=context_stats["prefix_chars"])
+        generation_ms = round((time.perf_counter() - started) * 1000, 1)
+        logging.info(f"/generate-patch: '{winner}' answered in {generation_ms} ms"
+                     f"{' (hedged)' if hedged else ''}, {len(attempts)} attempt(s)")
+        result = {"patch_content": patch_content,
+                  "generation_ms": generation_ms, "provider": winner, "hedged": hedged,
+                  "attempts": len(attempts), "attempt_log": attempts}
+        if dry_run:
+            cache.put(cache_key, llm_provider, provider.model, result)
+        return result
+
+    # Identical requests already in flight share one provider call. The
+    # repair budget decides whether a request ends in a patch or a 422, so
+    # it is part of the key, and followers wait out every attempt the
+    # leader may make.
+    calls = max_repairs + 1 if dry_run else 1
+    result, coalesced = LLM_FLIGHTS.do(
+        f"{cache_key}:{max_repairs}", generate, timeout=calls * LLM_TIMEOUT + 5)
+    if coalesced:
+        logging.info(f"/generate-patch coalesced with an identical in-flight request")
+    return {"patch_content": result["patch_content"],
+            "context": context_stats, "cached": False,
+            "coalesced": coalesced, "provider": result["provider"],
+            "hedged": result["hedged"], "attempts": result.get("attempts", 1),
+            "attempt_log": result.get("attempt_log", []),
+            "generation_ms": result["generation_ms"]}
+
+
+def _repair_mode(repair):
+    """
+    (dry_run, max_repairs) for a request's "repair" field: absent, false,
+    or a non-negative integer, capped at MAX_REPAIR_ATTEMPTS. Raises
+    ProviderError (400) for anything else.
+    """
+    if repair is None:
+        return True, REPAIR_ATTEMPTS
+    if repair is False:
+        return False, 0
+    if type(repair) is not int or repair < 0:
+        raise ProviderError('"repair" must be false or a non-negative integer', 400)
+    return True, min(repair, MAX_REPAIR_ATTEMPTS)
+
+
+def _prepare_request(provider, filename, file_content, prompt, context_budget=None,
+                     validated=True):
+    """
+    (user_message, context_stats, response cache key) for one file. The
+    key differs for validated and raw (`"repair": false`) answers.
+    """
+    user_message, context_stats = _build_user_message(
+        filename, file_content, prompt, context_budget)
+    logging.info(
+        f"/generate-patch context: {context_stats['sent_tokens']}/{context_stats['full_tokens']} "
+        f"est. tokens (sliced={context_stats['sliced']})")
+    cache_key = _response_cache().make_key(
+        provider.name, provider.model, SYSTEM_PROMPT_VERSION,
+        prompt, hashlib.sha256(user_message.encode('utf-8')).hexdigest(),
+        mode="validated" if validated else "raw")
+    return user_message, context_stats, cache_key
+
+
+def _hedge_secondary(hedge, primary):
+    """
+    Secondary adapter for a /generate-patch request, or None. `hedge` is
+    the request's "hedge" field: a provider name, true (use
+    VIBE_HEDGE_PROVIDER) or false; absent means VIBE_HEDGE_PROVIDER if set.
+    """
+    if hedge is False or (hedge is None and not HEDGE_PROVIDER):
+        return None
+    name = hedge if isinstance(hedge, str) else HEDGE_PROVIDER
+    if not name:
+        raise ProviderError("hedge requested but no secondary provider given "
+                            "(set VIBE_HEDGE_PROVIDER or pass a provider name)", 400)
+    if name == primary:
+        return None
+    try:
+        return LLM_PROVIDERS.get(name)
+    except ProviderError:
+        if hedge is None:
+            logging.warning(f"Hedge provider '{name}' unavailable; not hedging.")
+            return None
+        raise
+
+
+def _hedge_arm(adapter, gen_request):
+    """
+    Hedged-call arm: collect `adapter`'s stream. Once cancelled, the arm
+    closes the stream at its next chunk (or SDK read timeout); hedged_call
+    has already recorded its latency as a lower bound by then.
+    """
+    def run(cancel):
+        started = time.perf_counter()
+        parts = []
+        stream = adapter.stream(gen_request)
+        try:
+            for chunk in stream:
+                if cancel.is_set():
+                    raise HedgeCancelled(adapter.name)
+                parts.append(chunk)
+        finally:
+            stream.close()
+        LLM_HEDGE.record_latency(adapter.name, (time.perf_counter() - started) * 1000)
+        return "".join(parts)
+    return run
+
+
+def _accept_generated_patch(text):
+    """Raise unless `text` parses as a bundle whose patches pass validate_spec."""
+    patches = vibe_cli.parse_patches(_strip_code_fence(text))
+    if not patches:
+        raise ValueError("no patch sections found")
+    for meta, _ in patches:
+        vibe_cli.resolve_patch_targets([(meta, "")], BASE_DIR, index=_symbol_index())
+        vibe_cli.validate_spec(meta)
+
+
+class PatchRepairError(ValueError):
+    """A generated patch still failed its dry run after every repair attempt."""
+
+    def __init__(self, message, patch_content, attempts):
+        super().__init__(message)
+        self.patch_content = patch_content
+        self.attempts = attempts
+
+
+def _dry_run_bundle(patch_content, filename=None, file_content=None):
+    """
+    Apply a generated bundle in memory, strictly (missing anchors and
+    symbols are errors, results must parse). `file_content` stands in for
+    `filename`; other targets are read from BASE_DIR. Raises on failure.
+    """
+    patches = vibe_cli.parse_patches(patch_content)
+    if not patches:
+        raise ValueError("no patch sections found")
+    vibe_cli.resolve_patch_targets(patches, BASE_DIR, index=_symbol_index())
+    _shared_store()  # make sure lint_code results are cached
+    sources = {}
+    for meta, code in patches:
+        vibe_cli.validate_spec(meta)
+        rel = meta["file"]
+        if rel not in sources:
+            path = (BASE_DIR / rel).resolve()
+            if rel == filename and file_content is not None:
+                sources[rel] = file_content
+            elif not path.is_relative_to(BASE_DIR.resolve()):
+                raise ValueError(f"'{rel}' is outside the base directory")
+            elif path.is_file():
+                sources[rel] = path.read_text(encoding='utf-8')
+            elif meta["patch_type"].startswith(("add_", "replace_")):
+                sources[rel] = ""
+            else:
+                raise ValueError(f"{meta['patch_type']}: file '{rel}' does not exist")
+        sources[rel] = vibe_cli.transform_source(meta, code, sources[rel], strict=True, filename=rel)
+    return sources
+
+
+def _repair_message(user_message, patch_content, error):
+    return (
+        f"{user_message}\n\n"
+        f"Your previous answer was:\n```yaml\n{patch_content}\n```\n"
+        f"It could not be applied to the file: {error}\n"
+        "Reply with a corrected, complete Vibe Patch bundle. Only use names and "
+        "anchors that exist in the file content shown above."
+    )
+
+
+def _strip_code_fence(text):
+    """Return the patch text from a model reply, without a surrounding ``` fence."""
+    text = (text or "").strip()
+    if text.startswith("```yaml"):
+        return text.split("```yaml", 1)[1].split("```", 1)[0].strip()
+    if text.startswith("```"):
+        return text.split("```", 1)[1].split("```", 1)[0].strip()
+    return text
+
+
+def _sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+@app.route('/generate-patch/stream', methods=['POST'])
+def generate_patch_stream_route():
+    """
+    Streaming variant of /generate-patch (Server-Sent Events).
+
+    Events: `token` ({"text"}) as text arrives, `patch` ({"index", "meta",
+    "code"}) as soon as each patch section is complete and passes
+    validate_spec, `error` ({"message"}) and finally `done`
+    ({"patch_content", "patches", "cached"}). Generation is cancelled as
+    soon as the output can no longer become a valid bundle.
+    """
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({"error": "Invalid JSON payload"}), 400
+    prompt = data.get('prompt')
+    filename = data.get('filename')
+    file_content = data.get('file_content')
+    llm_provider = data.get('llm_provider')
+    if not prompt or not llm_provider:
+        return jsonify({"error": "Prompt and LLM provider are required"}), 400
+    try:
+        provider = LLM_PROVIDERS.get(llm_provider)
+    except ProviderError as e:
+        return jsonify({"error": str(e)}), e.status
+    try:
+        context_budget = data.get('context_budget')
+        context_budget = int(context_budget) if context_budget is not None else None
+    except (TypeError, ValueError):
+        return jsonify({"error": "context_budget must be an integer"}), 400
+
+    user_message, context_stats, cache_key = _prepare_request(
+        provider, filename, file_content, prompt, context_budget)
+    cache = _response_cache()
+    bypass_cache = (data.get('cache') is False or
+                    'no-cache' in request.headers.get('Cache-Control', ''))
+    cached = None
+    if bypass_cache:
+        cache.record_bypass()
+    else:
+        cached = cache.get(cache_key)
+
+    def validate(meta):
+        vibe_cli.resolve_patch_targets([(meta, "")], BASE_DIR, index=_symbol_index())
+        vibe_cli.validate_spec(meta)
+
+    from vibe_llm import PatchStreamParser
+    parser = PatchStreamParser(validate=validate)
+
+    def replay(patch_content, cached=False, coalesced=False):
+        for name, payload in parser.feed(patch_content + "\n") + parser.close():
+            yield _sse(name, payload)
+        yield _sse("done", {"patch_content": patch_content, "patches": len(parser.patches),
+                            "cached": cached, "coalesced": coalesced})
+
+    def events():
+        yield _sse("context", context_stats)
+        if cached is not None:
+            yield from replay(cached["patch_content"], cached=True)
+            return
+        # An identical generation is already streaming: wait for it and
+        # replay its result instead of paying for a second one.
+        # Keyed apart from /generate-patch: a stream's result may not apply.
+        flight_key = f"{cache_key}:stream"
+        flight, leader = LLM_FLIGHTS.acquire(flight_key)
+        if not leader:
+            try:
+                shared = flight.wait(LLM_TIMEOUT + 5)
+            except Exception as e:
+                yield _sse("error", {"message": str(e)})
+                return
+            yield from replay(shared["patch_content"], coalesced=True)
+            return
+        result = None
+        try:
+            result = yield from generate()
+        finally:
+            LLM_FLIGHTS.resolve(flight_key, flight, result=result, error=None if result else
+                                RuntimeError("The identical in-flight generation failed; try again."))
+
+    def generate():
+        """Stream from the provider; returns the cached result dict, or None on failure."""
+        started = time.perf_counter()
+        try:
+            stream = LLM_POOL.stream(lambda: provider.stream(GenerationRequest(
+                VIBE_SYSTEM_PROMPT, user_message, filename=filename, prompt=prompt,
+                prefix_chars=context_stats["prefix_chars"])))
+        except GenerationBusy as e:
+            yield _sse("error", {"message": str(e)})
+            return None
+        try:
+            for chunk in stream:
+                yield _sse("token", {"text": chunk})
+                for name, payload in parser.feed(chunk):
+                    yield _sse(name, payload)
+                if parser.finished:
+                    break
+            for name, payload in parser.close():
+                yield _sse(name, payload)
+        except GenerationTimeout as e:
+            logging.warning(f"/generate-patch/stream timed out ({llm_provider}): {e}")
+            yield _sse("error", {"message": str(e)})
+            return None
+        except Exception as e:
+            logging.error(f"/generate-patch/stream provider error ({llm_provider}): {e}", exc_info=True)
+            yield _sse("error", {"message": f"Failed to generate patch: {str(e)[:150]}"})
+            return None
+        finally:
+            # Stops the upstream generation if we bailed out early or the
+            # client went away (the WSGI server closes this generator).
+            stream.close()
+        if parser.failed:
+            logging.warning(f"/generate-patch/stream cancelled: {parser.error}")
+            return None
+        result = {"patch_content": parser.patch_text,
+                  "generation_ms": round((time.perf_counter() - started) * 1000, 1),
+                  "provider": llm_provider, "hedged": False}
+        LLM_HEDGE.record_latency(llm_provider, result["generation_ms"])
+        # Tokens are already on screen, so no repair loop here; report
+        # whether the bundle applies and let the client re-prompt.
+        try:
+            _dry_run_bundle(result["patch_content"], filename, file_content)
+            dry_run_error = None
+        except Exception as e:
+            dry_run_error = str(e) or type(e).__name__
+        if dry_run_error is None:
+            cache.put(cache_key, llm_provider, provider.model, result)
+        yield _sse("done", {"patch_content": result["patch_content"],
+                            "patches": len(parser.patches), "cached": False,
+                            "coalesced": False, "dry_run_error": dry_run_error})
+        return result
+
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@app.route('/generate-patch/batch', methods=['POST'])
+def generate_patch_batch_route():
+    """
+    Generate patches for many files at once (Server-Sent Events).
+
+    Body: {"llm_provider", "prompt" (default for every item), "items":
+    [{"file", "prompt"?, "file_content"?}], "concurrency"?, "batch_api"?}
+    plus the /generate-patch options "context_budget", "hedge", "repair"
+    and "cache". Missing file_content is read from BASE_DIR.
+
+    Events: `start` ({"items", "mode"}), one `item` per file as it
+    finishes ({"index", "file", "ok", "patch_content" | "error", ...}) and
+    `done` ({"bundle", "succeeded", "failed", "elapsed_ms"}), where
+    `bundle` is one multi-file .vibe bundle of every successful item.
+    """
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({"error": "Invalid JSON payload"}), 400
+    llm_provider = data.get('llm_provider')
+    items = data.get('items')
+    if not llm_provider or not isinstance(items, list) or not items:
+        return jsonify({"error": "llm_provider and a non-empty items list are required"}), 400
+    if len(items) > BATCH_MAX_ITEMS:
+        return jsonify({"error": f"At most {BATCH_MAX_ITEMS} items per batch"}), 400
+    try:
+        provider = LLM_PROVIDERS.get(llm_provider)
+        context_budget = data.get('context_budget')
+        context_budget = int(context_budget) if context_budget is not None else None
+        concurrency = max(1, min(int(data.get('concurrency', BATCH_CONCURRENCY)), LLM_POOL.workers))
+    except ProviderError as e:
+        return jsonify({"error": str(e)}), e.status
+    except (TypeError, ValueError):
+        return jsonify({"error": "context_budget and concurrency must be integers"}), 400
+
+    jobs = []
+    for index, item in enumerate(items):
+        rel = (item or {}).get('file')
+        item_prompt = (item or {}).get('prompt') or data.get('prompt')
+        if not rel or not item_prompt:
+            return jsonify({"error": f"items[{index}] needs a file and a prompt"}), 400
+        content = item.get('file_content')
+        if content is None:
+            path = (BASE_DIR / rel).resolve()
+            if not path.is_relative_to(BASE_DIR.resolve()):
+                return jsonify({"error": f"items[{index}]: invalid path"}), 400
+            if not path.is_file():
+                return jsonify({"error": f"items[{index}]: file not found: {rel}"}), 404
+            content = path.read_text(encoding='utf-8')
+        jobs.append((index, rel, item_prompt, content))
+
+    use_cache = not (data.get('cache') is False or
+                     'no-cache' in request.headers.get('Cache-Control', ''))
+    options = {"context_budget": context_budget, "use_cache": use_cache,
+               "hedge": data.get('hedge'), "repair": data.get('repair', REPAIR_ATTEMPTS)}
+    use_batch_api = bool(data.get('batch_api')) and provider.supports_batch
+    try:
+        validated = _repair_mode(options["repair"])[0]
+    except ProviderError as e:
+        return jsonify({"error": str(e)}), e.status
+
+    def batch_api_answers():
+        """Run uncached jobs as one provider batch; yields keepalives, returns answers."""
+        pending = []
+        for index, rel, item_prompt, content in jobs:
+            user_message, context_stats, cache_key = _prepare_request(
+                provider, rel, content, item_prompt, context_budget, validated=validated)
+            if use_cache and validated and _response_cache().get(cache_key) is not None:
+                continue
+            pending.append((index, GenerationRequest(
+                VIBE_SYSTEM_PROMPT, user_message, filename=rel, prompt=item_prompt,
+                prefix_chars=context_stats["prefix_chars"])))
+        answers = {}
+        if not pending:
+            return answers
+        results = queue.Queue()
+
+        def run():
+            try:
+                for pos, text, error in provider.batch_generate(
+                        [req for _, req in pending], timeout=BATCH_API_TIMEOUT):
+                    results.put((pending[pos][0], text, error))
+            except Exception as e:
+                logging.error(f"{provider.display_name} batch job failed: {e}", exc_info=True)
+            finally:
+                results.put(None)
 
+        threading.Thread(target=run, name="vibe-batch-api", daemon=True).start()
+        while True:
             try:
-                from openai import OpenAI
-                # DEBUG
-                print("--- /generate-patch: Successfully imported OpenAI SDK ---")
-            except ImportError as ie:
-                print(
-                    # DEBUG
-                    f"--- /generate-patch: FAILED TO IMPORT OPENAI SDK: {ie} ---")
-                return jsonify(
-                    {"error": f"OpenAI SDK not installed or found: {ie}"}), 500
-
-            client = OpenAI(api_key=OPENAI_API_KEY)
-            print("--- /generate-patch: OpenAI client initialized ---")  # DEBUG
-
-            llm_payload_prompt_openai = (  # Renamed to avoid conflict if it were global
-                f"The user wants to modify the file: '{
-                    filename or 'unspecified_file.py'}'\\n"
-                f"Current file content is:\\n```python\\n{
-                    file_content or '# File is empty or not provided.'}\\n```\\n\\n"
-                f"User's request: \"{prompt}\"\\n\\n"
-                f"Please generate a Vibe Patch to achieve this. Ensure the `file:` key in the patch is correctly set to '{
-                    filename or 'unspecified_file.py'}'."
-            )
-            # DEBUG
-            print(
-                f"--- /generate-patch: Sending to OpenAI (user prompt snippet): {prompt[:100]}... ---")
-            completion = client.chat.completions.create(
-                model="gpt-4-turbo-preview",
-                messages=[
-                    {"role": "system", "content": VIBE_SYSTEM_PROMPT},
-                    {"role": "user", "content": llm_payload_prompt_openai}
-                ]
-            )
-            patch_text_response = completion.choices[0].message.content
-            print("--- /generate-patch: Received response from OpenAI ---")  # DEBUG
-            if not patch_text_response.strip().startswith("```yaml"):
-                patch_text_response = f"```yaml\\n{
-                    patch_text_response.strip()}\\n```"
+                entry = results.get(timeout=15)
+            except queue.Empty:
+                yield ": waiting for provider batch job\n\n"
+                continue
+            if entry is None:
+                return answers
+            index, text, error = entry
+            if text is not None:
+                answers[index] = text
+            else:
+                logging.warning(f"Batch item {index} failed upstream ({error}); retrying directly.")
+
+    def events():
+        started = time.perf_counter()
+        yield _sse("start", {"items": len(jobs),
+                             "mode": "batch_api" if use_batch_api else "concurrent",
+                             "concurrency": concurrency})
+        answers = {}
+        if use_batch_api:
+            answers = yield from batch_api_answers()
+        limiter = AdaptiveLimiter(concurrency)
+
+        def run_item(job):
+            index, rel, item_prompt, content = job
+            for attempt in range(BATCH_RATE_LIMIT_RETRIES + 1):
+                limiter.acquire()
+                try:
+                    result = _generate_patch(llm_provider, rel, content, item_prompt,
+                                             first_answer=answers.get(index), **options)
+                except Exception as e:
+                    limited = is_rate_limited(e) or isinstance(e, GenerationBusy)
+                    limiter.release(rate_limited=limited, retry_after=retry_after_seconds(e))
+                    if limited and attempt < BATCH_RATE_LIMIT_RETRIES:
+                        continue
+                    failure = {"index": index, "file": rel, "ok": False, "error": str(e)[:300]}
+                    if isinstance(e, PatchRepairError):
+                        failure.update(rejected_patch=e.patch_content, attempts=len(e.attempts))
+                    return failure
+                limiter.release()
+                result.update(index=index, file=rel, ok=True)
+                result.pop("attempt_log", None)
+                return result
+
+        results = [None] * len(jobs)
+        executor = ThreadPoolExecutor(concurrency, thread_name_prefix="vibe-batch")
+        try:
+            futures = [executor.submit(run_item, job) for job in jobs]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result["index"]] = result
+                yield _sse("item", result)
+        finally:
+            # Client gone or done: drop items that haven't started.
+            executor.shutdown(wait=False, cancel_futures=True)
+        succeeded = [r for r in results if r and r["ok"]]
+        yield _sse("done", {
+            "bundle": "\n\n".join(r["patch_content"].strip() for r in succeeded) + "\n",
+            "succeeded": len(succeeded), "failed": len(results) - len(succeeded),
+            "rate_limited": limiter.stats["rate_limited"],
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)})
+
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+# Change notifications for files open in the UI, created on first use.
+_FILE_WATCHER = None
+EVENTS_MAX_FILES = 32
+
+
+def _watch_fingerprint(path):
+    """The /file ETag of `path`, or None if it is gone (or unreadable)."""
+    try:
+        return _file_fingerprint(path, path.stat())[0]
+    except OSError:
+        return None
+
+
+def _file_watcher():
+    global _FILE_WATCHER
+    if _FILE_WATCHER is None:
+        from vibe_watch import FileWatcher
+        _FILE_WATCHER = FileWatcher(_watch_fingerprint)
+    return _FILE_WATCHER
+
+
+@app.route('/events')
+def file_events():
+    """
+    Server-Sent Events for ?file=<path> (repeatable): a `file` event with
+    each file's current hash on connect, then one whenever its content
+    changes on disk ({"file", "hash", "deleted"}). The hash is the /file
+    ETag, so clients re-fetch only when theirs differs.
+    """
+    names = request.args.getlist('file')
+    if not names or len(names) > EVENTS_MAX_FILES:
+        return jsonify({'error': f"Pass 1 to {EVENTS_MAX_FILES} 'file' parameters"}), 400
+    paths = {}
+    for name in names:
+        target = (BASE_DIR / name).resolve()
+        if not target.is_relative_to(BASE_DIR.resolve()):
+            return jsonify({'error': f"Invalid path: {name}"}), 400
+        paths[target] = name
+    if not _EVENT_STREAM_SLOTS.acquire(blocking=False):
+        return jsonify({'error': 'Too many live event streams'}), 503
+    watcher = _file_watcher()
+    try:
+        sub = watcher.subscribe(paths)
+    except Exception:
+        _EVENT_STREAM_SLOTS.release()
+        raise
 
-        else:
-            # DEBUG
-            print(
-                f"--- /generate-patch: ERROR - Unknown provider: '{llm_provider}' ---")
-            return jsonify(
-                {"error": f"Unsupported LLM provider: {llm_provider}"}), 400
-
-        # Extract content from markdown code block
-        final_patch_code = patch_text_response.strip()
-        if final_patch_code.startswith("```yaml"):
-            final_patch_code = final_patch_code.split(
-                "```yaml", 1)[1].split("```", 1)[0].strip()
-        elif final_patch_code.startswith("```"):
-            final_patch_code = final_patch_code.split(
-                "```", 1)[1].split("```", 1)[0].strip()
-
-        # DEBUG
-        print(
-            f"--- /generate-patch: Successfully processed provider '{llm_provider}'. Returning patch. ---")
-        return jsonify({"patch_content": final_patch_code})
+    def payload(path, digest):
+        return {"file": paths[path], "hash": digest, "deleted": digest is None}
 
-    except Exception as e:
-        # DEBUG
-        print(
-            f"--- /generate-patch: EXCEPTION in TRY block for '{llm_provider}'. Error: {str(e)} ---")
-        import traceback
-        traceback.print_exc()
-        return jsonify(
-            {"error": f"Failed to generate patch. Check server logs. Details: {str(e)[:150]}"}), 500
+    def events():
+        try:
+            for path in paths:
+                yield _sse("file", payload(path, watcher.current(path)))
+            while True:
+                event = sub.get(timeout=15)
+                if event is None:
+                    # Also how a closed connection is noticed.
+                    yield ": keepalive\n\n"
+                    continue
+                yield _sse("file", payload(*event))
+        finally:
+            watcher.unsubscribe(sub)
+            _EVENT_STREAM_SLOTS.release()
+
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+# Directory listings for /tree, created on first use (like the symbol index).
+_WORKSPACE_TREE = None
+
+
+def _workspace_tree():
+    global _WORKSPACE_TREE
+    if _WORKSPACE_TREE is None or _WORKSPACE_TREE.base_dir != BASE_DIR.resolve():
+        from vibe_tree import WorkspaceTree
+        _WORKSPACE_TREE = WorkspaceTree(BASE_DIR)
+    return _WORKSPACE_TREE
+
+
+@app.route('/tree')
+def list_tree():
+    """
+    One page of one directory under BASE_DIR, for lazy expansion in the
+    UI: ?path=<dir>&cursor=<n>&limit=<n>. .gitignore'd entries and
+    VibeBackups are left out.
+    """
+    from vibe_tree import DEFAULT_PAGE_SIZE
+    try:
+        cursor = int(request.args.get('cursor', 0))
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return jsonify({'error': "cursor and limit must be integers"}), 400
+    try:
+        listing = _workspace_tree().list_dir(request.args.get('path', ''), cursor, limit)
+    except OSError as e:
+        logging.warning(f"/tree failed: {e}")
+        return jsonify({'error': f'Cannot list directory: {e}'}), 500
+    if listing is None:
+        return jsonify({'error': 'Not a directory under the base directory'}), 404
+    return jsonify(listing), 200
+
+
+# Rendered index shell (HTML with Monaco URLs resolved), rebuilt when
+# vibe_diff.html or the static asset version changes.
+_INDEX_SHELL = None
+# Last rendered page: (fingerprint, etag, html).
+_INDEX_PAGE = None
+BOOTSTRAP_MAX_BYTES = _env_int("VIBE_BOOTSTRAP_MAX_BYTES", 1024 * 1024)
+
+
+def _index_shell():
+    """(key, head, tail): the page is head + per-request scripts + tail."""
+    global _INDEX_SHELL
+    html_path = UI_SUBDIR / 'vibe_diff.html'
+    st = html_path.stat()
+    local_monaco = _local_monaco()
+    version = _static_assets().version() if local_monaco else None
+    key = (st.st_mtime_ns, st.st_size, version)
+    if _INDEX_SHELL is not None and _INDEX_SHELL[0] == key:
+        return _INDEX_SHELL
+    html_content = html_path.read_text(encoding='utf-8')
+    extra = ""
+    if local_monaco:
+        # Serve Monaco ourselves; versioned URLs are cached as immutable.
+        html_content = html_content.replace(
+            f"{MONACO_CDN_BASE}/loader.js", f"{MONACO_LOCAL_BASE}/loader.js?v={version}")
+        html_content = html_content.replace(MONACO_CDN_BASE, MONACO_LOCAL_BASE)
+        extra = f"<script>require.config({{ urlArgs: 'v={version}' }});</script>\n"
+    # Inject right after require.config(...), before the app script runs.
+    insertion_point = -1
+    marker_pos = html_content.find("require.config({ paths:")
+    if marker_pos != -1:
+        end_script_tag_pos = html_content.find('</script>', marker_pos)
+        if end_script_tag_pos != -1:
+            insertion_point = end_script_tag_pos + len('</script>')
+    if insertion_point == -1:
+        logging.warning("Could not find insertion point for JS, attempting append to <head>.")
+        insertion_point = html_content.find('</head>')
+    if insertion_point == -1:
+        logging.error("Could not find </head> tag. Cannot inject JS.")
+        insertion_point = len(html_content)
+    _INDEX_SHELL = (key, html_content[:insertion_point] + "\n" + extra, html_content[insertion_point:])
+    return _INDEX_SHELL
+
+
+def _index_bootstrap():
+    """
+    Data the UI would otherwise fetch before its first render: the
+    initial file's versions and the provider status, plus the path whose
+    content to inline. Returns (data, fingerprint, inline_path); the
+    fingerprint changes whenever the rendered page would.
+    """
+    data = {"file": INITIAL_FILE, "llm_status": LLM_PROVIDERS.status()}
+    fingerprint = [INITIAL_FILE, data["llm_status"]]
+    inline_path = None
+    if INITIAL_FILE:
+        target = (BASE_DIR / INITIAL_FILE).resolve()
+        try:
+            st = target.stat()
+            if target.is_relative_to(BASE_DIR) and target.is_file():
+                fingerprint.append([st.st_mtime_ns, st.st_size])
+                if st.st_size <= BOOTSTRAP_MAX_BYTES:
+                    inline_path = target
+                    data["file_etag"] = _file_fingerprint(target, st)[0]
+                data["versions"], data["versions_cursor"] = _list_versions(
+                    INITIAL_FILE, VERSIONS_PAGE_SIZE)
+                fingerprint.append(data["versions"])
+        except OSError as e:
+            logging.warning(f"Bootstrap data for '{INITIAL_FILE}' unavailable: {e}")
+    return data, fingerprint, inline_path
 
-    # This part should ideally not be reached if the logic above is complete.
-    # DEBUG
-    print(
-        f"--- /generate-patch: Fallthrough - Reached end of function unexpectedly for provider '{llm_provider}' ---")
-    return jsonify(
-        {"error": "Reached end of function unexpectedly after try-except block."}), 500
 
 @app.route('/')
 def index():
-    logger = logging
+    global _INDEX_PAGE
     try:
         html_path = UI_SUBDIR / 'vibe_diff.html'
         if not html_path.is_file():
-            logger.error(f"HTML file not found at {html_path}")
+            logging.error(f"HTML file not found at {html_path}")
             return f"Error: vibe_diff.html not found in {UI_SUBDIR}.", 500
-        with open(html_path, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-        js_injection = ""
-        if INITIAL_FILE:
-            escaped_filename = INITIAL_FILE.replace(
-                '\\', '\\\\').replace("'", "\\'")
-            js_injection = f"<script>window.INITIAL_FILE = '{escaped_filename}'; console.log('Server injected INITIAL_FILE:', window.INITIAL_FILE);</script>"
-        insertion_marker = "require.config({ paths:"
-        marker_pos = html_content.find(insertion_marker)
-        insertion_point = -1
-        if marker_pos != -1:
-            end_script_tag_pos = html_content.find('</script>', marker_pos)
-            if end_script_tag_pos != -1:
-                insertion_point = end_script_tag_pos + len('</script>')
-        if insertion_point != -1 and js_injection:
-            modified_html = html_content[:insertion_point] + "\n" + \
-                js_injection + "\n" + html_content[insertion_point:]
-        elif js_injection:
-            logger.warning(
-                "Could not find insertion point for JS, attempting append to <head>.")
-            head_end_tag = '</head>'
-            head_insertion_point = html_content.find(head_end_tag)
-            if head_insertion_point != -1:
-                modified_html = html_content[:head_insertion_point] + \
-                    js_injection + html_content[head_insertion_point:]
-            else:
-                logger.error("Could not find </head> tag. Cannot inject JS.")
-                modified_html = html_content
+        shell_key, head, tail = _index_shell()
+        data, fingerprint, inline_path = _index_bootstrap()
+        fingerprint = json.dumps([shell_key, fingerprint], default=str)
+        if _INDEX_PAGE is None or _INDEX_PAGE[0] != fingerprint:
+            if inline_path is not None:
+                try:
+                    data["file_content"] = inline_path.read_text(encoding='utf-8')
+                except (OSError, UnicodeDecodeError) as e:
+                    logging.warning(f"Not inlining '{INITIAL_FILE}': {e}")
+            scripts = ""
+            if INITIAL_FILE:
+                escaped_filename = INITIAL_FILE.replace(
+                    '\\', '\\\\').replace("'", "\\'")
+                scripts += f"<script>window.INITIAL_FILE = '{escaped_filename}';</script>\n"
+            # "<" escaped so file content can't close the script element.
+            blob = json.dumps(data).replace('<', '\\u003c')
+            scripts += f"<script>window.VIBE_BOOTSTRAP = {blob};</script>\n"
+            page = head + scripts + tail
+            etag = hashlib.sha256(page.encode('utf-8')).hexdigest()[:20]
+            _INDEX_PAGE = (fingerprint, etag, page)
+        _, etag, page = _INDEX_PAGE
+        if etag in request.if_none_match:
+            response = Response(status=304)
         else:
-            modified_html = html_content
-        return modified_html
+            response = Response(page, mimetype='text/html')
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
     except Exception as e:
         logging.error(f"Error serving index page: {e}", exc_info=True)
         return "Internal Server Error", 500
 
 
+@app.route('/static/<path:filename>')
+def static_asset(filename):
+    """
+    Static files with content-hash ETags and precompressed variants.
+    Requests carrying the current asset version (?v=...) are cacheable
+    forever; others revalidate, and a matching ETag gets a 304 without
+    the file being read.
+    """
+    assets = _static_assets()
+    asset = assets.lookup(filename)
+    if asset is None:
+        return jsonify({'error': 'Not found'}), 404
+    versioned = request.args.get('v') == assets.version()
+    headers = {'Cache-Control': 'public, max-age=31536000, immutable' if versioned else 'no-cache',
+               'Vary': 'Accept-Encoding'}
+    if asset.matches(request.if_none_match):
+        response = Response(status=304, headers=headers)
+        response.set_etag(asset.etag())
+        return response
+    encoding, path = asset.negotiate(request.accept_encodings.values())
+    response = send_file(path, mimetype=asset.mimetype, conditional=False, etag=False)
+    response.headers.update(headers)
+    response.set_etag(asset.etag(encoding))
+    if encoding != 'identity':
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+
+# /file: content fingerprints by path, re-hashed only when (mtime, size,
+# inode) change, so conditional requests are answered from a stat().
+_FILE_FINGERPRINTS = OrderedDict()
+_FILE_FINGERPRINTS_LOCK = threading.Lock()
+FILE_FINGERPRINT_ENTRIES = 1024
+FILE_MAX_BYTES = _env_int("VIBE_FILE_MAX_BYTES", 50 * 1024 * 1024)
+# Bytes inspected to classify a file as binary.
+BINARY_SNIFF_BYTES = 8192
+
+
+def _file_fingerprint(target, st):
+    """(etag, is_binary) for `target`, from cache when its stat is unchanged."""
+    stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+    with _FILE_FINGERPRINTS_LOCK:
+        cached = _FILE_FINGERPRINTS.get(target)
+        if cached is not None and cached[0] == stamp:
+            _FILE_FINGERPRINTS.move_to_end(target)
+            return cached[1], cached[2]
+    sha = hashlib.sha256()
+    with open(target, 'rb') as f:
+        head = f.read(BINARY_SNIFF_BYTES)
+        sha.update(head)
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha.update(block)
+    binary = b'\0' in head
+    if not binary:
+        try:
+            # final=False: a multi-byte character cut at the sniff
+            # boundary is not an error.
+            codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+        except UnicodeDecodeError:
+            binary = True
+    etag = sha.hexdigest()[:20]
+    with _FILE_FINGERPRINTS_LOCK:
+        _FILE_FINGERPRINTS[target] = (stamp, etag, binary)
+        _FILE_FINGERPRINTS.move_to_end(target)
+        while len(_FILE_FINGERPRINTS) > FILE_FINGERPRINT_ENTRIES:
+            _FILE_FINGERPRINTS.popitem(last=False)
+    return etag, binary
+
+
+def _content_hash(data):
+    """Hash of file bytes, as /file sends it for an ETag."""
+    return hashlib.sha256(data).hexdigest()[:20]
+
+
+def _read_text_with_hash(path):
+    """(text, content hash) of `path`, or (None, None) if it doesn't exist."""
+    if not path.is_file():
+        return None, None
+    raw = path.read_bytes()
+    # Universal newlines, as read_text() would give.
+    text = raw.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+    return text, _content_hash(raw)
+
+
 @app.route('/file')
 def get_file():
     logger = logging
@@ -428,13 +1336,43 @@ def get_file():
         logger.warning(f"Not found: {target}")
         return jsonify({'error': 'Not found'}), 404
     try:
-        return Response(target.read_text(
-            encoding='utf-8'), mimetype='text/plain')
+        st = target.stat()
+        if st.st_size > FILE_MAX_BYTES:
+            return jsonify({'error': f'File too large ({st.st_size} bytes, limit {FILE_MAX_BYTES})'}), 413
+        etag, binary = _file_fingerprint(target, st)
+        if binary:
+            return jsonify({'error': 'Binary file; only text files can be opened'}), 415
+        if etag in request.if_none_match:
+            response = Response(status=304)
+        else:
+            # Sent as bytes straight from the file (sendfile where the
+            # server supports it), never decoded into a str.
+            response = send_file(target, mimetype='text/plain', conditional=False, etag=False)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
     except Exception as e:
         logger.error(f"Read error {target}: {e}", exc_info=True)
         return jsonify({'error': f'Read error: {e}'}), 500
 
 
+@app.route('/symbols')
+def find_symbols():
+    logger = logging
+    name = request.args.get('name')
+    kind = request.args.get('kind')
+    if not name:
+        logger.error("/symbols missing 'name'.")
+        return jsonify({'error': "Missing 'name'"}), 400
+    if kind and kind not in ("function", "class", "method"):
+        return jsonify({'error': f"Invalid kind: {kind}"}), 400
+    try:
+        return jsonify(_symbol_index().find(name, kind)), 200
+    except Exception as e:
+        logger.error(f"Symbol lookup error for {name}: {e}", exc_info=True)
+        return jsonify({'error': f'Symbol lookup error: {e}'}), 500
+
+
 @app.route('/apply', methods=['POST'])
 def apply_route():
     logger = logging
@@ -454,17 +1392,27 @@ def apply_route():
         logger.error("/apply missing 'patch' content in request body.")
         return jsonify(
             {'error': "Missing 'patch' content in request body"}), 400
+    # Applying onto an existing session stacks this patch on its previews.
+    from vibe_session import preview_file, preview_text
+    sessions = _preview_sessions()
+    session_id = data.get('session') or request.headers.get('X-Vibe-Session')
+    if session_id:
+        session = sessions.get(session_id)
+        if session is None:
+            return jsonify({'error': 'Preview session not found or expired'}), 404
+    else:
+        session = sessions.create()
+    files = dict(session["files"])
 
     tmpdir = Path(tempfile.mkdtemp(prefix="vibe_apply_"))
     try:
-        patch_file = tmpdir / "upload.vibe"
-        patch_file.write_text(patch_text, encoding='utf-8')
         logger.debug(
-            f"--- APPLY ROUTE --- Patch text being written to temp file:\n{patch_text[:500]}...")
-        patches = vibe_cli.load_patches(patch_file)
+            f"--- APPLY ROUTE --- Patch text:\n{patch_text[:500]}...")
+        patches = _parse_patch_bundle(patch_text)
         if not patches:
             raise ValueError(
-                "No valid patches found in provided text by vibe_cli.load_patches.")
+                "No valid patches found in provided text by vibe_cli.parse_patches.")
+        vibe_cli.resolve_patch_targets(patches, BASE_DIR, index=_symbol_index())
 
         target_files_in_patch = set()
         for meta, _ in patches:
@@ -482,11 +1430,13 @@ def apply_route():
                 raise ValueError(
                     f"Invalid path: '{relative_path_str}' resolves outside base directory '{resolved_base_dir}'.")
             dst.parent.mkdir(parents=True, exist_ok=True)
-            if src.is_file():
-                dst.write_text(
-                    src.read_text(
-                        encoding='utf-8'),
-                    encoding='utf-8')
+            if relative_path_str not in files:
+                # A stacked file keeps the base of its first preview.
+                text, base = _read_text_with_hash(src)
+                files[relative_path_str] = preview_file(base, text, text)
+            text = preview_text(files[relative_path_str])
+            if text is not None:
+                dst.write_text(text, encoding='utf-8')
             target_files_in_patch.add(relative_path_str)
 
         vibe_cli.apply_patches(patches, tmpdir, dry=False)
@@ -502,7 +1452,14 @@ def apply_route():
                 else:
                     logger.warning(
                         f"File '{fn}' mentioned in patch was not found in temp dir after apply_patches.")
-        return jsonify(results), 200
+        for fn, text in results.items():
+            files[fn] = preview_file(files[fn]["base"], files[fn]["base_text"], text)
+        files = {fn: entry for fn, entry in files.items() if entry["edit"]["after"] is not None}
+        session = dict(session, files=files, patches=session["patches"] + 1)
+        sessions.save(session)
+        response = jsonify(results)
+        response.headers['X-Vibe-Session'] = session["id"]
+        return response, 200
     except (ValueError, FileNotFoundError) as e:
         logger.warning(f"/apply user error: {e}", exc_info=True)
         return jsonify({'error': f'Patch application failed: {e}'}), 400
@@ -520,6 +1477,11 @@ def apply_route():
                     exc_info=True)
 
 
+# /versions pages (?limit=&cursor=); without either, the full listing.
+VERSIONS_PAGE_SIZE = 100
+VERSIONS_MAX_PAGE = 1000
+
+
 @app.route("/versions", methods=["GET"])
 def list_versions():
     logger = logging
@@ -531,65 +1493,165 @@ def list_versions():
     if not target.is_relative_to(BASE_DIR):
         logger.warning(f"/versions outside BASE_DIR: {relative_fname}")
         return jsonify({'error': "Invalid path"}), 400
-    versions = []
+    limit = request.args.get("limit")
+    cursor = request.args.get("cursor")
+    if limit is None and cursor is None:
+        return jsonify(_list_versions(relative_fname)[0]), 200
+    try:
+        limit = max(1, min(int(limit or VERSIONS_PAGE_SIZE), VERSIONS_MAX_PAGE))
+        versions, next_cursor = _list_versions(relative_fname, limit, cursor)
+    except ValueError as e:
+        return jsonify({'error': f"Invalid limit or cursor: {e}"}), 400
+    return jsonify({"versions": versions, "next_cursor": next_cursor}), 200
+
+
+def _encode_versions_cursor(position):
+    raw = json.dumps(position, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def _decode_versions_cursor(cursor):
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError("malformed cursor") from e
+    if not isinstance(position, dict) or set(position) != {"git", "git_done", "backup"}:
+        raise ValueError("malformed cursor")
+    return position
+
+
+# Backup listings by (directory, file stem, suffix), oldest first, rebuilt
+# only when the VibeBackups directory's mtime moves (a backup was written
+# or pruned), so paging through them doesn't glob the directory each time.
+_BACKUP_LISTINGS = OrderedDict()
+_BACKUP_LISTINGS_LOCK = threading.Lock()
+BACKUP_LISTING_ENTRIES = 256
+
+
+def _backup_listing(target):
+    """[(sha, iso date, timestamp)] of `target`'s backups, oldest first."""
     backups_dir = target.parent / "VibeBackups"
-    if backups_dir.is_dir():
-        import datetime
+    try:
+        st = backups_dir.stat()
+    except OSError:
+        return []
+    key = (str(backups_dir), target.stem, target.suffix)
+    stamp = (st.st_mtime_ns, st.st_ino)
+    with _BACKUP_LISTINGS_LOCK:
+        cached = _BACKUP_LISTINGS.get(key)
+        if cached is not None and cached[0] == stamp:
+            _BACKUP_LISTINGS.move_to_end(key)
+            return cached[1]
+    listing = []
+    try:
+        for p in backups_dir.glob(f"{target.stem}_*{target.suffix}"):
+            match = re.search(r"_(\d{8}_\d{6})", p.stem)
+            if not match:
+                continue
+            try:
+                dt = datetime.datetime.strptime(match.group(1), "%Y%m%d_%H%M%S")
+            except ValueError as parse_err:
+                logging.warning(f"Backup parse error {p.name}: {parse_err}")
+                continue
+            listing.append((match.group(1), dt.isoformat(), dt.timestamp()))
+    except OSError as backup_err:
+        logging.error(f"Backup access error: {backup_err}", exc_info=True)
+        return listing
+    listing.sort()
+    with _BACKUP_LISTINGS_LOCK:
+        _BACKUP_LISTINGS[key] = (stamp, listing)
+        _BACKUP_LISTINGS.move_to_end(key)
+        while len(_BACKUP_LISTINGS) > BACKUP_LISTING_ENTRIES:
+            _BACKUP_LISTINGS.popitem(last=False)
+    return listing
+
+
+def _backup_versions(target, before=None, limit=None):
+    """
+    Backups of `target`, newest first (their names sort by time): all of
+    them, or those older than backup `before`, at most `limit` of them.
+    """
+    listing = _backup_listing(target)
+    end = len(listing) if before is None else bisect.bisect_left(listing, (before,))
+    start = 0 if limit is None else max(0, end - limit)
+    return [{"sha": sha, "date": date, "type": "backup", "_ts": ts}
+            for sha, date, ts in reversed(listing[start:end])]
+
+
+def _git_version(sha, date):
+    try:
+        ts = datetime.datetime.strptime(date, "%Y-%m-%d %H:%M:%S %z").timestamp()
+    except ValueError:
+        ts = 0.0
+    return {"sha": sha, "date": date, "type": "git", "_ts": ts}
+
+
+def _list_versions(relative_fname, limit=None, cursor=None):
+    """
+    Backups and git commits of a file, newest first: all of them, or one
+    page of at most `limit` plus the cursor for the next page (None after
+    the last). Both sources are read from the cursor's position onwards
+    and merged lazily, so a page costs work in proportion to its size
+    rather than to the file's history. Raises ValueError for a bad cursor.
+    """
+    logger = logging
+    target = (BASE_DIR / relative_fname).resolve()
+    position = (_decode_versions_cursor(cursor) if cursor else
+                {"git": None, "git_done": False, "backup": None})
+
+    # The listing only changes when a backup is written (the directory
+    # mtime moves) or the repository state (HEAD, reflog) moves, so key
+    # the shared cache on both.
+    repo = _git_repo()
+    has_git = repo.is_repo()
+    head = repo.state() if has_git else None
+    cache_key = None
+    if head or not has_git:
         try:
-            backup_pattern = f"{target.stem}_*{target.suffix}"
-            entries = sorted(backups_dir.glob(backup_pattern))
-            for p in entries:
-                try:
-                    match = re.search(r"_(\d{8}_\d{6})", p.stem)
-                    if match:
-                        ts = match.group(1)
-                        dt = datetime.datetime.strptime(ts, "%Y%m%d_%H%M%S")
-                        versions.append(
-                            {"sha": ts, "date": dt.isoformat(), "type": "backup"})
-                except Exception as parse_err:
-                    logger.warning(f"Backup parse error {p.name}: {parse_err}")
-            # No return here yet, let git versions be appended if they exist
-        except Exception as backup_err:
-            logger.error(f"Backup access error: {backup_err}", exc_info=True)
-
-    try:
-        if (BASE_DIR / ".git").is_dir():
-            cmd = [
-                "git",
-                "log",
-                "--pretty=format:%H|%ci",
-                "--",
-                relative_fname]
-            process = subprocess.run(
-                cmd,
-                cwd=BASE_DIR,
-                capture_output=True,
-                text=True,
-                check=False)
-            if process.returncode == 0:
-                out = process.stdout.strip()
-                for line in out.splitlines():
-                    if line:
-                        try:
-                            sha, dt = line.split("|", 1)
-                            versions.append(
-                                {"sha": sha, "date": dt.strip(), "type": "git"})
-                        except ValueError:
-                            logger.warning(f"Git log parse error: {line}")
-    except FileNotFoundError:
-        logger.warning("Git not found for version listing.")
-    except Exception as e:
-        logger.error(f"Git versions error: {e}", exc_info=True)
-
-    if versions:
-        versions.sort(key=lambda x: x['date'], reverse=True)
-    for i, v in enumerate(versions):
-        logging.info(
-            f"[DEBUG] Version[{i}]: type={
-                v.get('type')} sha={
-                v.get('sha')} date={
-                v.get('date')}")
-    return jsonify(versions), 200
+            backups_mtime = (target.parent / "VibeBackups").stat().st_mtime_ns
+        except OSError:
+            backups_mtime = 0
+        cache_key = hashlib.sha256(json.dumps(
+            [str(target), head, backups_mtime, limit, cursor]).encode('utf-8')).hexdigest()
+        cached = _shared_store().get("versions", cache_key)
+        if cached is not None:
+            return cached[0], cached[1]
+
+    # One more than the page can hold tells whether backups remain.
+    backups = _backup_versions(target, position["backup"],
+                               None if limit is None else limit + 1)
+    commits, git_more = [], False
+    if has_git and not position["git_done"]:
+        try:
+            if limit is None:
+                history = repo.file_history(relative_fname)
+            else:
+                history, git_more = repo.file_history_page(relative_fname, position["git"], limit)
+            commits = [_git_version(sha, date) for sha, date in history]
+        except FileNotFoundError:
+            logger.warning("Git not found for version listing.")
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Git versions error: {e}", exc_info=True)
+
+    merged = heapq.merge(backups, commits, key=lambda v: -v["_ts"])
+    versions = list(itertools.islice(merged, limit) if limit is not None else merged)
+    for v in versions:
+        del v["_ts"]
+    next_cursor = None
+    if limit is not None:
+        taken_git = [v["sha"] for v in versions if v["type"] == "git"]
+        taken_backups = [v["sha"] for v in versions if v["type"] == "backup"]
+        git_left = git_more or len(taken_git) < len(commits)
+        if git_left or len(taken_backups) < len(backups):
+            next_cursor = _encode_versions_cursor({
+                "git": taken_git[-1] if taken_git else position["git"],
+                "git_done": position["git_done"] or not git_left,
+                "backup": taken_backups[-1] if taken_backups else position["backup"]})
+    if cache_key:
+        _shared_store().set("versions", cache_key, [versions, next_cursor])
+    return versions, next_cursor
 
 
 @app.route("/version", methods=["GET"])
@@ -615,18 +1677,17 @@ def get_version():
                     exc_info=True)
                 return jsonify({'error': 'Send error'}), 500
     try:
-        if not (BASE_DIR / ".git").is_dir():
+        repo = _git_repo()
+        if not repo.is_repo():
             return jsonify({'error': 'Not a backup and not a git repo'}), 404
-        cmd = ["git", "show", f"{sha}:{relative_fname}"]
-        content = subprocess.check_output(
-            cmd, cwd=BASE_DIR, text=True, stderr=subprocess.PIPE)
+        content = repo.read_blob(sha, relative_fname)
+        if content is None:
+            logger.warning(f"Git blob not found: {sha}:{relative_fname}")
+            return jsonify({'error': 'Version not found in Git'}), 404
         return Response(content, mimetype="text/plain")
     except FileNotFoundError:
         logger.warning("Git not found for getting version content.")
         return jsonify({'error': 'Version not found (git cmd failed)'}), 404
-    except subprocess.CalledProcessError as e:
-        logger.warning(f"Git show failed: {e.stderr.strip()}")
-        return jsonify({'error': 'Version not found in Git'}), 404
     except Exception as e:
         logger.error(f"Git version error: {e}", exc_info=True)
         return jsonify({'error': 'Git version error'}), 500
@@ -658,12 +1719,14 @@ def revert_version():
                 return jsonify({'error': 'Read backup error'}), 500
     if version_content is None:
         try:
-            if not (BASE_DIR / ".git").is_dir():
+            repo = _git_repo()
+            if not repo.is_repo():
                 return jsonify(
                     {'error': 'Version not found (not backup/git repo)'}), 404
-            cmd = ["git", "show", f"{sha}:{relative_fname}"]
-            version_content = subprocess.check_output(
-                cmd, cwd=BASE_DIR, text=True, stderr=subprocess.PIPE)
+            blob = repo.read_blob(sha, relative_fname)
+            if blob is None:
+                return jsonify({'error': 'Version not found in Git'}), 404
+            version_content = blob.decode('utf-8')
         except Exception as e:
             logger.error(f"Revert get version error: {e}", exc_info=True)
             return jsonify({'error': f'Retrieve version error: {e}'}), 404
@@ -671,118 +1734,424 @@ def revert_version():
         logger.error("Version content None.")
         return jsonify({'error': 'Version not found'}), 500
     try:
+        old_text = target.read_text(encoding='utf-8')
         _backup(target)
     except Exception as e:
         logger.error(f"Revert backup error: {e}", exc_info=True)
         return jsonify({'error': 'Backup error'}), 500
     try:
         target.write_text(version_content, encoding='utf-8')
+        _journal_record(f"Revert {relative_fname} to {sha}",
+                        [_file_edit(target, old_text, version_content)])
         return "", 204
     except Exception as e:
         logger.error(f"Revert write error: {e}", exc_info=True)
         return jsonify({'error': f'Write error: {e}'}), 500
 
 
-@app.route('/accept_changes', methods=['POST'])
-def accept_changes():
+def _version_text(target, relative_fname, sha):
+    """
+    Text of `relative_fname` at version `sha` (a backup timestamp or a git
+    revision), or of the working file when `sha` is None. None if there
+    is no such version.
+    """
+    if sha is None:
+        return target.read_text(encoding='utf-8') if target.is_file() else None
+    if re.fullmatch(r"\d{8}_\d{6}", sha):
+        backup_path = target.parent / "VibeBackups" / f"{target.stem}_{sha}{target.suffix}"
+        if backup_path.is_file():
+            return backup_path.read_text(encoding='utf-8')
+    repo = _git_repo()
+    if not repo.is_repo():
+        return None
+    blob = repo.read_blob(sha, relative_fname)
+    return None if blob is None else blob.decode('utf-8')
+
+
+def _symbol_table(text):
+    """vibe_index.symbol_hashes(text), memoised in the shared store by content hash."""
+    from vibe_index import symbol_hashes
+    key = hashlib.sha256(text.encode('utf-8')).hexdigest()
+    return _shared_store().get_or_compute("symbols", key, lambda: symbol_hashes(text))
+
+
+@app.route("/symbols/diff", methods=["GET"])
+def symbol_diff():
+    """
+    Symbols added, removed and changed between two versions of a file
+    (`from`, `to`: as for /version; `to` defaults to the working file),
+    compared by per-symbol content hash rather than by text diff.
+    """
+    logger = logging
+    relative_fname = request.args.get("file")
+    old_sha = request.args.get("from")
+    new_sha = request.args.get("to") or None
+    if not relative_fname or not old_sha:
+        return jsonify({'error': "Missing 'file' or 'from'"}), 400
+    target = (BASE_DIR / relative_fname).resolve()
+    if not target.is_relative_to(BASE_DIR.resolve()):
+        return jsonify({'error': "Invalid path"}), 400
+    tables = []
+    for sha in (old_sha, new_sha):
+        try:
+            text = _version_text(target, relative_fname, sha)
+            if text is None:
+                return jsonify({'error': f"Version not found: {sha or 'working file'}"}), 404
+            tables.append(_symbol_table(text))
+        except (SyntaxError, ValueError) as e:
+            return jsonify({'error': f"Cannot parse {sha or 'working file'}: {e}"}), 422
+        except Exception as e:
+            logger.error(f"Symbol diff error: {e}", exc_info=True)
+            return jsonify({'error': f'Symbol diff error: {e}'}), 500
+    old, new = tables
+
+    def span(entry):
+        return [entry["start"], entry["end"]] if entry else None
+
+    result = {"added": [], "removed": [], "changed": [], "unchanged": 0}
+    for name in list(old) + [n for n in new if n not in old]:
+        a, b = old.get(name), new.get(name)
+        if a and b and a["hash"] == b["hash"]:
+            result["unchanged"] += 1
+            continue
+        bucket = "added" if a is None else "removed" if b is None else "changed"
+        result[bucket].append({"name": name, "kind": (b or a)["kind"],
+                               "from": span(a), "to": span(b)})
+    return jsonify(result)
+
+
+@app.route("/revert/symbol", methods=["POST"])
+def revert_symbol():
+    """Replace one function, class or method with its definition at `sha`."""
     logger = logging
     payload = request.get_json(force=True) or {}
-    relative_fname = payload.get('file')
-    new_text = payload.get('text')
-    if not relative_fname or new_text is None:
-        logger.error("accept_changes missing 'file' or 'text' in payload.")
-        return jsonify({'error': "Missing 'file' or 'text'"}), 400
+    relative_fname = payload.get("file")
+    sha = payload.get("sha")
+    name = payload.get("symbol")
+    if not relative_fname or not sha or not name:
+        return jsonify({'error': "Missing 'file', 'sha' or 'symbol'"}), 400
+    target = (BASE_DIR / relative_fname).resolve()
+    if not target.is_relative_to(BASE_DIR.resolve()):
+        return jsonify({'error': "Invalid path"}), 400
+    try:
+        old_text = _version_text(target, relative_fname, sha)
+        current_text = target.read_text(encoding='utf-8') if target.is_file() else None
+    except Exception as e:
+        logger.error(f"Symbol revert read error: {e}", exc_info=True)
+        return jsonify({'error': f'Read error: {e}'}), 500
+    if old_text is None or current_text is None:
+        return jsonify({'error': 'Version not found' if current_text is not None else 'Not found'}), 404
+    try:
+        old_symbol = _symbol_table(old_text).get(name)
+        current_symbol = _symbol_table(current_text).get(name)
+    except (SyntaxError, ValueError) as e:
+        return jsonify({'error': f'Cannot parse: {e}'}), 422
+    if old_symbol is None:
+        return jsonify({'error': f"'{name}' is not defined in version {sha}"}), 404
+    if current_symbol is None:
+        return jsonify({'error': f"'{name}' is not defined in the current file"}), 404
+    if old_symbol["count"] > 1 or current_symbol["count"] > 1:
+        return jsonify({'error': f"'{name}' is defined more than once; revert the whole file instead"}), 409
+    if old_symbol["hash"] == current_symbol["hash"]:
+        return "", 204
+    old_lines = old_text.splitlines(keepends=True)
+    lines = current_text.splitlines(keepends=True)
+    block = "".join(old_lines[old_symbol["start"] - 1:old_symbol["end"]])
+    if not block.endswith("\n"):
+        block += "\n"
+    # Re-indent to where the symbol sits now.
+    first = lines[current_symbol["start"] - 1]
+    indent = first[:len(first) - len(first.lstrip())]
+    block = textwrap.indent(textwrap.dedent(block), indent)
+    lines[current_symbol["start"] - 1:current_symbol["end"]] = [block]
+    try:
+        edit = _save_text(target, relative_fname, "".join(lines), _backup_limit(payload))
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 500
+    _journal_record(f"Revert {name} in {relative_fname} to {sha}", [edit])
+    return "", 204
+
+
+def _backup_limit(payload):
     try:
         backup_limit = int(payload.get('backupLimit', 20))
     except (ValueError, TypeError):
         backup_limit = 20
     if backup_limit < 0:
         backup_limit = 20
-    target = (BASE_DIR / relative_fname).resolve()
-    resolved_base_dir = BASE_DIR.resolve()
-    if not target.is_relative_to(resolved_base_dir) and not target.resolve(
-    ).is_relative_to(resolved_base_dir.resolve()):
-        logger.error(f"accept_changes path outside BASE_DIR: {relative_fname}")
-        return jsonify({'error': "Invalid path specified"}), 400
+    return backup_limit
+
+
+def _save_text(target, relative_fname, new_text, backup_limit):
+    """
+    Write `new_text` to `target`, backing up the old content first and
+    pruning backups beyond `backup_limit`. Returns the journal edit for
+    the write (see _journal_record), or None if the content was already
+    `new_text`; raises RuntimeError with a user-facing message on failure.
+    """
+    logger = logging
     try:
         target.parent.mkdir(parents=True, exist_ok=True)
     except OSError as e:
         logger.error(
             f"Error creating parent directory for {target}: {e}",
             exc_info=True)
-        return jsonify(
-            {'error': f"Failed to create directory structure: {e}"}), 500
+        raise RuntimeError(f"Failed to create directory structure: {e}")
     target_exists = target.is_file()
     current_content = None
-    needs_write = True
     if target_exists:
         try:
             current_content = target.read_text(encoding='utf-8')
-            if current_content == new_text:
-                logger.info(
-                    f"Content identical for existing file: {relative_fname}. No action needed.")
-                needs_write = False
-            else:
-                logger.info(
-                    f"Content differs for existing file: {relative_fname}. Will backup and update.")
         except Exception as e:
             logger.error(
                 f"Error reading existing target file {target}: {e}",
                 exc_info=True)
-            return jsonify({'error': f"Error reading target file: {e}"}), 500
+            raise RuntimeError(f"Error reading target file: {e}")
+        if current_content == new_text:
+            logger.info(
+                f"Content identical for existing file: {relative_fname}. No action needed.")
+            return None
+        logger.info(
+            f"Content differs for existing file: {relative_fname}. Will backup and update.")
+        try:
+            backup_path = _backup(target)
+            logger.info(
+                f"Created backup '{backup_path.name}' for {relative_fname} before update.")
+        except Exception as e:
+            logger.error(
+                f"Backup creation failed for {target}: {e}",
+                exc_info=True)
+            raise RuntimeError(f"Backup error, aborting save: {e}")
     else:
         logger.info(
             f"Target file {relative_fname} does not exist. Will be created.")
-    backup_performed = False
-    if needs_write:
-        if target_exists:
-            try:
-                backup_path = _backup(target)
-                backup_performed = True
-                logger.info(
-                    f"Created backup '{
-                        backup_path.name}' for {relative_fname} before update.")
-            except Exception as e:
-                logger.error(
-                    f"Backup creation failed for {target}: {e}",
-                    exc_info=True)
-                return jsonify(
-                    {'error': f"Backup error, aborting save: {e}"}), 500
+    try:
+        target.write_text(new_text, encoding='utf-8')
+        action = "created" if not target_exists else "updated"
+        logger.info(f"Successfully {action} file: {relative_fname}")
+    except Exception as e:
+        logger.error(f"Write failed for {target}: {e}", exc_info=True)
+        raise RuntimeError(f"Write error after potential backup: {e}")
+    if target_exists:
+        _prune_backups(target, relative_fname, backup_limit)
+    return _file_edit(target, current_content, new_text)
+
+
+def _file_edit(target, old_text, new_text):
+    from vibe_journal import file_edit
+    return file_edit(target.relative_to(BASE_DIR.resolve()).as_posix(), old_text, new_text)
+
+
+def _prune_backups(target, relative_fname, backup_limit):
+    bdir = target.parent / "VibeBackups"
+    if not bdir.is_dir():
+        return
+    try:
+        backup_pattern = f"{target.stem}_*{target.suffix}"
+        all_backups = sorted(
+            [p for p in bdir.glob(backup_pattern) if p.is_file()])
+        num_backups = len(all_backups)
+        if num_backups > backup_limit:
+            num_to_delete = num_backups - backup_limit
+            backups_to_delete = all_backups[:num_to_delete]
+            logging.info(
+                f"Pruning {num_to_delete} old backup(s) for {relative_fname} (limit {backup_limit}).")
+            for bp in backups_to_delete:
+                try:
+                    bp.unlink()
+                except OSError as delete_err:
+                    logging.error(
+                        f"  Error deleting old backup {bp.name}: {delete_err}")
+    except Exception as prune_err:
+        logging.error(
+            f"Error during backup pruning for {relative_fname}: {prune_err}",
+            exc_info=True)
+
+
+@app.route('/accept_changes', methods=['POST'])
+def accept_changes():
+    logger = logging
+    payload = request.get_json(force=True) or {}
+    relative_fname = payload.get('file')
+    new_text = payload.get('text')
+    if not relative_fname or new_text is None:
+        logger.error("accept_changes missing 'file' or 'text' in payload.")
+        return jsonify({'error': "Missing 'file' or 'text'"}), 400
+    backup_limit = _backup_limit(payload)
+    target = (BASE_DIR / relative_fname).resolve()
+    resolved_base_dir = BASE_DIR.resolve()
+    if not target.is_relative_to(resolved_base_dir) and not target.resolve(
+    ).is_relative_to(resolved_base_dir.resolve()):
+        logger.error(f"accept_changes path outside BASE_DIR: {relative_fname}")
+        return jsonify({'error': "Invalid path specified"}), 400
+    # Optional: the /file ETag the text was edited from. Without the base
+    # text there is nothing to merge, so a mismatch is simply refused.
+    base = payload.get('base')
+    if base:
         try:
-            target.write_text(new_text, encoding='utf-8')
-            action = "created" if not target_exists else "updated"
-            logger.info(f"Successfully {action} file: {relative_fname}")
-        except Exception as e:
-            logger.error(f"Write failed for {target}: {e}", exc_info=True)
-            return jsonify(
-                {'error': f"Write error after potential backup: {e}"}), 500
-    if backup_performed and backup_limit >= 0:
-        bdir = target.parent / "VibeBackups"
-        if bdir.is_dir():
-            try:
-                backup_pattern = f"{target.stem}_*{target.suffix}"
-                all_backups = sorted(
-                    [p for p in bdir.glob(backup_pattern) if p.is_file()])
-                num_backups = len(all_backups)
-                if num_backups > backup_limit:
-                    num_to_delete = num_backups - backup_limit
-                    backups_to_delete = all_backups[:num_to_delete]
-                    logger.info(
-                        f"Pruning {num_to_delete} old backup(s) for {relative_fname} (limit {backup_limit}).")
-                    for bp in backups_to_delete:
-                        try:
-                            bp.unlink()
-                        except OSError as delete_err:
-                            logger.error(
-                                f"  Error deleting old backup {
-                                    bp.name}: {delete_err}")
-            except Exception as prune_err:
-                logger.error(
-                    f"Error during backup pruning for {relative_fname}: {prune_err}",
-                    exc_info=True)
+            _, current = _read_text_with_hash(target)
+        except (OSError, UnicodeDecodeError) as e:
+            return jsonify({'error': f"Error reading target file: {e}"}), 500
+        if current != base:
+            logger.warning(f"accept_changes: {relative_fname} changed on disk since it was loaded.")
+            return jsonify({'error': 'File changed on disk since it was loaded',
+                            'stale': [relative_fname]}), 409
+    try:
+        edit = _save_text(target, relative_fname, new_text, backup_limit)
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 500
+    _journal_record(f"Save {relative_fname}", [edit])
+    return "", 204
+
+
+@app.route('/sessions/<session_id>', methods=['GET'])
+def get_preview_session(session_id):
+    from vibe_session import preview_text
+    session = _preview_sessions().get(session_id)
+    if session is None:
+        return jsonify({'error': 'Preview session not found or expired'}), 404
+    with_text = request.args.get('text', '').lower() in ('1', 'true', 'yes')
+    files = {}
+    for fn, entry in session["files"].items():
+        files[fn] = {"base": entry["base"]}
+        if with_text:
+            files[fn]["text"] = preview_text(entry)
+    return jsonify({"id": session["id"], "expires": session["expires"],
+                    "patches": session["patches"], "files": files})
+
+
+@app.route('/sessions/<session_id>', methods=['DELETE'])
+def discard_preview_session(session_id):
+    if not _preview_sessions().discard(session_id):
+        return jsonify({'error': 'Preview session not found or expired'}), 404
     return "", 204
 
 
+@app.route('/sessions/<session_id>/commit', methods=['POST'])
+def commit_preview_session(session_id):
+    """
+    Write one file (`{"file": ...}`) or every file of a preview session.
+    A file changed on disk since it was previewed gets the preview's
+    edits rebased onto its new content (a three-way merge against the
+    preview's base). If they overlap changes made on disk, the response
+    is a 409 describing each conflict, and nothing is written at all.
+    Committed files leave the session; once it has none, it is discarded.
+    """
+    from vibe_session import preview_text, rebase
+    logger = logging
+    sessions = _preview_sessions()
+    session = sessions.get(session_id)
+    if session is None:
+        return jsonify({'error': 'Preview session not found or expired'}), 404
+    payload = request.get_json(force=True, silent=True) or {}
+    backup_limit = _backup_limit(payload)
+    only = payload.get('file')
+    if only is not None and only not in session["files"]:
+        return jsonify({'error': f"'{only}' is not part of this preview session"}), 404
+    names = [only] if only is not None else list(session["files"])
+    resolved_base_dir = BASE_DIR.resolve()
+    targets, texts, rebased, conflicts = {}, {}, [], {}
+    for fn in names:
+        entry = session["files"][fn]
+        target = (BASE_DIR / fn).resolve()
+        if not target.is_relative_to(resolved_base_dir):
+            return jsonify({'error': "Invalid path specified"}), 400
+        try:
+            current_text, current = _read_text_with_hash(target)
+        except (OSError, UnicodeDecodeError) as e:
+            return jsonify({'error': f"Error reading target file: {e}"}), 500
+        targets[fn], texts[fn] = target, preview_text(entry)
+        if current == entry["base"]:
+            continue
+        if current_text is None:
+            conflicts[fn] = [{"error": "File was deleted on disk"}]
+            continue
+        merged, clashes = rebase(entry.get("base_text") or "", texts[fn], current_text)
+        if clashes:
+            conflicts[fn] = clashes
+        else:
+            texts[fn] = merged
+            rebased.append(fn)
+    if conflicts:
+        logger.warning(f"Preview session {session_id}: conflicts with changes on disk in {list(conflicts)}")
+        return jsonify({'error': 'The preview conflicts with changes made on disk since',
+                        'conflicts': conflicts}), 409
+    if rebased:
+        logger.info(f"Preview session {session_id}: rebased onto changes on disk: {rebased}")
+    files = dict(session["files"])
+    committed, edits = {}, []
+    for fn, target in targets.items():
+        text = texts[fn]
+        try:
+            edits.append(_save_text(target, fn, text, backup_limit))
+        except RuntimeError as e:
+            _journal_record(f"Commit preview ({', '.join(committed)})", edits)
+            return jsonify({'error': str(e), 'committed': committed}), 500
+        committed[fn] = _content_hash(text.encode('utf-8'))
+        del files[fn]
+    # Committed files leave the session; once none are left, so does it.
+    if files:
+        sessions.save(dict(session, files=files))
+    else:
+        sessions.discard(session_id)
+    _journal_record(f"Commit preview ({', '.join(committed)})", edits)
+    return jsonify({"committed": committed, "rebased": rebased})
+
+
+def _journal_target(rel_path):
+    target = (BASE_DIR / rel_path).resolve()
+    if not target.is_relative_to(BASE_DIR.resolve()):
+        raise ValueError(f"Journaled path outside BASE_DIR: {rel_path}")
+    return target
+
+
+def _journal_read(rel_path):
+    target = _journal_target(rel_path)
+    return target.read_text(encoding='utf-8') if target.is_file() else None
+
+
+def _journal_write(rel_path, text):
+    target = _journal_target(rel_path)
+    if text is None:
+        target.unlink(missing_ok=True)
+    else:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(text, encoding='utf-8')
+
+
+@app.route('/undo', methods=['POST'])
+@app.route('/redo', methods=['POST'])
+def undo_redo():
+    """
+    Undo the latest save, or redo the latest undone one, by replaying its
+    journaled edit. Refused with 409 if a file it touches has changed
+    since; nothing is written then.
+    """
+    from vibe_journal import Diverged
+    logger = logging
+    journal = _journal()
+    undo = request.path == '/undo'
+    try:
+        if undo:
+            entry = journal.undo(_journal_read, _journal_write)
+        else:
+            entry = journal.redo(_journal_read, _journal_write)
+    except Diverged as e:
+        return jsonify({'error': str(e), 'diverged': e.files}), 409
+    except Exception as e:
+        logger.error(f"{request.path} error: {e}", exc_info=True)
+        return jsonify({'error': f'{request.path[1:].capitalize()} failed: {e}'}), 500
+    if entry is None:
+        return jsonify({'error': f"Nothing to {request.path[1:]}"}), 404
+    return jsonify({"id": entry["id"], "label": entry["label"],
+                    "files": [edit["file"] for edit in entry["files"]]})
+
+
+@app.route('/journal', methods=['GET'])
+def journal_history():
+    return jsonify(_journal().history())
+
+
 @app.route('/system-prompt')
 def get_system_prompt_for_copy():  # Renamed to avoid conflict if you want a different prompt for LLM
     logger = logging
@@ -807,15 +2176,106 @@ if False:
 
 @app.route('/llm/status', methods=['GET'])
 def llm_status():
-    # Assuming GOOGLE_API_KEY, etc., are global as defined in Patch 2
-    # and jsonify is imported
-    status = {
-        "gemini": bool(GOOGLE_API_KEY),
-        "anthropic": bool(ANTHROPIC_API_KEY),
-        "openai": bool(OPENAI_API_KEY)
-        # Add other providers here as you implement them
-    }
-    return jsonify(status)
+    return jsonify(LLM_PROVIDERS.status())
+
+
+@app.route('/llm/metrics', methods=['GET'])
+def llm_metrics():
+    return jsonify({"response_cache": _response_cache().metrics(),
+                    "generation_pool": LLM_POOL.metrics(),
+                    "coalescing": LLM_FLIGHTS.metrics(),
+                    "hedging": LLM_HEDGE.metrics(),
+                    "prompt_cache": LLM_PROVIDERS.prompt_cache_metrics(),
+                    "shared_store": _shared_store().metrics()})
+
+
+def _serve(host, port, sock=None):
+    """
+    Serve with waitress (a production WSGI server with a fixed thread
+    pool) when it is installed, otherwise with the threaded Flask server.
+    Either way each request gets its own thread, and LLM calls are further
+    confined to LLM_POOL. `sock` is an already-listening socket (pre-fork
+    workers).
+    """
+    try:
+        from waitress import serve
+    except ImportError:
+        logging.warning("waitress is not installed; falling back to the threaded Flask "
+                        "development server (pip install waitress).")
+        if sock is None:
+            app.run(host=host, port=port, debug=False, threaded=True)
+            return
+        from werkzeug.serving import make_server
+        make_server(host, port, app, threaded=True, fd=sock.fileno()).serve_forever()
+        return
+    if sock is None:
+        logging.info(f"Serving with waitress ({HTTP_THREADS} threads).")
+        serve(app, host=host, port=port, threads=HTTP_THREADS)
+    else:
+        serve(app, sockets=[sock], threads=HTTP_THREADS)
+
+
+def _serve_prefork(host, port, workers, warmup=True):
+    """
+    Bind once, then fork `workers` processes that accept on the shared
+    socket. Forking happens after all imports, so workers start instantly
+    and share the parent's pages copy-on-write. Dead workers are
+    restarted; SIGINT/SIGTERM stop them all.
+    """
+    import signal
+    import socket
+    if not hasattr(os, "fork"):
+        logging.error("--workers needs os.fork(); serving with a single process.")
+        return _serve(host, port)
+    sock = socket.create_server((host, port), backlog=256)
+    sock.set_inheritable(True)
+    children = {}
+    stopping = False
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                if warmup:
+                    LLM_PROVIDERS.warm_up(background=True)
+                _serve(host, port, sock)
+            except BaseException:
+                logging.error("Worker crashed", exc_info=True)
+                code = 1
+            finally:
+                os._exit(code)
+        children[pid] = time.monotonic()
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for _ in range(workers):
+        spawn()
+    logging.info(f"Started {workers} workers: {sorted(children)}")
+    while children:
+        try:
+            pid, _status = os.wait()
+        except ChildProcessError:
+            break
+        started = children.pop(pid, None)
+        if stopping or started is None:
+            continue
+        logging.warning(f"Worker {pid} exited; restarting.")
+        if time.monotonic() - started < 1:
+            time.sleep(1)  # don't spin on a worker that dies at startup
+        spawn()
+    sock.close()
 
 
 # -----------------------------------------------------------------------------
@@ -844,6 +2304,15 @@ if __name__ == "__main__":
         "--host",
         default="0.0.0.0",
         help="Host (default: 0.0.0.0)")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes (default: 1). >1 pre-forks and shares caches via .vibe_cache")
+    parser.add_argument(
+        "--no-warmup",
+        action="store_true",
+        help="Don't pre-connect LLM provider clients at startup")
     try:
         args = parser.parse_args()
         BASE_DIR = Path(args.baseDir).expanduser().resolve()
@@ -868,5 +2337,14 @@ if __name__ == "__main__":
         logging.info(f"No initial file specified.")
     logging.info(f"GenAI Configured: {genai_configured}")
     logging.info(f"Listening on http://{HOST}:{PORT}")
-
-    app.run(host=HOST, port=PORT, debug=False)
+    if args.workers > 1:
+        SHARED_STORE_PERSISTENT = True
+        # Build before forking: a worker forked while the build thread held
+        # a lock (its own or logging's) would deadlock on it.
+        _build_static_assets()
+        _serve_prefork(HOST, PORT, args.workers, warmup=not args.no_warmup)
+    else:
+        threading.Thread(target=_build_static_assets, name="static-build", daemon=True).start()
+        if not args.no_warmup:
+            LLM_PROVIDERS.warm_up(background=True)
+        _serve(HOST, PORT)
@@ -0,0 +1,7 @@
+# hello.py
+def greet(name):
+    print(f"Hello, {name}!")
+
+class Greeter:
+    def greet(self):
+        print("Greeter says hi!")
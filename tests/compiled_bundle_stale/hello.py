@@ -0,0 +1,10 @@
+# hello.py
+def greet(name):
+    print(f"Hello, {name}!")
+
+def farewell(name):
+    print(f"Goodbye, {name}!")
+
+class Greeter:
+    def __init__(self, name):
+        print(f'Hello {name}')
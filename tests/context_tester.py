@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Prompt-size check for /generate-patch, run against the local mock
+provider so no API keys are needed:
+
+    python tests/context_tester.py
+
+Sends the same request for a large module twice, once with symbol-level
+slicing and once with it disabled ("context_budget": 0), and checks that
+the sliced prompt the provider receives is smaller but still holds the
+function the request is about in full.
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+os.environ["VIBE_ENABLE_MOCK_LLM"] = "1"
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import server
+
+TARGET = "parse_config"
+TARGET_BODY = "    return {'path': path, 'strict': strict}"
+
+
+def large_module(n_functions: int = 300) -> str:
+    parts = ["import os\n"]
+    for i in range(n_functions):
+        if i == n_functions // 2:
+            parts.append(f"def {TARGET}(path, strict=False):\n{TARGET_BODY}\n")
+        parts.append(f"def helper_{i}(value):\n"
+                     f"    total = value * {i}\n"
+                     f"    for step in range({i % 7 + 1}):\n"
+                     f"        total += step\n"
+                     f"    return total\n")
+    return "\n\n".join(parts)
+
+
+def main():
+    server.BASE_DIR = Path(tempfile.mkdtemp())
+    mock = server.LLM_PROVIDERS.get("mock")
+    prompts = []
+    reply = mock._reply
+
+    def recording_reply(req):
+        # Both generate() and stream() answer through _reply().
+        prompts.append(req.user_message)
+        return reply(req)
+
+    mock._reply = recording_reply
+    client = server.app.test_client()
+    source = large_module()
+    body = {"llm_provider": "mock", "filename": "big.py", "file_content": source,
+            "prompt": f"Make {TARGET} reject empty paths", "cache": False}
+
+    failures = []
+    sliced = client.post("/generate-patch", json=body)
+    full = client.post("/generate-patch", json=dict(body, context_budget=0))
+    if sliced.status_code != 200 or full.status_code != 200:
+        failures.append(f"requests failed: {sliced.status_code}, {full.status_code}")
+    elif len(prompts) != 2:
+        failures.append(f"mock provider called {len(prompts)} times, expected 2")
+    else:
+        sliced_prompt, full_prompt = prompts
+        stats = sliced.get_json()["context"]
+        print(f"full prompt {len(full_prompt)} chars, sliced {len(sliced_prompt)} chars "
+              f"({stats['sent_tokens']}/{stats['full_tokens']} est. tokens)")
+        if not stats["sliced"]:
+            failures.append("large module was not sliced")
+        if stats["sent_tokens"] > stats["budget"]:
+            failures.append(f"sliced prompt is over budget ({stats['sent_tokens']} > {stats['budget']})")
+        if len(sliced_prompt) >= len(full_prompt):
+            failures.append("sliced prompt is not smaller than the full-file prompt")
+        if stats["prompt_chars"] != len(sliced_prompt):
+            failures.append("reported prompt_chars does not match the prompt sent")
+        if f"def {TARGET}(path, strict=False):\n{TARGET_BODY}" not in sliced_prompt:
+            failures.append(f"sliced prompt lost the body of {TARGET}")
+        if source not in full_prompt:
+            failures.append("context_budget=0 did not send the whole file")
+
+    for failure in failures:
+        print(f"[FAIL] {failure}")
+    if failures:
+        sys.exit(1)
+    print("[PASS] context slicing – OK")
+
+
+if __name__ == "__main__":
+    main()
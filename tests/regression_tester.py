@@ -6,6 +6,8 @@ from pathlib import Path
 import tempfile
 import shutil
 import argparse
+import contextlib
+import io
 import autopep8
 import re
 
@@ -47,23 +49,96 @@ def show_difference(str1, str2):
     diff = difflib.unified_diff(str1.splitlines(keepends=True), str2.splitlines(keepends=True))
     return ''.join(diff)
 
+def check_compiled(patch_path: Path) -> str:
+    """
+    Compile a copy of the bundle: loading it must go through the sidecar
+    and give what parsing does, and editing the bundle, or mangling the
+    sidecar, must make it stale. Returns an error message, or "" if all
+    is well.
+    """
+    tmpdir = Path(tempfile.mkdtemp())
+    try:
+        copy = tmpdir / patch_path.name
+        shutil.copy(patch_path, copy)
+        text = copy.read_text()
+        vibe_cli.compile_patches(copy)
+        if vibe_cli._load_compiled(copy, text) is None:
+            return "fresh sidecar was not used"
+        if vibe_cli.load_patches(copy) != vibe_cli.parse_patches(text):
+            return "sidecar patches differ from the parsed bundle"
+        copy.write_text(text + "\n")
+        with contextlib.redirect_stderr(io.StringIO()):  # the "stale" warning
+            stale = vibe_cli._load_compiled(copy, copy.read_text())
+        if stale is not None:
+            return "stale sidecar was used"
+        vibe_cli.compiled_path(copy).write_text("[]")
+        with contextlib.redirect_stderr(io.StringIO()):
+            if vibe_cli.load_patches(copy) != vibe_cli.parse_patches(copy.read_text()):
+                return "malformed sidecar was not ignored"
+        return ""
+    finally:
+        shutil.rmtree(tmpdir)
+
+def run_stream_case(case_dir: Path, patch_path: Path, patches) -> bool:
+    """
+    Cases without hello.py patch the non-Python file named by `file:`
+    for real, in a temp copy, so block patches take the streaming path.
+    The result must match .expected byte for byte, and the in-memory
+    preview (transform_source, as /apply and --dry use) must agree.
+    """
+    target = case_dir / patches[0][0]["file"]
+    expected_path = case_dir / f"{patch_path.stem}.expected"
+    tmpdir = Path(tempfile.mkdtemp())
+    try:
+        shutil.copy(target, tmpdir / target.name)
+        preview = target.read_text()
+        for meta, code in patches:
+            vibe_cli.validate_spec(meta)
+            preview = vibe_cli.transform_source(meta, code, preview, filename=target.name)
+            vibe_cli.apply_patch(meta, code, tmpdir)
+        got = (tmpdir / target.name).read_bytes()
+    finally:
+        shutil.rmtree(tmpdir)
+    if got != expected_path.read_bytes():
+        print(f"[FAIL] {case_dir.name} – Output does not match .expected")
+        print(show_difference(got.decode("utf-8"), expected_path.read_text()))
+        return False
+    if preview != expected_path.read_text():
+        print(f"[FAIL] {case_dir.name} – Preview differs from the applied file")
+        print(show_difference(preview, expected_path.read_text()))
+        return False
+    print(f"[PASS] {case_dir.name} – OK")
+    return True
+
 def run_case(case_dir: Path):
     patch_paths = list(case_dir.glob("*.vibe"))
     hello_path  = case_dir / "hello.py"
-    if len(patch_paths) != 1 or not hello_path.exists():
-        print(f"[SKIP] {case_dir.name} (needs 1 .vibe + hello.py)")
+    if len(patch_paths) != 1:
+        print(f"[SKIP] {case_dir.name} (needs exactly 1 .vibe)")
         return
 
     patch_path    = patch_paths[0]
     expected_path = case_dir / f"{patch_path.stem}.expected"
 
+    # Batch‑aware loading of one or more patches (through a committed
+    # .vibec sidecar, if the case has a fresh one)
+    patches = vibe_cli.load_patches(patch_path)
+
+    compile_error = check_compiled(patch_path)
+    if compile_error:
+        print(f"[FAIL] {case_dir.name} – {compile_error}")
+        return False
+
+    if not hello_path.exists():
+        if patches and patches[0][0].get("file"):
+            return run_stream_case(case_dir, patch_path, patches)
+        print(f"[SKIP] {case_dir.name} (needs hello.py, or a patch naming its target in file:)")
+        return
+
     # Read original and patch sources
     hello_src = hello_path.read_text()
     patch_src = patch_path.read_text()
 
-    # Batch‑aware loading of one or more patches
-    patches = vibe_cli.load_patches(patch_path)
-
     # Apply each patch in memory, chaining the results
     curr_src = hello_src
     for meta, code in patches:
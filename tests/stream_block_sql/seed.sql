@@ -0,0 +1,1005 @@
+-- generated seed data; do not edit by hand
+CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, role TEXT);
+INSERT INTO users VALUES (3, 'user00003', 'member');
+INSERT INTO users VALUES (6, 'user00006', 'member');
+INSERT INTO users VALUES (9, 'user00009', 'member');
+INSERT INTO users VALUES (12, 'user00012', 'member');
+INSERT INTO users VALUES (15, 'user00015', 'member');
+INSERT INTO users VALUES (18, 'user00018', 'member');
+INSERT INTO users VALUES (21, 'user00021', 'member');
+INSERT INTO users VALUES (24, 'user00024', 'member');
+INSERT INTO users VALUES (27, 'user00027', 'member');
+INSERT INTO users VALUES (30, 'user00030', 'member');
+INSERT INTO users VALUES (33, 'user00033', 'member');
+INSERT INTO users VALUES (36, 'user00036', 'member');
+INSERT INTO users VALUES (39, 'user00039', 'member');
+INSERT INTO users VALUES (42, 'user00042', 'member');
+INSERT INTO users VALUES (45, 'user00045', 'member');
+INSERT INTO users VALUES (48, 'user00048', 'member');
+INSERT INTO users VALUES (51, 'user00051', 'member');
+INSERT INTO users VALUES (54, 'user00054', 'member');
+INSERT INTO users VALUES (57, 'user00057', 'member');
+INSERT INTO users VALUES (60, 'user00060', 'member');
+INSERT INTO users VALUES (63, 'user00063', 'member');
+INSERT INTO users VALUES (66, 'user00066', 'member');
+INSERT INTO users VALUES (69, 'user00069', 'member');
+INSERT INTO users VALUES (72, 'user00072', 'member');
+INSERT INTO users VALUES (75, 'user00075', 'member');
+INSERT INTO users VALUES (78, 'user00078', 'member');
+INSERT INTO users VALUES (81, 'user00081', 'member');
+INSERT INTO users VALUES (84, 'user00084', 'member');
+INSERT INTO users VALUES (87, 'user00087', 'member');
+INSERT INTO users VALUES (90, 'user00090', 'member');
+INSERT INTO users VALUES (93, 'user00093', 'member');
+INSERT INTO users VALUES (96, 'user00096', 'member');
+INSERT INTO users VALUES (99, 'user00099', 'member');
+INSERT INTO users VALUES (102, 'user00102', 'member');
+INSERT INTO users VALUES (105, 'user00105', 'member');
+INSERT INTO users VALUES (108, 'user00108', 'member');
+INSERT INTO users VALUES (111, 'user00111', 'member');
+INSERT INTO users VALUES (114, 'user00114', 'member');
+INSERT INTO users VALUES (117, 'user00117', 'member');
+INSERT INTO users VALUES (120, 'user00120', 'member');
+INSERT INTO users VALUES (123, 'user00123', 'member');
+INSERT INTO users VALUES (126, 'user00126', 'member');
+INSERT INTO users VALUES (129, 'user00129', 'member');
+INSERT INTO users VALUES (132, 'user00132', 'member');
+INSERT INTO users VALUES (135, 'user00135', 'member');
+INSERT INTO users VALUES (138, 'user00138', 'member');
+INSERT INTO users VALUES (141, 'user00141', 'member');
+INSERT INTO users VALUES (144, 'user00144', 'member');
+INSERT INTO users VALUES (147, 'user00147', 'member');
+INSERT INTO users VALUES (150, 'user00150', 'member');
+INSERT INTO users VALUES (153, 'user00153', 'member');
+INSERT INTO users VALUES (156, 'user00156', 'member');
+INSERT INTO users VALUES (159, 'user00159', 'member');
+INSERT INTO users VALUES (162, 'user00162', 'member');
+INSERT INTO users VALUES (165, 'user00165', 'member');
+INSERT INTO users VALUES (168, 'user00168', 'member');
+INSERT INTO users VALUES (171, 'user00171', 'member');
+INSERT INTO users VALUES (174, 'user00174', 'member');
+INSERT INTO users VALUES (177, 'user00177', 'member');
+INSERT INTO users VALUES (180, 'user00180', 'member');
+INSERT INTO users VALUES (183, 'user00183', 'member');
+INSERT INTO users VALUES (186, 'user00186', 'member');
+INSERT INTO users VALUES (189, 'user00189', 'member');
+INSERT INTO users VALUES (192, 'user00192', 'member');
+INSERT INTO users VALUES (195, 'user00195', 'member');
+INSERT INTO users VALUES (198, 'user00198', 'member');
+INSERT INTO users VALUES (201, 'user00201', 'member');
+INSERT INTO users VALUES (204, 'user00204', 'member');
+INSERT INTO users VALUES (207, 'user00207', 'member');
+INSERT INTO users VALUES (210, 'user00210', 'member');
+INSERT INTO users VALUES (213, 'user00213', 'member');
+INSERT INTO users VALUES (216, 'user00216', 'member');
+INSERT INTO users VALUES (219, 'user00219', 'member');
+INSERT INTO users VALUES (222, 'user00222', 'member');
+INSERT INTO users VALUES (225, 'user00225', 'member');
+INSERT INTO users VALUES (228, 'user00228', 'member');
+INSERT INTO users VALUES (231, 'user00231', 'member');
+INSERT INTO users VALUES (234, 'user00234', 'member');
+INSERT INTO users VALUES (237, 'user00237', 'member');
+INSERT INTO users VALUES (240, 'user00240', 'member');
+INSERT INTO users VALUES (243, 'user00243', 'member');
+INSERT INTO users VALUES (246, 'user00246', 'member');
+INSERT INTO users VALUES (249, 'user00249', 'member');
+INSERT INTO users VALUES (252, 'user00252', 'member');
+INSERT INTO users VALUES (255, 'user00255', 'member');
+INSERT INTO users VALUES (258, 'user00258', 'member');
+INSERT INTO users VALUES (261, 'user00261', 'member');
+INSERT INTO users VALUES (264, 'user00264', 'member');
+INSERT INTO users VALUES (267, 'user00267', 'member');
+INSERT INTO users VALUES (270, 'user00270', 'member');
+INSERT INTO users VALUES (273, 'user00273', 'member');
+INSERT INTO users VALUES (276, 'user00276', 'member');
+INSERT INTO users VALUES (279, 'user00279', 'member');
+INSERT INTO users VALUES (282, 'user00282', 'member');
+INSERT INTO users VALUES (285, 'user00285', 'member');
+INSERT INTO users VALUES (288, 'user00288', 'member');
+INSERT INTO users VALUES (291, 'user00291', 'member');
+INSERT INTO users VALUES (294, 'user00294', 'member');
+INSERT INTO users VALUES (297, 'user00297', 'member');
+INSERT INTO users VALUES (300, 'user00300', 'member');
+INSERT INTO users VALUES (303, 'user00303', 'member');
+INSERT INTO users VALUES (306, 'user00306', 'member');
+INSERT INTO users VALUES (309, 'user00309', 'member');
+INSERT INTO users VALUES (312, 'user00312', 'member');
+INSERT INTO users VALUES (315, 'user00315', 'member');
+INSERT INTO users VALUES (318, 'user00318', 'member');
+INSERT INTO users VALUES (321, 'user00321', 'member');
+INSERT INTO users VALUES (324, 'user00324', 'member');
+INSERT INTO users VALUES (327, 'user00327', 'member');
+INSERT INTO users VALUES (330, 'user00330', 'member');
+INSERT INTO users VALUES (333, 'user00333', 'member');
+INSERT INTO users VALUES (336, 'user00336', 'member');
+INSERT INTO users VALUES (339, 'user00339', 'member');
+INSERT INTO users VALUES (342, 'user00342', 'member');
+INSERT INTO users VALUES (345, 'user00345', 'member');
+INSERT INTO users VALUES (348, 'user00348', 'member');
+INSERT INTO users VALUES (351, 'user00351', 'member');
+INSERT INTO users VALUES (354, 'user00354', 'member');
+INSERT INTO users VALUES (357, 'user00357', 'member');
+INSERT INTO users VALUES (360, 'user00360', 'member');
+INSERT INTO users VALUES (363, 'user00363', 'member');
+INSERT INTO users VALUES (366, 'user00366', 'member');
+INSERT INTO users VALUES (369, 'user00369', 'member');
+INSERT INTO users VALUES (372, 'user00372', 'member');
+INSERT INTO users VALUES (375, 'user00375', 'member');
+INSERT INTO users VALUES (378, 'user00378', 'member');
+INSERT INTO users VALUES (381, 'user00381', 'member');
+INSERT INTO users VALUES (384, 'user00384', 'member');
+INSERT INTO users VALUES (387, 'user00387', 'member');
+INSERT INTO users VALUES (390, 'user00390', 'member');
+INSERT INTO users VALUES (393, 'user00393', 'member');
+INSERT INTO users VALUES (396, 'user00396', 'member');
+INSERT INTO users VALUES (399, 'user00399', 'member');
+INSERT INTO users VALUES (402, 'user00402', 'member');
+INSERT INTO users VALUES (405, 'user00405', 'member');
+INSERT INTO users VALUES (408, 'user00408', 'member');
+INSERT INTO users VALUES (411, 'user00411', 'member');
+INSERT INTO users VALUES (414, 'user00414', 'member');
+INSERT INTO users VALUES (417, 'user00417', 'member');
+INSERT INTO users VALUES (420, 'user00420', 'member');
+INSERT INTO users VALUES (423, 'user00423', 'member');
+INSERT INTO users VALUES (426, 'user00426', 'member');
+INSERT INTO users VALUES (429, 'user00429', 'member');
+INSERT INTO users VALUES (432, 'user00432', 'member');
+INSERT INTO users VALUES (435, 'user00435', 'member');
+INSERT INTO users VALUES (438, 'user00438', 'member');
+INSERT INTO users VALUES (441, 'user00441', 'member');
+INSERT INTO users VALUES (444, 'user00444', 'member');
+INSERT INTO users VALUES (447, 'user00447', 'member');
+INSERT INTO users VALUES (450, 'user00450', 'member');
+INSERT INTO users VALUES (453, 'user00453', 'member');
+INSERT INTO users VALUES (456, 'user00456', 'member');
+INSERT INTO users VALUES (459, 'user00459', 'member');
+INSERT INTO users VALUES (462, 'user00462', 'member');
+INSERT INTO users VALUES (465, 'user00465', 'member');
+INSERT INTO users VALUES (468, 'user00468', 'member');
+INSERT INTO users VALUES (471, 'user00471', 'member');
+INSERT INTO users VALUES (474, 'user00474', 'member');
+INSERT INTO users VALUES (477, 'user00477', 'member');
+INSERT INTO users VALUES (480, 'user00480', 'member');
+INSERT INTO users VALUES (483, 'user00483', 'member');
+INSERT INTO users VALUES (486, 'user00486', 'member');
+INSERT INTO users VALUES (489, 'user00489', 'member');
+INSERT INTO users VALUES (492, 'user00492', 'member');
+INSERT INTO users VALUES (495, 'user00495', 'member');
+INSERT INTO users VALUES (498, 'user00498', 'member');
+INSERT INTO users VALUES (501, 'user00501', 'member');
+INSERT INTO users VALUES (504, 'user00504', 'member');
+INSERT INTO users VALUES (507, 'user00507', 'member');
+INSERT INTO users VALUES (510, 'user00510', 'member');
+INSERT INTO users VALUES (513, 'user00513', 'member');
+INSERT INTO users VALUES (516, 'user00516', 'member');
+INSERT INTO users VALUES (519, 'user00519', 'member');
+INSERT INTO users VALUES (522, 'user00522', 'member');
+INSERT INTO users VALUES (525, 'user00525', 'member');
+INSERT INTO users VALUES (528, 'user00528', 'member');
+INSERT INTO users VALUES (531, 'user00531', 'member');
+INSERT INTO users VALUES (534, 'user00534', 'member');
+INSERT INTO users VALUES (537, 'user00537', 'member');
+INSERT INTO users VALUES (540, 'user00540', 'member');
+INSERT INTO users VALUES (543, 'user00543', 'member');
+INSERT INTO users VALUES (546, 'user00546', 'member');
+INSERT INTO users VALUES (549, 'user00549', 'member');
+INSERT INTO users VALUES (552, 'user00552', 'member');
+INSERT INTO users VALUES (555, 'user00555', 'member');
+INSERT INTO users VALUES (558, 'user00558', 'member');
+INSERT INTO users VALUES (561, 'user00561', 'member');
+INSERT INTO users VALUES (564, 'user00564', 'member');
+INSERT INTO users VALUES (567, 'user00567', 'member');
+INSERT INTO users VALUES (570, 'user00570', 'member');
+INSERT INTO users VALUES (573, 'user00573', 'member');
+INSERT INTO users VALUES (576, 'user00576', 'member');
+INSERT INTO users VALUES (579, 'user00579', 'member');
+INSERT INTO users VALUES (582, 'user00582', 'member');
+INSERT INTO users VALUES (585, 'user00585', 'member');
+INSERT INTO users VALUES (588, 'user00588', 'member');
+INSERT INTO users VALUES (591, 'user00591', 'member');
+INSERT INTO users VALUES (594, 'user00594', 'member');
+INSERT INTO users VALUES (597, 'user00597', 'member');
+INSERT INTO users VALUES (600, 'user00600', 'member');
+INSERT INTO users VALUES (603, 'user00603', 'member');
+INSERT INTO users VALUES (606, 'user00606', 'member');
+INSERT INTO users VALUES (609, 'user00609', 'member');
+INSERT INTO users VALUES (612, 'user00612', 'member');
+INSERT INTO users VALUES (615, 'user00615', 'member');
+INSERT INTO users VALUES (618, 'user00618', 'member');
+INSERT INTO users VALUES (621, 'user00621', 'member');
+INSERT INTO users VALUES (624, 'user00624', 'member');
+INSERT INTO users VALUES (627, 'user00627', 'member');
+INSERT INTO users VALUES (630, 'user00630', 'member');
+INSERT INTO users VALUES (633, 'user00633', 'member');
+INSERT INTO users VALUES (636, 'user00636', 'member');
+INSERT INTO users VALUES (639, 'user00639', 'member');
+INSERT INTO users VALUES (642, 'user00642', 'member');
+INSERT INTO users VALUES (645, 'user00645', 'member');
+INSERT INTO users VALUES (648, 'user00648', 'member');
+INSERT INTO users VALUES (651, 'user00651', 'member');
+INSERT INTO users VALUES (654, 'user00654', 'member');
+INSERT INTO users VALUES (657, 'user00657', 'member');
+INSERT INTO users VALUES (660, 'user00660', 'member');
+INSERT INTO users VALUES (663, 'user00663', 'member');
+INSERT INTO users VALUES (666, 'user00666', 'member');
+INSERT INTO users VALUES (669, 'user00669', 'member');
+INSERT INTO users VALUES (672, 'user00672', 'member');
+INSERT INTO users VALUES (675, 'user00675', 'member');
+INSERT INTO users VALUES (678, 'user00678', 'member');
+INSERT INTO users VALUES (681, 'user00681', 'member');
+INSERT INTO users VALUES (684, 'user00684', 'member');
+INSERT INTO users VALUES (687, 'user00687', 'member');
+INSERT INTO users VALUES (690, 'user00690', 'member');
+INSERT INTO users VALUES (693, 'user00693', 'member');
+INSERT INTO users VALUES (696, 'user00696', 'member');
+INSERT INTO users VALUES (699, 'user00699', 'member');
+INSERT INTO users VALUES (702, 'user00702', 'member');
+INSERT INTO users VALUES (705, 'user00705', 'member');
+INSERT INTO users VALUES (708, 'user00708', 'member');
+INSERT INTO users VALUES (711, 'user00711', 'member');
+INSERT INTO users VALUES (714, 'user00714', 'member');
+INSERT INTO users VALUES (717, 'user00717', 'member');
+INSERT INTO users VALUES (720, 'user00720', 'member');
+INSERT INTO users VALUES (723, 'user00723', 'member');
+INSERT INTO users VALUES (726, 'user00726', 'member');
+INSERT INTO users VALUES (729, 'user00729', 'member');
+INSERT INTO users VALUES (732, 'user00732', 'member');
+INSERT INTO users VALUES (735, 'user00735', 'member');
+INSERT INTO users VALUES (738, 'user00738', 'member');
+INSERT INTO users VALUES (741, 'user00741', 'member');
+INSERT INTO users VALUES (744, 'user00744', 'member');
+INSERT INTO users VALUES (747, 'user00747', 'member');
+INSERT INTO users VALUES (750, 'user00750', 'member');
+INSERT INTO users VALUES (753, 'user00753', 'member');
+INSERT INTO users VALUES (756, 'user00756', 'member');
+INSERT INTO users VALUES (759, 'user00759', 'member');
+INSERT INTO users VALUES (762, 'user00762', 'member');
+INSERT INTO users VALUES (765, 'user00765', 'member');
+INSERT INTO users VALUES (768, 'user00768', 'member');
+INSERT INTO users VALUES (771, 'user00771', 'member');
+INSERT INTO users VALUES (774, 'user00774', 'member');
+INSERT INTO users VALUES (777, 'user00777', 'member');
+INSERT INTO users VALUES (780, 'user00780', 'member');
+INSERT INTO users VALUES (783, 'user00783', 'member');
+INSERT INTO users VALUES (786, 'user00786', 'member');
+INSERT INTO users VALUES (789, 'user00789', 'member');
+INSERT INTO users VALUES (792, 'user00792', 'member');
+INSERT INTO users VALUES (795, 'user00795', 'member');
+INSERT INTO users VALUES (798, 'user00798', 'member');
+INSERT INTO users VALUES (801, 'user00801', 'member');
+INSERT INTO users VALUES (804, 'user00804', 'member');
+INSERT INTO users VALUES (807, 'user00807', 'member');
+INSERT INTO users VALUES (810, 'user00810', 'member');
+INSERT INTO users VALUES (813, 'user00813', 'member');
+INSERT INTO users VALUES (816, 'user00816', 'member');
+INSERT INTO users VALUES (819, 'user00819', 'member');
+INSERT INTO users VALUES (822, 'user00822', 'member');
+INSERT INTO users VALUES (825, 'user00825', 'member');
+INSERT INTO users VALUES (828, 'user00828', 'member');
+INSERT INTO users VALUES (831, 'user00831', 'member');
+INSERT INTO users VALUES (834, 'user00834', 'member');
+INSERT INTO users VALUES (837, 'user00837', 'member');
+INSERT INTO users VALUES (840, 'user00840', 'member');
+INSERT INTO users VALUES (843, 'user00843', 'member');
+INSERT INTO users VALUES (846, 'user00846', 'member');
+INSERT INTO users VALUES (849, 'user00849', 'member');
+INSERT INTO users VALUES (852, 'user00852', 'member');
+INSERT INTO users VALUES (855, 'user00855', 'member');
+INSERT INTO users VALUES (858, 'user00858', 'member');
+INSERT INTO users VALUES (861, 'user00861', 'member');
+INSERT INTO users VALUES (864, 'user00864', 'member');
+INSERT INTO users VALUES (867, 'user00867', 'member');
+INSERT INTO users VALUES (870, 'user00870', 'member');
+INSERT INTO users VALUES (873, 'user00873', 'member');
+INSERT INTO users VALUES (876, 'user00876', 'member');
+INSERT INTO users VALUES (879, 'user00879', 'member');
+INSERT INTO users VALUES (882, 'user00882', 'member');
+INSERT INTO users VALUES (885, 'user00885', 'member');
+INSERT INTO users VALUES (888, 'user00888', 'member');
+INSERT INTO users VALUES (891, 'user00891', 'member');
+INSERT INTO users VALUES (894, 'user00894', 'member');
+INSERT INTO users VALUES (897, 'user00897', 'member');
+INSERT INTO users VALUES (900, 'user00900', 'member');
+INSERT INTO users VALUES (903, 'user00903', 'member');
+INSERT INTO users VALUES (906, 'user00906', 'member');
+INSERT INTO users VALUES (909, 'user00909', 'member');
+INSERT INTO users VALUES (912, 'user00912', 'member');
+INSERT INTO users VALUES (915, 'user00915', 'member');
+INSERT INTO users VALUES (918, 'user00918', 'member');
+INSERT INTO users VALUES (921, 'user00921', 'member');
+INSERT INTO users VALUES (924, 'user00924', 'member');
+INSERT INTO users VALUES (927, 'user00927', 'member');
+INSERT INTO users VALUES (930, 'user00930', 'member');
+INSERT INTO users VALUES (933, 'user00933', 'member');
+INSERT INTO users VALUES (936, 'user00936', 'member');
+INSERT INTO users VALUES (939, 'user00939', 'member');
+INSERT INTO users VALUES (942, 'user00942', 'member');
+INSERT INTO users VALUES (945, 'user00945', 'member');
+INSERT INTO users VALUES (948, 'user00948', 'member');
+INSERT INTO users VALUES (951, 'user00951', 'member');
+INSERT INTO users VALUES (954, 'user00954', 'member');
+INSERT INTO users VALUES (957, 'user00957', 'member');
+INSERT INTO users VALUES (960, 'user00960', 'member');
+INSERT INTO users VALUES (963, 'user00963', 'member');
+INSERT INTO users VALUES (966, 'user00966', 'member');
+INSERT INTO users VALUES (969, 'user00969', 'member');
+INSERT INTO users VALUES (972, 'user00972', 'member');
+INSERT INTO users VALUES (975, 'user00975', 'member');
+INSERT INTO users VALUES (978, 'user00978', 'member');
+INSERT INTO users VALUES (981, 'user00981', 'member');
+INSERT INTO users VALUES (984, 'user00984', 'member');
+INSERT INTO users VALUES (987, 'user00987', 'member');
+INSERT INTO users VALUES (990, 'user00990', 'member');
+INSERT INTO users VALUES (993, 'user00993', 'member');
+INSERT INTO users VALUES (996, 'user00996', 'member');
+INSERT INTO users VALUES (999, 'user00999', 'member');
+INSERT INTO users VALUES (1002, 'user01002', 'member');
+INSERT INTO users VALUES (1005, 'user01005', 'member');
+INSERT INTO users VALUES (1008, 'user01008', 'member');
+INSERT INTO users VALUES (1011, 'user01011', 'member');
+INSERT INTO users VALUES (1014, 'user01014', 'member');
+INSERT INTO users VALUES (1017, 'user01017', 'member');
+INSERT INTO users VALUES (1020, 'user01020', 'member');
+INSERT INTO users VALUES (1023, 'user01023', 'member');
+INSERT INTO users VALUES (1026, 'user01026', 'member');
+INSERT INTO users VALUES (1029, 'user01029', 'member');
+INSERT INTO users VALUES (1032, 'user01032', 'member');
+INSERT INTO users VALUES (1035, 'user01035', 'member');
+INSERT INTO users VALUES (1038, 'user01038', 'member');
+INSERT INTO users VALUES (1041, 'user01041', 'member');
+INSERT INTO users VALUES (1044, 'user01044', 'member');
+INSERT INTO users VALUES (1047, 'user01047', 'member');
+INSERT INTO users VALUES (1050, 'user01050', 'member');
+INSERT INTO users VALUES (1053, 'user01053', 'member');
+INSERT INTO users VALUES (1056, 'user01056', 'member');
+INSERT INTO users VALUES (1059, 'user01059', 'member');
+INSERT INTO users VALUES (1062, 'user01062', 'member');
+INSERT INTO users VALUES (1065, 'user01065', 'member');
+INSERT INTO users VALUES (1068, 'user01068', 'member');
+INSERT INTO users VALUES (1071, 'user01071', 'member');
+INSERT INTO users VALUES (1074, 'user01074', 'member');
+INSERT INTO users VALUES (1077, 'user01077', 'member');
+INSERT INTO users VALUES (1080, 'user01080', 'member');
+INSERT INTO users VALUES (1083, 'user01083', 'member');
+INSERT INTO users VALUES (1086, 'user01086', 'member');
+INSERT INTO users VALUES (1089, 'user01089', 'member');
+INSERT INTO users VALUES (1092, 'user01092', 'member');
+INSERT INTO users VALUES (1095, 'user01095', 'member');
+INSERT INTO users VALUES (1098, 'user01098', 'member');
+INSERT INTO users VALUES (1101, 'user01101', 'member');
+INSERT INTO users VALUES (1104, 'user01104', 'member');
+INSERT INTO users VALUES (1107, 'user01107', 'member');
+INSERT INTO users VALUES (1110, 'user01110', 'member');
+INSERT INTO users VALUES (1113, 'user01113', 'member');
+INSERT INTO users VALUES (1116, 'user01116', 'member');
+INSERT INTO users VALUES (1119, 'user01119', 'member');
+INSERT INTO users VALUES (1122, 'user01122', 'member');
+INSERT INTO users VALUES (1125, 'user01125', 'member');
+INSERT INTO users VALUES (1128, 'user01128', 'member');
+INSERT INTO users VALUES (1131, 'user01131', 'member');
+INSERT INTO users VALUES (1134, 'user01134', 'member');
+INSERT INTO users VALUES (1137, 'user01137', 'member');
+INSERT INTO users VALUES (1140, 'user01140', 'member');
+INSERT INTO users VALUES (1143, 'user01143', 'member');
+INSERT INTO users VALUES (1146, 'user01146', 'member');
+INSERT INTO users VALUES (1149, 'user01149', 'member');
+INSERT INTO users VALUES (1152, 'user01152', 'member');
+INSERT INTO users VALUES (1155, 'user01155', 'member');
+INSERT INTO users VALUES (1158, 'user01158', 'member');
+INSERT INTO users VALUES (1161, 'user01161', 'member');
+INSERT INTO users VALUES (1164, 'user01164', 'member');
+INSERT INTO users VALUES (1167, 'user01167', 'member');
+INSERT INTO users VALUES (1170, 'user01170', 'member');
+INSERT INTO users VALUES (1173, 'user01173', 'member');
+INSERT INTO users VALUES (1176, 'user01176', 'member');
+INSERT INTO users VALUES (1179, 'user01179', 'member');
+INSERT INTO users VALUES (1182, 'user01182', 'member');
+INSERT INTO users VALUES (1185, 'user01185', 'member');
+INSERT INTO users VALUES (1188, 'user01188', 'member');
+INSERT INTO users VALUES (1191, 'user01191', 'member');
+INSERT INTO users VALUES (1194, 'user01194', 'member');
+INSERT INTO users VALUES (1197, 'user01197', 'member');
+INSERT INTO users VALUES (1200, 'user01200', 'member');
+INSERT INTO users VALUES (1203, 'user01203', 'member');
+INSERT INTO users VALUES (1206, 'user01206', 'member');
+INSERT INTO users VALUES (1209, 'user01209', 'member');
+INSERT INTO users VALUES (1212, 'user01212', 'member');
+INSERT INTO users VALUES (1215, 'user01215', 'member');
+INSERT INTO users VALUES (1218, 'user01218', 'member');
+INSERT INTO users VALUES (1221, 'user01221', 'member');
+INSERT INTO users VALUES (1224, 'user01224', 'member');
+INSERT INTO users VALUES (1227, 'user01227', 'member');
+INSERT INTO users VALUES (1230, 'user01230', 'member');
+INSERT INTO users VALUES (1233, 'user01233', 'member');
+INSERT INTO users VALUES (1236, 'user01236', 'member');
+INSERT INTO users VALUES (1239, 'user01239', 'member');
+INSERT INTO users VALUES (1242, 'user01242', 'member');
+INSERT INTO users VALUES (1245, 'user01245', 'member');
+INSERT INTO users VALUES (1248, 'user01248', 'member');
+INSERT INTO users VALUES (1251, 'user01251', 'member');
+INSERT INTO users VALUES (1254, 'user01254', 'member');
+INSERT INTO users VALUES (1257, 'user01257', 'member');
+INSERT INTO users VALUES (1260, 'user01260', 'member');
+INSERT INTO users VALUES (1263, 'user01263', 'member');
+INSERT INTO users VALUES (1266, 'user01266', 'member');
+INSERT INTO users VALUES (1269, 'user01269', 'member');
+INSERT INTO users VALUES (1272, 'user01272', 'member');
+INSERT INTO users VALUES (1275, 'user01275', 'member');
+INSERT INTO users VALUES (1278, 'user01278', 'member');
+INSERT INTO users VALUES (1281, 'user01281', 'member');
+INSERT INTO users VALUES (1284, 'user01284', 'member');
+INSERT INTO users VALUES (1287, 'user01287', 'member');
+INSERT INTO users VALUES (1290, 'user01290', 'member');
+INSERT INTO users VALUES (1293, 'user01293', 'member');
+INSERT INTO users VALUES (1296, 'user01296', 'member');
+INSERT INTO users VALUES (1299, 'user01299', 'member');
+INSERT INTO users VALUES (1302, 'user01302', 'member');
+INSERT INTO users VALUES (1305, 'user01305', 'member');
+INSERT INTO users VALUES (1308, 'user01308', 'member');
+INSERT INTO users VALUES (1311, 'user01311', 'member');
+INSERT INTO users VALUES (1314, 'user01314', 'member');
+INSERT INTO users VALUES (1317, 'user01317', 'member');
+INSERT INTO users VALUES (1320, 'user01320', 'member');
+INSERT INTO users VALUES (1323, 'user01323', 'member');
+INSERT INTO users VALUES (1326, 'user01326', 'member');
+INSERT INTO users VALUES (1329, 'user01329', 'member');
+INSERT INTO users VALUES (1332, 'user01332', 'member');
+INSERT INTO users VALUES (1335, 'user01335', 'member');
+INSERT INTO users VALUES (1338, 'user01338', 'member');
+INSERT INTO users VALUES (1341, 'user01341', 'member');
+INSERT INTO users VALUES (1344, 'user01344', 'member');
+INSERT INTO users VALUES (1347, 'user01347', 'member');
+INSERT INTO users VALUES (1350, 'user01350', 'member');
+INSERT INTO users VALUES (1353, 'user01353', 'member');
+INSERT INTO users VALUES (1356, 'user01356', 'member');
+INSERT INTO users VALUES (1359, 'user01359', 'member');
+INSERT INTO users VALUES (1362, 'user01362', 'member');
+INSERT INTO users VALUES (1365, 'user01365', 'member');
+INSERT INTO users VALUES (1368, 'user01368', 'member');
+INSERT INTO users VALUES (1371, 'user01371', 'member');
+INSERT INTO users VALUES (1374, 'user01374', 'member');
+INSERT INTO users VALUES (1377, 'user01377', 'member');
+INSERT INTO users VALUES (1380, 'user01380', 'member');
+INSERT INTO users VALUES (1383, 'user01383', 'member');
+INSERT INTO users VALUES (1386, 'user01386', 'member');
+INSERT INTO users VALUES (1389, 'user01389', 'member');
+INSERT INTO users VALUES (1392, 'user01392', 'member');
+INSERT INTO users VALUES (1395, 'user01395', 'member');
+INSERT INTO users VALUES (1398, 'user01398', 'member');
+INSERT INTO users VALUES (1401, 'user01401', 'member');
+INSERT INTO users VALUES (1404, 'user01404', 'member');
+INSERT INTO users VALUES (1407, 'user01407', 'member');
+INSERT INTO users VALUES (1410, 'user01410', 'member');
+INSERT INTO users VALUES (1413, 'user01413', 'member');
+INSERT INTO users VALUES (1416, 'user01416', 'member');
+INSERT INTO users VALUES (1419, 'user01419', 'member');
+INSERT INTO users VALUES (1422, 'user01422', 'member');
+INSERT INTO users VALUES (1425, 'user01425', 'member');
+INSERT INTO users VALUES (1428, 'user01428', 'member');
+INSERT INTO users VALUES (1431, 'user01431', 'member');
+INSERT INTO users VALUES (1434, 'user01434', 'member');
+INSERT INTO users VALUES (1437, 'user01437', 'member');
+INSERT INTO users VALUES (1440, 'user01440', 'member');
+INSERT INTO users VALUES (1443, 'user01443', 'member');
+INSERT INTO users VALUES (1446, 'user01446', 'member');
+INSERT INTO users VALUES (1449, 'user01449', 'member');
+INSERT INTO users VALUES (1452, 'user01452', 'member');
+INSERT INTO users VALUES (1455, 'user01455', 'member');
+INSERT INTO users VALUES (1458, 'user01458', 'member');
+INSERT INTO users VALUES (1461, 'user01461', 'member');
+INSERT INTO users VALUES (1464, 'user01464', 'member');
+INSERT INTO users VALUES (1467, 'user01467', 'member');
+INSERT INTO users VALUES (1470, 'user01470', 'member');
+INSERT INTO users VALUES (1473, 'user01473', 'member');
+INSERT INTO users VALUES (1476, 'user01476', 'member');
+INSERT INTO users VALUES (1479, 'user01479', 'member');
+INSERT INTO users VALUES (1482, 'user01482', 'member');
+INSERT INTO users VALUES (1485, 'user01485', 'member');
+INSERT INTO users VALUES (1488, 'user01488', 'member');
+INSERT INTO users VALUES (1491, 'user01491', 'member');
+INSERT INTO users VALUES (1494, 'user01494', 'member');
+INSERT INTO users VALUES (1497, 'user01497', 'member');
+INSERT INTO users VALUES (1500, 'user01500', 'member');
+-- begin seed: admins
+INSERT INTO users VALUES (0, 'root', 'admin');
+-- end seed: admins
+INSERT INTO users VALUES (1503, 'user01503', 'member');
+INSERT INTO users VALUES (1506, 'user01506', 'member');
+INSERT INTO users VALUES (1509, 'user01509', 'member');
+INSERT INTO users VALUES (1512, 'user01512', 'member');
+INSERT INTO users VALUES (1515, 'user01515', 'member');
+INSERT INTO users VALUES (1518, 'user01518', 'member');
+INSERT INTO users VALUES (1521, 'user01521', 'member');
+INSERT INTO users VALUES (1524, 'user01524', 'member');
+INSERT INTO users VALUES (1527, 'user01527', 'member');
+INSERT INTO users VALUES (1530, 'user01530', 'member');
+INSERT INTO users VALUES (1533, 'user01533', 'member');
+INSERT INTO users VALUES (1536, 'user01536', 'member');
+INSERT INTO users VALUES (1539, 'user01539', 'member');
+INSERT INTO users VALUES (1542, 'user01542', 'member');
+INSERT INTO users VALUES (1545, 'user01545', 'member');
+INSERT INTO users VALUES (1548, 'user01548', 'member');
+INSERT INTO users VALUES (1551, 'user01551', 'member');
+INSERT INTO users VALUES (1554, 'user01554', 'member');
+INSERT INTO users VALUES (1557, 'user01557', 'member');
+INSERT INTO users VALUES (1560, 'user01560', 'member');
+INSERT INTO users VALUES (1563, 'user01563', 'member');
+INSERT INTO users VALUES (1566, 'user01566', 'member');
+INSERT INTO users VALUES (1569, 'user01569', 'member');
+INSERT INTO users VALUES (1572, 'user01572', 'member');
+INSERT INTO users VALUES (1575, 'user01575', 'member');
+INSERT INTO users VALUES (1578, 'user01578', 'member');
+INSERT INTO users VALUES (1581, 'user01581', 'member');
+INSERT INTO users VALUES (1584, 'user01584', 'member');
+INSERT INTO users VALUES (1587, 'user01587', 'member');
+INSERT INTO users VALUES (1590, 'user01590', 'member');
+INSERT INTO users VALUES (1593, 'user01593', 'member');
+INSERT INTO users VALUES (1596, 'user01596', 'member');
+INSERT INTO users VALUES (1599, 'user01599', 'member');
+INSERT INTO users VALUES (1602, 'user01602', 'member');
+INSERT INTO users VALUES (1605, 'user01605', 'member');
+INSERT INTO users VALUES (1608, 'user01608', 'member');
+INSERT INTO users VALUES (1611, 'user01611', 'member');
+INSERT INTO users VALUES (1614, 'user01614', 'member');
+INSERT INTO users VALUES (1617, 'user01617', 'member');
+INSERT INTO users VALUES (1620, 'user01620', 'member');
+INSERT INTO users VALUES (1623, 'user01623', 'member');
+INSERT INTO users VALUES (1626, 'user01626', 'member');
+INSERT INTO users VALUES (1629, 'user01629', 'member');
+INSERT INTO users VALUES (1632, 'user01632', 'member');
+INSERT INTO users VALUES (1635, 'user01635', 'member');
+INSERT INTO users VALUES (1638, 'user01638', 'member');
+INSERT INTO users VALUES (1641, 'user01641', 'member');
+INSERT INTO users VALUES (1644, 'user01644', 'member');
+INSERT INTO users VALUES (1647, 'user01647', 'member');
+INSERT INTO users VALUES (1650, 'user01650', 'member');
+INSERT INTO users VALUES (1653, 'user01653', 'member');
+INSERT INTO users VALUES (1656, 'user01656', 'member');
+INSERT INTO users VALUES (1659, 'user01659', 'member');
+INSERT INTO users VALUES (1662, 'user01662', 'member');
+INSERT INTO users VALUES (1665, 'user01665', 'member');
+INSERT INTO users VALUES (1668, 'user01668', 'member');
+INSERT INTO users VALUES (1671, 'user01671', 'member');
+INSERT INTO users VALUES (1674, 'user01674', 'member');
+INSERT INTO users VALUES (1677, 'user01677', 'member');
+INSERT INTO users VALUES (1680, 'user01680', 'member');
+INSERT INTO users VALUES (1683, 'user01683', 'member');
+INSERT INTO users VALUES (1686, 'user01686', 'member');
+INSERT INTO users VALUES (1689, 'user01689', 'member');
+INSERT INTO users VALUES (1692, 'user01692', 'member');
+INSERT INTO users VALUES (1695, 'user01695', 'member');
+INSERT INTO users VALUES (1698, 'user01698', 'member');
+INSERT INTO users VALUES (1701, 'user01701', 'member');
+INSERT INTO users VALUES (1704, 'user01704', 'member');
+INSERT INTO users VALUES (1707, 'user01707', 'member');
+INSERT INTO users VALUES (1710, 'user01710', 'member');
+INSERT INTO users VALUES (1713, 'user01713', 'member');
+INSERT INTO users VALUES (1716, 'user01716', 'member');
+INSERT INTO users VALUES (1719, 'user01719', 'member');
+INSERT INTO users VALUES (1722, 'user01722', 'member');
+INSERT INTO users VALUES (1725, 'user01725', 'member');
+INSERT INTO users VALUES (1728, 'user01728', 'member');
+INSERT INTO users VALUES (1731, 'user01731', 'member');
+INSERT INTO users VALUES (1734, 'user01734', 'member');
+INSERT INTO users VALUES (1737, 'user01737', 'member');
+INSERT INTO users VALUES (1740, 'user01740', 'member');
+INSERT INTO users VALUES (1743, 'user01743', 'member');
+INSERT INTO users VALUES (1746, 'user01746', 'member');
+INSERT INTO users VALUES (1749, 'user01749', 'member');
+INSERT INTO users VALUES (1752, 'user01752', 'member');
+INSERT INTO users VALUES (1755, 'user01755', 'member');
+INSERT INTO users VALUES (1758, 'user01758', 'member');
+INSERT INTO users VALUES (1761, 'user01761', 'member');
+INSERT INTO users VALUES (1764, 'user01764', 'member');
+INSERT INTO users VALUES (1767, 'user01767', 'member');
+INSERT INTO users VALUES (1770, 'user01770', 'member');
+INSERT INTO users VALUES (1773, 'user01773', 'member');
+INSERT INTO users VALUES (1776, 'user01776', 'member');
+INSERT INTO users VALUES (1779, 'user01779', 'member');
+INSERT INTO users VALUES (1782, 'user01782', 'member');
+INSERT INTO users VALUES (1785, 'user01785', 'member');
+INSERT INTO users VALUES (1788, 'user01788', 'member');
+INSERT INTO users VALUES (1791, 'user01791', 'member');
+INSERT INTO users VALUES (1794, 'user01794', 'member');
+INSERT INTO users VALUES (1797, 'user01797', 'member');
+INSERT INTO users VALUES (1800, 'user01800', 'member');
+INSERT INTO users VALUES (1803, 'user01803', 'member');
+INSERT INTO users VALUES (1806, 'user01806', 'member');
+INSERT INTO users VALUES (1809, 'user01809', 'member');
+INSERT INTO users VALUES (1812, 'user01812', 'member');
+INSERT INTO users VALUES (1815, 'user01815', 'member');
+INSERT INTO users VALUES (1818, 'user01818', 'member');
+INSERT INTO users VALUES (1821, 'user01821', 'member');
+INSERT INTO users VALUES (1824, 'user01824', 'member');
+INSERT INTO users VALUES (1827, 'user01827', 'member');
+INSERT INTO users VALUES (1830, 'user01830', 'member');
+INSERT INTO users VALUES (1833, 'user01833', 'member');
+INSERT INTO users VALUES (1836, 'user01836', 'member');
+INSERT INTO users VALUES (1839, 'user01839', 'member');
+INSERT INTO users VALUES (1842, 'user01842', 'member');
+INSERT INTO users VALUES (1845, 'user01845', 'member');
+INSERT INTO users VALUES (1848, 'user01848', 'member');
+INSERT INTO users VALUES (1851, 'user01851', 'member');
+INSERT INTO users VALUES (1854, 'user01854', 'member');
+INSERT INTO users VALUES (1857, 'user01857', 'member');
+INSERT INTO users VALUES (1860, 'user01860', 'member');
+INSERT INTO users VALUES (1863, 'user01863', 'member');
+INSERT INTO users VALUES (1866, 'user01866', 'member');
+INSERT INTO users VALUES (1869, 'user01869', 'member');
+INSERT INTO users VALUES (1872, 'user01872', 'member');
+INSERT INTO users VALUES (1875, 'user01875', 'member');
+INSERT INTO users VALUES (1878, 'user01878', 'member');
+INSERT INTO users VALUES (1881, 'user01881', 'member');
+INSERT INTO users VALUES (1884, 'user01884', 'member');
+INSERT INTO users VALUES (1887, 'user01887', 'member');
+INSERT INTO users VALUES (1890, 'user01890', 'member');
+INSERT INTO users VALUES (1893, 'user01893', 'member');
+INSERT INTO users VALUES (1896, 'user01896', 'member');
+INSERT INTO users VALUES (1899, 'user01899', 'member');
+INSERT INTO users VALUES (1902, 'user01902', 'member');
+INSERT INTO users VALUES (1905, 'user01905', 'member');
+INSERT INTO users VALUES (1908, 'user01908', 'member');
+INSERT INTO users VALUES (1911, 'user01911', 'member');
+INSERT INTO users VALUES (1914, 'user01914', 'member');
+INSERT INTO users VALUES (1917, 'user01917', 'member');
+INSERT INTO users VALUES (1920, 'user01920', 'member');
+INSERT INTO users VALUES (1923, 'user01923', 'member');
+INSERT INTO users VALUES (1926, 'user01926', 'member');
+INSERT INTO users VALUES (1929, 'user01929', 'member');
+INSERT INTO users VALUES (1932, 'user01932', 'member');
+INSERT INTO users VALUES (1935, 'user01935', 'member');
+INSERT INTO users VALUES (1938, 'user01938', 'member');
+INSERT INTO users VALUES (1941, 'user01941', 'member');
+INSERT INTO users VALUES (1944, 'user01944', 'member');
+INSERT INTO users VALUES (1947, 'user01947', 'member');
+INSERT INTO users VALUES (1950, 'user01950', 'member');
+INSERT INTO users VALUES (1953, 'user01953', 'member');
+INSERT INTO users VALUES (1956, 'user01956', 'member');
+INSERT INTO users VALUES (1959, 'user01959', 'member');
+INSERT INTO users VALUES (1962, 'user01962', 'member');
+INSERT INTO users VALUES (1965, 'user01965', 'member');
+INSERT INTO users VALUES (1968, 'user01968', 'member');
+INSERT INTO users VALUES (1971, 'user01971', 'member');
+INSERT INTO users VALUES (1974, 'user01974', 'member');
+INSERT INTO users VALUES (1977, 'user01977', 'member');
+INSERT INTO users VALUES (1980, 'user01980', 'member');
+INSERT INTO users VALUES (1983, 'user01983', 'member');
+INSERT INTO users VALUES (1986, 'user01986', 'member');
+INSERT INTO users VALUES (1989, 'user01989', 'member');
+INSERT INTO users VALUES (1992, 'user01992', 'member');
+INSERT INTO users VALUES (1995, 'user01995', 'member');
+INSERT INTO users VALUES (1998, 'user01998', 'member');
+INSERT INTO users VALUES (2001, 'user02001', 'member');
+INSERT INTO users VALUES (2004, 'user02004', 'member');
+INSERT INTO users VALUES (2007, 'user02007', 'member');
+INSERT INTO users VALUES (2010, 'user02010', 'member');
+INSERT INTO users VALUES (2013, 'user02013', 'member');
+INSERT INTO users VALUES (2016, 'user02016', 'member');
+INSERT INTO users VALUES (2019, 'user02019', 'member');
+INSERT INTO users VALUES (2022, 'user02022', 'member');
+INSERT INTO users VALUES (2025, 'user02025', 'member');
+INSERT INTO users VALUES (2028, 'user02028', 'member');
+INSERT INTO users VALUES (2031, 'user02031', 'member');
+INSERT INTO users VALUES (2034, 'user02034', 'member');
+INSERT INTO users VALUES (2037, 'user02037', 'member');
+INSERT INTO users VALUES (2040, 'user02040', 'member');
+INSERT INTO users VALUES (2043, 'user02043', 'member');
+INSERT INTO users VALUES (2046, 'user02046', 'member');
+INSERT INTO users VALUES (2049, 'user02049', 'member');
+INSERT INTO users VALUES (2052, 'user02052', 'member');
+INSERT INTO users VALUES (2055, 'user02055', 'member');
+INSERT INTO users VALUES (2058, 'user02058', 'member');
+INSERT INTO users VALUES (2061, 'user02061', 'member');
+INSERT INTO users VALUES (2064, 'user02064', 'member');
+INSERT INTO users VALUES (2067, 'user02067', 'member');
+INSERT INTO users VALUES (2070, 'user02070', 'member');
+INSERT INTO users VALUES (2073, 'user02073', 'member');
+INSERT INTO users VALUES (2076, 'user02076', 'member');
+INSERT INTO users VALUES (2079, 'user02079', 'member');
+INSERT INTO users VALUES (2082, 'user02082', 'member');
+INSERT INTO users VALUES (2085, 'user02085', 'member');
+INSERT INTO users VALUES (2088, 'user02088', 'member');
+INSERT INTO users VALUES (2091, 'user02091', 'member');
+INSERT INTO users VALUES (2094, 'user02094', 'member');
+INSERT INTO users VALUES (2097, 'user02097', 'member');
+INSERT INTO users VALUES (2100, 'user02100', 'member');
+INSERT INTO users VALUES (2103, 'user02103', 'member');
+INSERT INTO users VALUES (2106, 'user02106', 'member');
+INSERT INTO users VALUES (2109, 'user02109', 'member');
+INSERT INTO users VALUES (2112, 'user02112', 'member');
+INSERT INTO users VALUES (2115, 'user02115', 'member');
+INSERT INTO users VALUES (2118, 'user02118', 'member');
+INSERT INTO users VALUES (2121, 'user02121', 'member');
+INSERT INTO users VALUES (2124, 'user02124', 'member');
+INSERT INTO users VALUES (2127, 'user02127', 'member');
+INSERT INTO users VALUES (2130, 'user02130', 'member');
+INSERT INTO users VALUES (2133, 'user02133', 'member');
+INSERT INTO users VALUES (2136, 'user02136', 'member');
+INSERT INTO users VALUES (2139, 'user02139', 'member');
+INSERT INTO users VALUES (2142, 'user02142', 'member');
+INSERT INTO users VALUES (2145, 'user02145', 'member');
+INSERT INTO users VALUES (2148, 'user02148', 'member');
+INSERT INTO users VALUES (2151, 'user02151', 'member');
+INSERT INTO users VALUES (2154, 'user02154', 'member');
+INSERT INTO users VALUES (2157, 'user02157', 'member');
+INSERT INTO users VALUES (2160, 'user02160', 'member');
+INSERT INTO users VALUES (2163, 'user02163', 'member');
+INSERT INTO users VALUES (2166, 'user02166', 'member');
+INSERT INTO users VALUES (2169, 'user02169', 'member');
+INSERT INTO users VALUES (2172, 'user02172', 'member');
+INSERT INTO users VALUES (2175, 'user02175', 'member');
+INSERT INTO users VALUES (2178, 'user02178', 'member');
+INSERT INTO users VALUES (2181, 'user02181', 'member');
+INSERT INTO users VALUES (2184, 'user02184', 'member');
+INSERT INTO users VALUES (2187, 'user02187', 'member');
+INSERT INTO users VALUES (2190, 'user02190', 'member');
+INSERT INTO users VALUES (2193, 'user02193', 'member');
+INSERT INTO users VALUES (2196, 'user02196', 'member');
+INSERT INTO users VALUES (2199, 'user02199', 'member');
+INSERT INTO users VALUES (2202, 'user02202', 'member');
+INSERT INTO users VALUES (2205, 'user02205', 'member');
+INSERT INTO users VALUES (2208, 'user02208', 'member');
+INSERT INTO users VALUES (2211, 'user02211', 'member');
+INSERT INTO users VALUES (2214, 'user02214', 'member');
+INSERT INTO users VALUES (2217, 'user02217', 'member');
+INSERT INTO users VALUES (2220, 'user02220', 'member');
+INSERT INTO users VALUES (2223, 'user02223', 'member');
+INSERT INTO users VALUES (2226, 'user02226', 'member');
+INSERT INTO users VALUES (2229, 'user02229', 'member');
+INSERT INTO users VALUES (2232, 'user02232', 'member');
+INSERT INTO users VALUES (2235, 'user02235', 'member');
+INSERT INTO users VALUES (2238, 'user02238', 'member');
+INSERT INTO users VALUES (2241, 'user02241', 'member');
+INSERT INTO users VALUES (2244, 'user02244', 'member');
+INSERT INTO users VALUES (2247, 'user02247', 'member');
+INSERT INTO users VALUES (2250, 'user02250', 'member');
+INSERT INTO users VALUES (2253, 'user02253', 'member');
+INSERT INTO users VALUES (2256, 'user02256', 'member');
+INSERT INTO users VALUES (2259, 'user02259', 'member');
+INSERT INTO users VALUES (2262, 'user02262', 'member');
+INSERT INTO users VALUES (2265, 'user02265', 'member');
+INSERT INTO users VALUES (2268, 'user02268', 'member');
+INSERT INTO users VALUES (2271, 'user02271', 'member');
+INSERT INTO users VALUES (2274, 'user02274', 'member');
+INSERT INTO users VALUES (2277, 'user02277', 'member');
+INSERT INTO users VALUES (2280, 'user02280', 'member');
+INSERT INTO users VALUES (2283, 'user02283', 'member');
+INSERT INTO users VALUES (2286, 'user02286', 'member');
+INSERT INTO users VALUES (2289, 'user02289', 'member');
+INSERT INTO users VALUES (2292, 'user02292', 'member');
+INSERT INTO users VALUES (2295, 'user02295', 'member');
+INSERT INTO users VALUES (2298, 'user02298', 'member');
+INSERT INTO users VALUES (2301, 'user02301', 'member');
+INSERT INTO users VALUES (2304, 'user02304', 'member');
+INSERT INTO users VALUES (2307, 'user02307', 'member');
+INSERT INTO users VALUES (2310, 'user02310', 'member');
+INSERT INTO users VALUES (2313, 'user02313', 'member');
+INSERT INTO users VALUES (2316, 'user02316', 'member');
+INSERT INTO users VALUES (2319, 'user02319', 'member');
+INSERT INTO users VALUES (2322, 'user02322', 'member');
+INSERT INTO users VALUES (2325, 'user02325', 'member');
+INSERT INTO users VALUES (2328, 'user02328', 'member');
+INSERT INTO users VALUES (2331, 'user02331', 'member');
+INSERT INTO users VALUES (2334, 'user02334', 'member');
+INSERT INTO users VALUES (2337, 'user02337', 'member');
+INSERT INTO users VALUES (2340, 'user02340', 'member');
+INSERT INTO users VALUES (2343, 'user02343', 'member');
+INSERT INTO users VALUES (2346, 'user02346', 'member');
+INSERT INTO users VALUES (2349, 'user02349', 'member');
+INSERT INTO users VALUES (2352, 'user02352', 'member');
+INSERT INTO users VALUES (2355, 'user02355', 'member');
+INSERT INTO users VALUES (2358, 'user02358', 'member');
+INSERT INTO users VALUES (2361, 'user02361', 'member');
+INSERT INTO users VALUES (2364, 'user02364', 'member');
+INSERT INTO users VALUES (2367, 'user02367', 'member');
+INSERT INTO users VALUES (2370, 'user02370', 'member');
+INSERT INTO users VALUES (2373, 'user02373', 'member');
+INSERT INTO users VALUES (2376, 'user02376', 'member');
+INSERT INTO users VALUES (2379, 'user02379', 'member');
+INSERT INTO users VALUES (2382, 'user02382', 'member');
+INSERT INTO users VALUES (2385, 'user02385', 'member');
+INSERT INTO users VALUES (2388, 'user02388', 'member');
+INSERT INTO users VALUES (2391, 'user02391', 'member');
+INSERT INTO users VALUES (2394, 'user02394', 'member');
+INSERT INTO users VALUES (2397, 'user02397', 'member');
+INSERT INTO users VALUES (2400, 'user02400', 'member');
+INSERT INTO users VALUES (2403, 'user02403', 'member');
+INSERT INTO users VALUES (2406, 'user02406', 'member');
+INSERT INTO users VALUES (2409, 'user02409', 'member');
+INSERT INTO users VALUES (2412, 'user02412', 'member');
+INSERT INTO users VALUES (2415, 'user02415', 'member');
+INSERT INTO users VALUES (2418, 'user02418', 'member');
+INSERT INTO users VALUES (2421, 'user02421', 'member');
+INSERT INTO users VALUES (2424, 'user02424', 'member');
+INSERT INTO users VALUES (2427, 'user02427', 'member');
+INSERT INTO users VALUES (2430, 'user02430', 'member');
+INSERT INTO users VALUES (2433, 'user02433', 'member');
+INSERT INTO users VALUES (2436, 'user02436', 'member');
+INSERT INTO users VALUES (2439, 'user02439', 'member');
+INSERT INTO users VALUES (2442, 'user02442', 'member');
+INSERT INTO users VALUES (2445, 'user02445', 'member');
+INSERT INTO users VALUES (2448, 'user02448', 'member');
+INSERT INTO users VALUES (2451, 'user02451', 'member');
+INSERT INTO users VALUES (2454, 'user02454', 'member');
+INSERT INTO users VALUES (2457, 'user02457', 'member');
+INSERT INTO users VALUES (2460, 'user02460', 'member');
+INSERT INTO users VALUES (2463, 'user02463', 'member');
+INSERT INTO users VALUES (2466, 'user02466', 'member');
+INSERT INTO users VALUES (2469, 'user02469', 'member');
+INSERT INTO users VALUES (2472, 'user02472', 'member');
+INSERT INTO users VALUES (2475, 'user02475', 'member');
+INSERT INTO users VALUES (2478, 'user02478', 'member');
+INSERT INTO users VALUES (2481, 'user02481', 'member');
+INSERT INTO users VALUES (2484, 'user02484', 'member');
+INSERT INTO users VALUES (2487, 'user02487', 'member');
+INSERT INTO users VALUES (2490, 'user02490', 'member');
+INSERT INTO users VALUES (2493, 'user02493', 'member');
+INSERT INTO users VALUES (2496, 'user02496', 'member');
+INSERT INTO users VALUES (2499, 'user02499', 'member');
+INSERT INTO users VALUES (2502, 'user02502', 'member');
+INSERT INTO users VALUES (2505, 'user02505', 'member');
+INSERT INTO users VALUES (2508, 'user02508', 'member');
+INSERT INTO users VALUES (2511, 'user02511', 'member');
+INSERT INTO users VALUES (2514, 'user02514', 'member');
+INSERT INTO users VALUES (2517, 'user02517', 'member');
+INSERT INTO users VALUES (2520, 'user02520', 'member');
+INSERT INTO users VALUES (2523, 'user02523', 'member');
+INSERT INTO users VALUES (2526, 'user02526', 'member');
+INSERT INTO users VALUES (2529, 'user02529', 'member');
+INSERT INTO users VALUES (2532, 'user02532', 'member');
+INSERT INTO users VALUES (2535, 'user02535', 'member');
+INSERT INTO users VALUES (2538, 'user02538', 'member');
+INSERT INTO users VALUES (2541, 'user02541', 'member');
+INSERT INTO users VALUES (2544, 'user02544', 'member');
+INSERT INTO users VALUES (2547, 'user02547', 'member');
+INSERT INTO users VALUES (2550, 'user02550', 'member');
+INSERT INTO users VALUES (2553, 'user02553', 'member');
+INSERT INTO users VALUES (2556, 'user02556', 'member');
+INSERT INTO users VALUES (2559, 'user02559', 'member');
+INSERT INTO users VALUES (2562, 'user02562', 'member');
+INSERT INTO users VALUES (2565, 'user02565', 'member');
+INSERT INTO users VALUES (2568, 'user02568', 'member');
+INSERT INTO users VALUES (2571, 'user02571', 'member');
+INSERT INTO users VALUES (2574, 'user02574', 'member');
+INSERT INTO users VALUES (2577, 'user02577', 'member');
+INSERT INTO users VALUES (2580, 'user02580', 'member');
+INSERT INTO users VALUES (2583, 'user02583', 'member');
+INSERT INTO users VALUES (2586, 'user02586', 'member');
+INSERT INTO users VALUES (2589, 'user02589', 'member');
+INSERT INTO users VALUES (2592, 'user02592', 'member');
+INSERT INTO users VALUES (2595, 'user02595', 'member');
+INSERT INTO users VALUES (2598, 'user02598', 'member');
+INSERT INTO users VALUES (2601, 'user02601', 'member');
+INSERT INTO users VALUES (2604, 'user02604', 'member');
+INSERT INTO users VALUES (2607, 'user02607', 'member');
+INSERT INTO users VALUES (2610, 'user02610', 'member');
+INSERT INTO users VALUES (2613, 'user02613', 'member');
+INSERT INTO users VALUES (2616, 'user02616', 'member');
+INSERT INTO users VALUES (2619, 'user02619', 'member');
+INSERT INTO users VALUES (2622, 'user02622', 'member');
+INSERT INTO users VALUES (2625, 'user02625', 'member');
+INSERT INTO users VALUES (2628, 'user02628', 'member');
+INSERT INTO users VALUES (2631, 'user02631', 'member');
+INSERT INTO users VALUES (2634, 'user02634', 'member');
+INSERT INTO users VALUES (2637, 'user02637', 'member');
+INSERT INTO users VALUES (2640, 'user02640', 'member');
+INSERT INTO users VALUES (2643, 'user02643', 'member');
+INSERT INTO users VALUES (2646, 'user02646', 'member');
+INSERT INTO users VALUES (2649, 'user02649', 'member');
+INSERT INTO users VALUES (2652, 'user02652', 'member');
+INSERT INTO users VALUES (2655, 'user02655', 'member');
+INSERT INTO users VALUES (2658, 'user02658', 'member');
+INSERT INTO users VALUES (2661, 'user02661', 'member');
+INSERT INTO users VALUES (2664, 'user02664', 'member');
+INSERT INTO users VALUES (2667, 'user02667', 'member');
+INSERT INTO users VALUES (2670, 'user02670', 'member');
+INSERT INTO users VALUES (2673, 'user02673', 'member');
+INSERT INTO users VALUES (2676, 'user02676', 'member');
+INSERT INTO users VALUES (2679, 'user02679', 'member');
+INSERT INTO users VALUES (2682, 'user02682', 'member');
+INSERT INTO users VALUES (2685, 'user02685', 'member');
+INSERT INTO users VALUES (2688, 'user02688', 'member');
+INSERT INTO users VALUES (2691, 'user02691', 'member');
+INSERT INTO users VALUES (2694, 'user02694', 'member');
+INSERT INTO users VALUES (2697, 'user02697', 'member');
+INSERT INTO users VALUES (2700, 'user02700', 'member');
+INSERT INTO users VALUES (2703, 'user02703', 'member');
+INSERT INTO users VALUES (2706, 'user02706', 'member');
+INSERT INTO users VALUES (2709, 'user02709', 'member');
+INSERT INTO users VALUES (2712, 'user02712', 'member');
+INSERT INTO users VALUES (2715, 'user02715', 'member');
+INSERT INTO users VALUES (2718, 'user02718', 'member');
+INSERT INTO users VALUES (2721, 'user02721', 'member');
+INSERT INTO users VALUES (2724, 'user02724', 'member');
+INSERT INTO users VALUES (2727, 'user02727', 'member');
+INSERT INTO users VALUES (2730, 'user02730', 'member');
+INSERT INTO users VALUES (2733, 'user02733', 'member');
+INSERT INTO users VALUES (2736, 'user02736', 'member');
+INSERT INTO users VALUES (2739, 'user02739', 'member');
+INSERT INTO users VALUES (2742, 'user02742', 'member');
+INSERT INTO users VALUES (2745, 'user02745', 'member');
+INSERT INTO users VALUES (2748, 'user02748', 'member');
+INSERT INTO users VALUES (2751, 'user02751', 'member');
+INSERT INTO users VALUES (2754, 'user02754', 'member');
+INSERT INTO users VALUES (2757, 'user02757', 'member');
+INSERT INTO users VALUES (2760, 'user02760', 'member');
+INSERT INTO users VALUES (2763, 'user02763', 'member');
+INSERT INTO users VALUES (2766, 'user02766', 'member');
+INSERT INTO users VALUES (2769, 'user02769', 'member');
+INSERT INTO users VALUES (2772, 'user02772', 'member');
+INSERT INTO users VALUES (2775, 'user02775', 'member');
+INSERT INTO users VALUES (2778, 'user02778', 'member');
+INSERT INTO users VALUES (2781, 'user02781', 'member');
+INSERT INTO users VALUES (2784, 'user02784', 'member');
+INSERT INTO users VALUES (2787, 'user02787', 'member');
+INSERT INTO users VALUES (2790, 'user02790', 'member');
+INSERT INTO users VALUES (2793, 'user02793', 'member');
+INSERT INTO users VALUES (2796, 'user02796', 'member');
+INSERT INTO users VALUES (2799, 'user02799', 'member');
+INSERT INTO users VALUES (2802, 'user02802', 'member');
+INSERT INTO users VALUES (2805, 'user02805', 'member');
+INSERT INTO users VALUES (2808, 'user02808', 'member');
+INSERT INTO users VALUES (2811, 'user02811', 'member');
+INSERT INTO users VALUES (2814, 'user02814', 'member');
+INSERT INTO users VALUES (2817, 'user02817', 'member');
+INSERT INTO users VALUES (2820, 'user02820', 'member');
+INSERT INTO users VALUES (2823, 'user02823', 'member');
+INSERT INTO users VALUES (2826, 'user02826', 'member');
+INSERT INTO users VALUES (2829, 'user02829', 'member');
+INSERT INTO users VALUES (2832, 'user02832', 'member');
+INSERT INTO users VALUES (2835, 'user02835', 'member');
+INSERT INTO users VALUES (2838, 'user02838', 'member');
+INSERT INTO users VALUES (2841, 'user02841', 'member');
+INSERT INTO users VALUES (2844, 'user02844', 'member');
+INSERT INTO users VALUES (2847, 'user02847', 'member');
+INSERT INTO users VALUES (2850, 'user02850', 'member');
+INSERT INTO users VALUES (2853, 'user02853', 'member');
+INSERT INTO users VALUES (2856, 'user02856', 'member');
+INSERT INTO users VALUES (2859, 'user02859', 'member');
+INSERT INTO users VALUES (2862, 'user02862', 'member');
+INSERT INTO users VALUES (2865, 'user02865', 'member');
+INSERT INTO users VALUES (2868, 'user02868', 'member');
+INSERT INTO users VALUES (2871, 'user02871', 'member');
+INSERT INTO users VALUES (2874, 'user02874', 'member');
+INSERT INTO users VALUES (2877, 'user02877', 'member');
+INSERT INTO users VALUES (2880, 'user02880', 'member');
+INSERT INTO users VALUES (2883, 'user02883', 'member');
+INSERT INTO users VALUES (2886, 'user02886', 'member');
+INSERT INTO users VALUES (2889, 'user02889', 'member');
+INSERT INTO users VALUES (2892, 'user02892', 'member');
+INSERT INTO users VALUES (2895, 'user02895', 'member');
+INSERT INTO users VALUES (2898, 'user02898', 'member');
+INSERT INTO users VALUES (2901, 'user02901', 'member');
+INSERT INTO users VALUES (2904, 'user02904', 'member');
+INSERT INTO users VALUES (2907, 'user02907', 'member');
+INSERT INTO users VALUES (2910, 'user02910', 'member');
+INSERT INTO users VALUES (2913, 'user02913', 'member');
+INSERT INTO users VALUES (2916, 'user02916', 'member');
+INSERT INTO users VALUES (2919, 'user02919', 'member');
+INSERT INTO users VALUES (2922, 'user02922', 'member');
+INSERT INTO users VALUES (2925, 'user02925', 'member');
+INSERT INTO users VALUES (2928, 'user02928', 'member');
+INSERT INTO users VALUES (2931, 'user02931', 'member');
+INSERT INTO users VALUES (2934, 'user02934', 'member');
+INSERT INTO users VALUES (2937, 'user02937', 'member');
+INSERT INTO users VALUES (2940, 'user02940', 'member');
+INSERT INTO users VALUES (2943, 'user02943', 'member');
+INSERT INTO users VALUES (2946, 'user02946', 'member');
+INSERT INTO users VALUES (2949, 'user02949', 'member');
+INSERT INTO users VALUES (2952, 'user02952', 'member');
+INSERT INTO users VALUES (2955, 'user02955', 'member');
+INSERT INTO users VALUES (2958, 'user02958', 'member');
+INSERT INTO users VALUES (2961, 'user02961', 'member');
+INSERT INTO users VALUES (2964, 'user02964', 'member');
+INSERT INTO users VALUES (2967, 'user02967', 'member');
+INSERT INTO users VALUES (2970, 'user02970', 'member');
+INSERT INTO users VALUES (2973, 'user02973', 'member');
+INSERT INTO users VALUES (2976, 'user02976', 'member');
+INSERT INTO users VALUES (2979, 'user02979', 'member');
+INSERT INTO users VALUES (2982, 'user02982', 'member');
+INSERT INTO users VALUES (2985, 'user02985', 'member');
+INSERT INTO users VALUES (2988, 'user02988', 'member');
+INSERT INTO users VALUES (2991, 'user02991', 'member');
+INSERT INTO users VALUES (2994, 'user02994', 'member');
+INSERT INTO users VALUES (2997, 'user02997', 'member');
+INSERT INTO users VALUES (3000, 'user03000', 'member');
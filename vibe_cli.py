@@ -1,5 +1,8 @@
 import argparse
 import datetime as _dt
+import filecmp
+import hashlib
+import json
 import os
 import re
 import shutil
@@ -162,8 +165,82 @@ def load_patches(patch_path: Path) -> List[Tuple[Dict[str, Any], str]]:
     Load one or more VibeSpec patches from a .vibe file.
     Returns a list of (metadata_dict, code_str) tuples.
     Splits metadata at the next 'patch_type:' or '--- code:' marker.
+    Uses the compiled sidecar (see compile_patches) when it is fresh.
     """
     text = patch_path.read_text()
+    compiled = _load_compiled(patch_path, text)
+    if compiled is not None:
+        return compiled
+    return parse_patches(text)
+
+# Bump when parse_patches changes what it produces, so old sidecars go stale.
+COMPILED_FORMAT = 1
+
+
+def compiled_path(patch_path: Path) -> Path:
+    """Where `vibe compile` puts the sidecar for a bundle: `<bundle>c`."""
+    return patch_path.with_name(patch_path.name + "c")
+
+
+def _bundle_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def compile_patches(patch_path: Path) -> Path:
+    """
+    Parse and validate a bundle once and write the result next to it as a
+    compact JSON sidecar, keyed on the bundle's content hash. Patches
+    without a `file:` key are validated once it is resolved. Raises
+    ValueError if a patch is invalid or its metadata is not plain JSON.
+    """
+    text = patch_path.read_text()
+    patches = parse_patches(text)
+    for meta, _ in patches:
+        if meta.get("file"):
+            validate_spec(meta)
+    body = [[meta, code] for meta, code in patches]
+    data = json.dumps({"format": COMPILED_FORMAT, "source_hash": _bundle_hash(text),
+                       "patches": body}, separators=(",", ":"), default=str)
+    if json.loads(data)["patches"] != body:
+        # e.g. YAML parsed a value into a date; the sidecar would change it
+        raise ValueError(f"{patch_path.name}: metadata is not plain JSON; cannot compile")
+    out = compiled_path(patch_path)
+    tmp = out.with_name(f"{out.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(data, encoding="utf-8")
+        os.replace(tmp, out)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return out
+
+
+def _load_compiled(patch_path: Path, text: str) -> Optional[List[Tuple[Dict[str, Any], str]]]:
+    """
+    The sidecar's patches if it was compiled from exactly `text`, else
+    None. A sidecar that is unreadable or not shaped as compile_patches
+    writes it (truncated, hand-edited) counts as stale too.
+    """
+    sidecar = compiled_path(patch_path)
+    try:
+        data = json.loads(sidecar.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    try:
+        if data.get("format") != COMPILED_FORMAT or data.get("source_hash") != _bundle_hash(text):
+            _log("Ignoring stale {}; re-run `vibe compile`", sidecar.name)
+            return None
+        patches = [(meta, code) for meta, code in data["patches"]]
+        if not all(isinstance(meta, dict) and isinstance(code, str) for meta, code in patches):
+            raise ValueError("patch entries must be [meta, code]")
+    except (AttributeError, KeyError, TypeError, ValueError):
+        _log("Ignoring malformed {}; re-run `vibe compile`", sidecar.name)
+        return None
+    return patches
+
+def parse_patches(text: str) -> List[Tuple[Dict[str, Any], str]]:
+    """
+    Parse one or more VibeSpec patches from bundle text; see load_patches.
+    """
     lines = text.splitlines()
     patches: List[Tuple[Dict[str, Any], str]] = []
     i = 0
@@ -222,13 +299,66 @@ def load_patches(patch_path: Path) -> List[Tuple[Dict[str, Any], str]]:
 
     return patches
 
-def apply_patches(patches: List[Tuple[Dict[str, Any], str]], repo: Path, dry: bool=False):
+def _patch_symbol(meta: Dict[str, Any], code: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Work out which symbol (and kind) a patch targets, for looking up its
+    file in the symbol index: the existing class for add_method, the
+    named (or defined) symbol otherwise. Returns (None, None) for block
+    patches.
+    """
+    pt = meta.get("patch_type", "")
+    name = meta.get("name")
+    cls = meta.get("class")
+    if pt in ("replace_method", "remove_method") and cls and name:
+        return f"{cls}.{name}", "method"
+    if pt == "add_method" and cls:
+        return cls, "class"
+    if pt in ("replace_function", "remove_function", "add_function") and name:
+        return name, "function"
+    if pt in ("replace_class", "remove_class") and name:
+        return name, "class"
+    if pt == "add_class":
+        m = re.search(r"^\s*class\s+([\w_]+)", dedent(code or ""), re.MULTILINE)
+        if m:
+            return m.group(1), "class"
+    return None, None
+
+def resolve_patch_targets(patches: List[Tuple[Dict[str, Any], str]], repo: Path, index=None) -> None:
+    """
+    Fill in a missing `file:` key for patches whose target symbol is
+    defined exactly once under `repo`, using the persistent symbol index.
+    Raises ValueError if a file-less replace_*/remove_* patch cannot be
+    resolved uniquely. add_* patches may name a symbol that doesn't exist
+    yet, so they are only resolved when it (or, for add_method, the class)
+    already does; otherwise validate_spec reports the missing `file`.
+    """
+    for meta, code in patches:
+        if meta.get("file"):
+            continue
+        symbol, kind = _patch_symbol(meta, code)
+        if not symbol:
+            continue  # validate_spec reports the missing key
+        if index is None:
+            from vibe_index import SymbolIndex
+            index = SymbolIndex(repo)
+        try:
+            hit = index.find_unique(symbol, kind)
+        except LookupError as e:
+            if meta.get("patch_type", "").startswith("add_"):
+                continue
+            raise ValueError(f"Cannot infer `file:` for {meta.get('patch_type')}: {e}")
+        meta["file"] = hit["file"]
+        _log("Resolved {} → {}", symbol, hit["file"])
+
+def apply_patches(patches: List[Tuple[Dict[str, Any], str]], repo: Path, dry: bool=False,
+                  strict: bool=False):
     """
     Apply each (meta, code) in sequence.
     """
+    resolve_patch_targets(patches, repo)
     for meta, code in patches:
         validate_spec(meta)
-        apply_patch(meta, code, repo, dry=dry)
+        apply_patch(meta, code, repo, dry=dry, strict=strict)
 
 # =============================================================================
 #  Utility helpers
@@ -785,36 +915,51 @@ def _remove_class(src: str, cls: str) -> str:
 #  Apply patch
 # =============================================================================
 
-def apply_patch(meta: Dict[str, Any], code: str, repo: Path, dry: bool=False):
-    # (Keep the entire existing apply_patch function content from the last successful version)
-    # (Ensure _perform_anchor_block_removal and _reindent_code_block are defined/accessible)
+def _reindent_code_block(original_block_str: str, indent_prefix: str) -> str:
+    if not original_block_str:
+        return ""
+    reindented_lines = [(indent_prefix + line) for line in original_block_str.splitlines()]
+    return "\n".join(reindented_lines)
 
-    # --- Start of the section from the previous apply_patch that needs these helpers ---
-    target = repo / meta["file"]
-    pt = meta["patch_type"]
 
-    file_existed_originally = target.exists()
-    src = ""
+def _is_python(target: Path, src: Optional[str]=None) -> bool:
+    """
+    True for `.py` files, and for files without a suffix whose first line
+    is a python shebang. The first line comes from `src`, or else from the
+    file itself. Only these are parsed and run through autopep8.
+    """
+    if target.suffix:
+        return target.suffix == ".py"
+    if src is None:
+        try:
+            with open(target, "r", encoding="utf-8", errors="replace") as f:
+                src = f.readline()
+        except OSError:
+            src = ""
+    first_line = src.split("\n", 1)[0]
+    return first_line.startswith("#!") and "python" in first_line
+
+
+def transform_source(meta: Dict[str, Any], code: str, src: str, strict: bool=False,
+                     filename: Optional[str]=None) -> str:
+    """
+    Return `src` with one patch applied, in memory. apply_patch() is this
+    plus file I/O and backups.
 
-    if not file_existed_originally:
-        is_add_or_replace = pt.startswith("add_") or pt.startswith("replace_")
-        if is_add_or_replace:
-            _log("Target file {} does not exist. Creating for patch type '{}'.", target.name, pt)
-            target.parent.mkdir(parents=True, exist_ok=True)
-            if not dry: 
-                target.write_text("", encoding='utf-8')
-            src = "" 
-        else:
-            raise FileNotFoundError(f"Target file '{target}' not found for patch type '{pt}'.")
-    else:
-        if not dry:
-            _log("Backup → {}", _backup(target))
-        src = target.read_text(encoding='utf-8')
+    By default, missing anchors or symbols fall back to appending the block
+    (with a warning), as the CLI always has. With strict=True they raise
+    ValueError instead, and the result must still parse as Python. Only
+    Python files (see _is_python) are run through autopep8.
+    """
+    pt = meta["patch_type"]
+    target = Path(filename or meta.get("file") or "<source>")
+    if strict:
+        _check_patch_targets(meta, code, src, target.name)
 
     block_content_from_patch = dedent(code).rstrip("\n") if code else ""
     new_src = None
 
-    # --- Helpers (assuming they are defined/accessible) ---
+    # --- Helpers ---
     def _perform_anchor_block_removal(source_text: str, start_pattern: str, end_pattern: str) -> str:
         # ... (implementation from vibe_cli.py) ...
         normalized_text = source_text.replace('\r\n', '\n').replace('\r', '\n')
@@ -836,12 +981,6 @@ def apply_patch(meta: Dict[str, Any], code: str, repo: Path, dry: bool=False):
             output_lines.append(line_content)
         return "".join(output_lines)
 
-    def _reindent_code_block(original_block_str: str, indent_prefix: str) -> str:
-        # ... (implementation from vibe_cli.py) ...
-        if not original_block_str:
-            return ""
-        reindented_lines = [(indent_prefix + line) for line in original_block_str.splitlines()]
-        return "\n".join(reindented_lines)
     # --- End Helpers ---
 
     # --- Patch Type Logic ---
@@ -1018,7 +1157,265 @@ def apply_patch(meta: Dict[str, Any], code: str, repo: Path, dry: bool=False):
         _log(f"Error applying patch ({pt}) to {target.name}: {e}")
         raise
 
-    new_src = lint_code(new_src)
+    if not _is_python(target, src):
+        return new_src
+    if strict:
+        try:
+            ast.parse(new_src)
+        except SyntaxError as e:
+            raise ValueError(f"{pt} leaves {target.name} unparsable: line {e.lineno}: {e.msg}")
+    return lint_code(new_src)
+
+
+
+def _check_patch_targets(meta: Dict[str, Any], code: str, src: str, name: str) -> None:
+    """Raise ValueError if anything `meta` refers to is missing from `src` (strict mode)."""
+    pt = meta["patch_type"]
+    lines = src.replace('\r\n', '\n').replace('\r', '\n').splitlines()
+
+    def first_match(pattern: str, start: int=0) -> int:
+        pat = re.compile(pattern)
+        return next((i for i in range(start, len(lines)) if pat.search(lines[i])), -1)
+
+    def has_class(cls: str) -> bool:
+        return first_match(rf"^\s*class\s+{re.escape(cls)}\b.*:") != -1
+
+    if pt in ("replace_function", "remove_function"):
+        if get_function_extent_ast(src, meta["name"])[0] is None:
+            raise ValueError(f"function '{meta['name']}' not found in {name}")
+    elif pt in ("replace_method", "remove_method"):
+        if get_method_extent_ast(src, meta["class"], meta["name"])[0] is None:
+            raise ValueError(f"method '{meta['class']}.{meta['name']}' not found in {name}")
+    elif pt == "add_method":
+        if not has_class(meta["class"]):
+            raise ValueError(f"class '{meta['class']}' not found in {name}")
+    elif pt in ("replace_class", "remove_class"):
+        if not has_class(meta["name"]):
+            raise ValueError(f"class '{meta['name']}' not found in {name}")
+    elif pt == "add_block" and meta.get("position", "end") in ("before", "after"):
+        if first_match(meta["anchor"]) == -1:
+            raise ValueError(f"anchor '{meta['anchor']}' not found in {name}")
+    elif pt in ("replace_block", "remove_block"):
+        start = first_match(meta["anchor_start"])
+        if start == -1:
+            raise ValueError(f"anchor_start '{meta['anchor_start']}' not found in {name}")
+        if first_match(meta["anchor_end"], start) == -1:
+            raise ValueError(f"anchor_end '{meta['anchor_end']}' not found after line {start + 1} of {name}")
+
+# =============================================================================
+#  Streaming block patches
+# =============================================================================
+
+# Block patches on existing non-Python files are applied line by line into
+# a temp file that then replaces the original, so memory use stays flat
+# however large the file (generated configs, SQL dumps). The output is the
+# same as transform_source() gives for those files.
+STREAMABLE_PATCH_TYPES = ("add_block", "remove_block", "replace_block")
+STREAM_BUFFER_BYTES = 1 << 20
+
+
+def _stream_lines(path: Path):
+    """Lines of `path`, split exactly as read_text().splitlines(keepends=True) would."""
+    with open(path, "r", encoding="utf-8", buffering=STREAM_BUFFER_BYTES) as f:
+        for physical in f:
+            # splitlines() also breaks at \f, \v, \x1c-\x1e, \x85, \u2028-9.
+            yield from physical.splitlines(keepends=True)
+
+
+def _scan_block_anchors(meta: Dict[str, Any], path: Path) -> Dict[str, Any]:
+    """
+    First pass for _stream_block_patch: where the patch's anchors are
+    (0-based lines; None if not found), the anchor's indentation and, for
+    add_block, where the block goes and whether the text after it starts
+    with a class or def.
+    """
+    scan: Dict[str, Any] = {"start": None, "end": None, "insert": None, "indent": "",
+                            "suffix_def": False}
+    if meta["patch_type"] == "add_block":
+        pat = re.compile(meta["anchor"])
+        anchor_indent = 0
+        i = -1
+        for i, line in enumerate(_stream_lines(path)):
+            if scan["start"] is None:
+                if not pat.search(line):
+                    continue
+                scan["start"] = i
+                scan["indent"] = line[:len(line) - len(line.lstrip())]
+                anchor_indent = len(scan["indent"])
+                if meta.get("position") != "before":
+                    continue
+                scan["insert"] = i
+            elif scan["insert"] is None:
+                # "after" goes past the anchor's indented body.
+                if not (line.strip() and len(line) - len(line.lstrip()) <= anchor_indent):
+                    continue
+                scan["insert"] = i
+            if line.strip():
+                scan["suffix_def"] = bool(re.match(r"\s*(class|def)\s+", line))
+                break
+        if scan["start"] is not None and scan["insert"] is None:
+            scan["insert"] = i + 1
+    else:
+        start_re, end_re = re.compile(meta["anchor_start"]), re.compile(meta["anchor_end"])
+        for i, line in enumerate(_stream_lines(path)):
+            if scan["start"] is None and start_re.search(line):
+                scan["start"] = i
+                scan["indent"] = line[:len(line) - len(line.lstrip())]
+            if scan["start"] is not None and end_re.search(line):
+                scan["end"] = i + 1
+                break
+    return scan
+
+
+def _missing_anchor(meta: Dict[str, Any], scan: Dict[str, Any], name: str) -> Optional[str]:
+    """The strict-mode error for `scan`, as _check_patch_targets() words it."""
+    if meta["patch_type"] == "add_block":
+        return None if scan["start"] is not None else f"anchor '{meta['anchor']}' not found in {name}"
+    if scan["start"] is None:
+        return f"anchor_start '{meta['anchor_start']}' not found in {name}"
+    if scan["end"] is None:
+        return f"anchor_end '{meta['anchor_end']}' not found after line {scan['start'] + 1} of {name}"
+    return None
+
+
+def _write_appended(lines, out, block: str) -> None:
+    """Write `src.rstrip("\\n") + sep + block + "\\n"` as transform_source() appends."""
+    pending, wrote, content = 0, False, False
+    for line in lines:
+        body = line.rstrip("\n")
+        if body:
+            out.write("\n" * pending + body)
+            wrote = True
+            pending = len(line) - len(body)
+            content = content or bool(line.strip())
+        else:
+            pending += len(line)
+    if wrote and block:
+        out.write(("\n\n" if content else "\n") + block + "\n")
+    elif block:
+        out.write(block + "\n")
+    elif wrote:
+        out.write("\n")
+
+
+def _stream_block_patch(meta: Dict[str, Any], code: str, target: Path,
+                        strict: bool=False) -> bool:
+    """
+    Apply an add/remove/replace_block patch to `target` in constant
+    memory: read it line by line, write a temp file beside it, then
+    atomically replace the original. Returns whether the file changed.
+    """
+    pt = meta["patch_type"]
+    pos = meta.get("position", "end")
+    block = dedent(code).rstrip("\n") if code else ""
+    scan = None
+    if pt != "add_block" or pos in ("before", "after"):
+        scan = _scan_block_anchors(meta, target)
+        missing = _missing_anchor(meta, scan, target.name)
+        if missing and strict:
+            raise ValueError(missing)
+        if missing and pt == "add_block":
+            _log(f"Warning: add_block anchor '{meta['anchor']}' not found in {target.name}. Appending to end.")
+            pos, scan = "end", None
+        elif missing and pt == "replace_block":
+            _log(f"Warning: replace_block anchors '{meta['anchor_start']}'...'{meta['anchor_end']}' "
+                 f"not found in {target.name}. Appending new block content.")
+            pos, scan = "end", None
+
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".tmp", dir=target.parent)
+    tmp = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", buffering=STREAM_BUFFER_BYTES) as out:
+            lines = _stream_lines(target)
+            if pt == "remove_block":
+                start_re, end_re = re.compile(meta["anchor_start"]), re.compile(meta["anchor_end"])
+                removing = found = False
+                for line in lines:
+                    if not found and start_re.search(line):
+                        removing = found = True
+                    elif removing:
+                        removing = not end_re.search(line)
+                    else:
+                        out.write(line)
+            elif scan is None and pos == "start":
+                if block:
+                    has_content = any(line.strip() for line in _stream_lines(target))
+                    out.write(block + ("\n\n" if has_content else "\n"))
+                out.writelines(lines)
+            elif scan is None:
+                _write_appended(lines, out, block)
+            elif pt == "replace_block":
+                for i, line in enumerate(lines):
+                    if i == scan["start"]:
+                        replacement = _reindent_code_block(block, scan["indent"])
+                        if replacement:
+                            out.write(replacement + "\n")
+                    elif not scan["start"] < i < scan["end"]:
+                        out.write(line)
+            else:
+                insert = _reindent_code_block(block, scan["indent"])
+                insert = insert + "\n" if insert else ""
+                if insert and scan["suffix_def"]:
+                    insert += "\n"
+                last, prefix_content = "", False
+                for i, line in enumerate(lines):
+                    if i == scan["insert"]:
+                        break
+                    out.write(line)
+                    last, prefix_content = line, prefix_content or bool(line.strip())
+                else:
+                    line = None
+                if prefix_content and not last.endswith("\n"):
+                    out.write("\n")
+                out.write(insert)
+                if line is not None:
+                    out.write(line)
+                out.writelines(lines)
+        changed = not filecmp.cmp(target, tmp, shallow=False)
+        if changed:
+            shutil.copymode(target, tmp)
+            os.replace(tmp, target)
+        return changed
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def apply_patch(meta: Dict[str, Any], code: str, repo: Path, dry: bool=False,
+                strict: bool=False):
+    """
+    Apply one patch to `repo / meta["file"]` via transform_source(),
+    backing up the original first. With dry=True the new source is
+    returned instead of written. Block patches on existing non-Python
+    files are streamed instead (see _stream_block_patch).
+    """
+    target = repo / meta["file"]
+    pt = meta["patch_type"]
+
+    file_existed_originally = target.exists()
+    src = ""
+
+    if not file_existed_originally:
+        is_add_or_replace = pt.startswith("add_") or pt.startswith("replace_")
+        if is_add_or_replace:
+            _log("Target file {} does not exist. Creating for patch type '{}'.", target.name, pt)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if not dry: 
+                target.write_text("", encoding='utf-8')
+            src = "" 
+        else:
+            raise FileNotFoundError(f"Target file '{target}' not found for patch type '{pt}'.")
+    else:
+        if not dry:
+            _log("Backup → {}", _backup(target))
+            if pt in STREAMABLE_PATCH_TYPES and not _is_python(target):
+                if _stream_block_patch(meta, code, target, strict=strict):
+                    _log("Patch applied to {}", target)
+                else:
+                    _log("No changes to apply to {}", target)
+                return None
+        src = target.read_text(encoding='utf-8')
+
+    new_src = transform_source(meta, code, src, strict=strict, filename=target.name)
     if dry:
         return new_src 
 
@@ -1041,20 +1438,34 @@ def apply_patch(meta: Dict[str, Any], code: str, repo: Path, dry: bool=False):
 def build_cli() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(prog="vibe", description="Vibe Patch helper v1.0")
     sub = p.add_subparsers(dest="cmd", required=True)
-    sub.add_parser("lint").add_argument("patch", type=Path)
+    li = sub.add_parser("lint")
+    li.add_argument("patch", type=Path)
+    li.add_argument("repo", type=Path, nargs="?", default=Path.cwd())
     pv = sub.add_parser("preview")
     pv.add_argument("patch", type=Path)
     pv.add_argument("repo", type=Path, nargs="?", default=Path.cwd())
+    pv.add_argument("--strict", action="store_true", help="fail on missing anchors/symbols instead of appending")
     ap = sub.add_parser("apply")
     ap.add_argument("patch", type=Path)
     ap.add_argument("repo", type=Path, nargs="?", default=Path.cwd())
     ap.add_argument("--dry", action="store_true")
+    ap.add_argument("--strict", action="store_true", help="fail on missing anchors/symbols instead of appending")
+    ix = sub.add_parser("index", help="build or refresh the symbol index")
+    ix.add_argument("repo", type=Path, nargs="?", default=Path.cwd())
+    ix.add_argument("--rebuild", action="store_true", help="discard the stored index first")
+    sy = sub.add_parser("symbols", help="look up where a symbol is defined")
+    sy.add_argument("name", help="symbol name, e.g. `greet` or `Foo.bar`")
+    sy.add_argument("repo", type=Path, nargs="?", default=Path.cwd())
+    sy.add_argument("--kind", choices=("function", "class", "method"))
+    co = sub.add_parser("compile", help="pre-parse a bundle into a sidecar for fast loading")
+    co.add_argument("patch", type=Path)
     return p
 
 
 def cmd_lint(args: argparse.Namespace) -> None:
     # batch‑aware lint
     patches = load_patches(args.patch)
+    resolve_patch_targets(patches, args.repo)
     for meta, _ in patches:
         validate_spec(meta)
     _log(f"Lint OK ({len(patches)} patches)")
@@ -1062,6 +1473,7 @@ def cmd_lint(args: argparse.Namespace) -> None:
 def cmd_preview(args: argparse.Namespace) -> None:
     # batch‑aware preview
     patches = load_patches(args.patch)
+    resolve_patch_targets(patches, args.repo)
     tmpdir  = Path(tempfile.mkdtemp())
     # copy affected files
     for meta, _ in patches:
@@ -1069,7 +1481,7 @@ def cmd_preview(args: argparse.Namespace) -> None:
         dst = tmpdir / meta["file"]
         dst.parent.mkdir(parents=True, exist_ok=True)
         dst.write_text(src.read_text())
-    apply_patches(patches, tmpdir, dry=False)
+    apply_patches(patches, tmpdir, dry=False, strict=args.strict)
     # show diffs
     for meta, _ in patches:
         orig = args.repo / meta["file"]
@@ -1081,17 +1493,52 @@ def cmd_preview(args: argparse.Namespace) -> None:
 def cmd_apply(args: argparse.Namespace) -> None:
     # batch‑aware apply
     patches = load_patches(args.patch)
-    apply_patches(patches, args.repo, dry=args.dry)
+    apply_patches(patches, args.repo, dry=args.dry, strict=args.strict)
+
+def cmd_compile(args: argparse.Namespace) -> None:
+    out = compile_patches(args.patch)
+    _log(f"Compiled {args.patch} → {out}")
+
+def cmd_index(args: argparse.Namespace) -> None:
+    from vibe_index import SymbolIndex
+    idx = SymbolIndex(args.repo)
+    if args.rebuild and idx.index_path.exists():
+        idx.index_path.unlink()
+    stats = idx.refresh()
+    _log(f"Indexed {stats['files']} files ({stats['parsed']} parsed, {stats['unchanged']} unchanged, "
+         f"{stats['removed']} removed) → {idx.index_path}")
+
+def cmd_symbols(args: argparse.Namespace) -> None:
+    from vibe_index import SymbolIndex
+    idx = SymbolIndex(args.repo)
+    idx.refresh()
+    hits = idx.lookup(args.name, args.kind)
+    if not hits:
+        _log(f"Symbol '{args.name}' not found")
+        sys.exit(1)
+    for h in hits:
+        print(f"{h['file']}:{h['start']}-{h['end']}\t{h['kind']}\t{h['name']}")
 
 import autopep8
 
+# Optional cache for lint_code results, keyed by a hash of the input. The
+# server installs a vibe_store.SharedStore so worker processes share them.
+_format_cache = None
+
+def set_format_cache(cache) -> None:
+    global _format_cache
+    _format_cache = cache
+
 def lint_code(src: str) -> str:
     """
     Takes a Python source code string and returns a PEP8-compliant
     version of the source code using autopep8.
     """
-    fixed_src = autopep8.fix_code(src, options={'aggressive': 1})
-    return fixed_src
+    if _format_cache is None:
+        return autopep8.fix_code(src, options={'aggressive': 1})
+    key = hashlib.sha256(src.encode('utf-8')).hexdigest()
+    return _format_cache.get_or_compute(
+        "autopep8", key, lambda: autopep8.fix_code(src, options={'aggressive': 1}))
 
 
 if __name__ == "__main__":
@@ -1103,5 +1550,11 @@ if __name__ == "__main__":
         cmd_preview(args)
     elif args.cmd == "apply":
         cmd_apply(args)
+    elif args.cmd == "compile":
+        cmd_compile(args)
+    elif args.cmd == "index":
+        cmd_index(args)
+    elif args.cmd == "symbols":
+        cmd_symbols(args)
     else:
         cli.error(f"Unknown command: {args.cmd}")
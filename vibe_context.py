@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+vibe_context.py
+
+Symbol-level context slicing for LLM patch prompts.
+
+Instead of pasting a whole module into the prompt, `build_file_context`
+uses the AST to keep the symbols the request is about (functions, classes
+and methods named in the prompt, plus their callers and callees) and all
+imports verbatim, and reduces everything else to its signature. Full
+bodies are added in priority order until the token budget is spent.
+"""
+import ast
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+DEFAULT_TOKEN_BUDGET = 6000
+
+# Rough chars-per-token ratio for code; good enough for budgeting and
+# deliberately provider-agnostic.
+CHARS_PER_TOKEN = 4
+
+ELIDED_NOTE = (
+    "# NOTE: Only the parts of this file relevant to the request are shown in full.\n"
+    "# Other definitions show their signature with `...` in place of the body.\n"
+)
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+class _Unit:
+    """A contiguous slice of the module that can be shown in full or elided."""
+
+    def __init__(self, name: str, qualname: str, kind: str, node: Optional[ast.AST],
+                 start: int, end: int):
+        self.name = name
+        self.qualname = qualname
+        self.kind = kind          # function / method / class_header / import / stmt
+        self.node = node
+        self.start = start        # 1-indexed, inclusive, decorators included
+        self.end = end
+        self.refs: Set[str] = set()
+        self.priority: Optional[int] = None
+        self.full = kind in ("import", "class_header")
+
+
+def _start_line(node: ast.AST) -> int:
+    decorators = getattr(node, "decorator_list", None)
+    if decorators:
+        return min(node.lineno, min(d.lineno for d in decorators))
+    return node.lineno
+
+
+def _references(node: ast.AST) -> Set[str]:
+    refs = set()
+    for child in ast.walk(node):
+        if isinstance(child, ast.Name):
+            refs.add(child.id)
+        elif isinstance(child, ast.Attribute):
+            refs.add(child.attr)
+    return refs
+
+
+def _collect_units(tree: ast.Module) -> List[_Unit]:
+    units: List[_Unit] = []
+    for node in tree.body:
+        start, end = _start_line(node), node.end_lineno
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            units.append(_Unit("", "", "import", node, start, end))
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            u = _Unit(node.name, node.name, "function", node, start, end)
+            u.refs = _references(node)
+            units.append(u)
+        elif isinstance(node, ast.ClassDef):
+            # The class header (decorators, bases, docstring) is always shown;
+            # methods and class-level statements are separate units.
+            members = [n for n in node.body
+                       if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))]
+            header_end = (_start_line(members[0]) - 1) if members else end
+            header = _Unit(node.name, node.name, "class_header", node, start, header_end)
+            header.refs = _references(node)
+            units.append(header)
+            for member in members:
+                u = _Unit(member.name, f"{node.name}.{member.name}", "method", member,
+                          _start_line(member), member.end_lineno)
+                u.refs = _references(member)
+                units.append(u)
+            if members and members[-1].end_lineno < end:
+                units.append(_Unit(node.name, node.name, "stmt", None,
+                                   members[-1].end_lineno + 1, end))
+        else:
+            u = _Unit("", "", "stmt", node, start, end)
+            u.refs = _references(node)
+            units.append(u)
+    return units
+
+
+def _prompt_identifiers(prompt: str) -> Set[str]:
+    return {tok.lower() for tok in re.findall(r"[A-Za-z_][A-Za-z0-9_.]*", prompt or "")}
+
+
+def _signature(unit: _Unit, lines: List[str]) -> List[str]:
+    node = unit.node
+    header_end = max(node.lineno, node.body[0].lineno - 1)
+    header = lines[unit.start - 1:header_end]
+    if header_end >= unit.end:
+        return header
+    indent = re.match(r"\s*", lines[node.lineno - 1]).group(0)
+    return header + [indent + "    ..."]
+
+
+def build_file_context(source: str, prompt: str,
+                       token_budget: int = DEFAULT_TOKEN_BUDGET) -> Tuple[str, Dict[str, Any]]:
+    """
+    Return (context_text, stats) for `source`, sliced to the symbols
+    relevant to `prompt` and kept within `token_budget` where possible.
+    Files that already fit, or that don't parse, are returned unchanged.
+    Imports and every signature are always sent, so a module whose
+    skeleton alone is larger than the budget still goes over it.
+    """
+    full_tokens = estimate_tokens(source)
+    stats: Dict[str, Any] = {
+        "sliced": False, "budget": token_budget,
+        "full_tokens": full_tokens, "sent_tokens": full_tokens, "symbols_full": [],
+    }
+    if token_budget <= 0 or full_tokens <= token_budget:
+        return source, stats
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return source, stats
+
+    lines = source.splitlines()
+    units = _collect_units(tree)
+    wanted = _prompt_identifiers(prompt)
+
+    # Priority 0: symbols named in the prompt; 1: their callees and callers.
+    seeds = [u for u in units if u.name and (u.name.lower() in wanted or u.qualname.lower() in wanted)]
+    for u in seeds:
+        u.priority = 0
+    seed_names = {u.name for u in seeds}
+    seed_refs = set().union(*(u.refs for u in seeds)) if seeds else set()
+    for u in units:
+        if u.priority is not None or u.kind not in ("function", "method"):
+            continue
+        if u.name in seed_refs or (u.refs & seed_names):
+            u.priority = 1
+        elif u.kind == "method" and u.qualname.split(".")[0] in seed_names:
+            u.priority = 1  # methods of a class named in the prompt
+
+    def render() -> str:
+        out: List[str] = []
+        prev_end = 0
+        for u in units:
+            # Blank lines and comments between definitions are kept as-is.
+            out.extend(lines[prev_end:u.start - 1])
+            prev_end = max(prev_end, u.end)
+            if u.full:
+                out.extend(lines[u.start - 1:u.end])
+            elif u.kind in ("function", "method"):
+                out.extend(_signature(u, lines))
+            else:
+                indent = re.match(r"\s*", lines[u.start - 1]).group(0)
+                out.append(f"{indent}# ... ({u.end - u.start + 1} lines omitted)")
+        out.extend(lines[prev_end:])
+        return ELIDED_NOTE + "\n".join(out) + "\n"
+
+    # Budget in characters, so per-unit rounding can't add up past it; the
+    # skeleton (note, imports, signatures, omission markers) is charged first.
+    used = len(render())
+    budget_chars = token_budget * CHARS_PER_TOKEN
+    candidates = sorted((u for u in units if not u.full),
+                        key=lambda u: (u.priority if u.priority is not None else 2, u.start))
+    for u in candidates:
+        full_len = sum(len(l) + 1 for l in lines[u.start - 1:u.end])
+        if u.kind in ("function", "method"):
+            elided_len = sum(len(l) + 1 for l in _signature(u, lines))
+        else:
+            indent = re.match(r"\s*", lines[u.start - 1]).group(0)
+            elided_len = len(f"{indent}# ... ({u.end - u.start + 1} lines omitted)") + 1
+        cost = max(0, full_len - elided_len)
+        if used + cost > budget_chars:
+            # Relevant symbols are worth a best-effort fit; background
+            # definitions just stop once the budget is reached.
+            if u.priority is None:
+                break
+            continue
+        u.full = True
+        used += cost
+
+    text = render()
+    stats.update({
+        "sliced": True,
+        "sent_tokens": estimate_tokens(text),
+        "symbols_full": [u.qualname for u in units
+                         if u.full and u.kind in ("function", "method")],
+    })
+    return text, stats
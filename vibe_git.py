@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+vibe_git.py
+
+Cheap git history and blob access for the server's version endpoints.
+
+* `GitRepo.file_history()` caches `git log` per file. Entries are keyed on
+  the repository state (HEAD plus the reflog's stat), so commits, resets,
+  checkouts and amends invalidate them, and nothing else does.
+* `GitRepo.build_history_index()` optionally indexes every file's history
+  with one `git log --name-only` pass. History lookups are then served
+  without spawning git at all, until the state changes.
+* `BlobReader` keeps one `git cat-file --batch` process per server process
+  and an LRU of recently read blobs. Viewing or reverting to a version
+  costs a pipe round trip instead of a `git show` spawn.
+"""
+import logging
+import os
+import re
+import subprocess
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# (commit sha, committer date) newest first, as `git log` prints them.
+History = List[Tuple[str, str]]
+
+HISTORY_CACHE_FILES = 512
+BLOB_CACHE_BYTES = 32 * 1024 * 1024
+
+
+def read_head(repo: Path) -> Optional[str]:
+    """HEAD commit of `repo`, read straight from .git (None if unknown)."""
+    git_dir = repo / ".git"
+    try:
+        head = (git_dir / "HEAD").read_text().strip()
+        if not head.startswith("ref: "):
+            return head
+        ref = head[5:]
+        ref_file = git_dir / ref
+        if ref_file.is_file():
+            return ref_file.read_text().strip()
+        packed = git_dir / "packed-refs"
+        if packed.is_file():
+            for line in packed.read_text().splitlines():
+                if line.endswith(" " + ref):
+                    return line.split(" ", 1)[0]
+    except OSError:
+        pass
+    return None
+
+
+class BlobReader:
+    """One long-lived `git cat-file --batch` with an LRU of blob contents."""
+
+    def __init__(self, repo: Path, cache_bytes: int = BLOB_CACHE_BYTES):
+        self.repo = Path(repo)
+        self.cache_bytes = cache_bytes
+        self._proc: Optional[subprocess.Popen] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._cached_bytes = 0
+        self.stats = {"hits": 0, "reads": 0, "restarts": 0}
+
+    def _process(self) -> subprocess.Popen:
+        # A pipe inherited across fork() would be shared by two readers.
+        if self._proc is None or self._proc.poll() is not None or self._pid != os.getpid():
+            if self._proc is not None:
+                self.stats["restarts"] += 1
+            self._proc = subprocess.Popen(
+                ["git", "cat-file", "--batch"], cwd=self.repo,
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            self._pid = os.getpid()
+        return self._proc
+
+    def read(self, rev: str, path: str) -> Optional[bytes]:
+        """Contents of `path` at `rev`, or None if either doesn't exist."""
+        if "\n" in rev or "\n" in path:
+            return None
+        name = f"{rev}:{path}"
+        with self._lock:
+            data = self._cache.get(name)
+            if data is not None:
+                self._cache.move_to_end(name)
+                self.stats["hits"] += 1
+                return data
+            for attempt in range(2):
+                proc = self._process()
+                try:
+                    proc.stdin.write(name.encode("utf-8") + b"\n")
+                    proc.stdin.flush()
+                    header = proc.stdout.readline().decode("utf-8", "replace").split()
+                    if len(header) != 3 or header[1] != "blob":
+                        return None  # "<name> missing", or not a file
+                    data = proc.stdout.read(int(header[2]) + 1)[:-1]
+                    break
+                except (BrokenPipeError, ValueError, OSError):
+                    self._proc = None
+                    if attempt:
+                        raise
+            self.stats["reads"] += 1
+            # Only commit-pinned names are immutable; refs like HEAD move.
+            if re.fullmatch(r"[0-9a-f]{40}", rev) and len(data) <= self.cache_bytes // 4:
+                self._cache[name] = data
+                self._cached_bytes += len(data)
+                while self._cached_bytes > self.cache_bytes:
+                    _, old = self._cache.popitem(last=False)
+                    self._cached_bytes -= len(old)
+            return data
+
+    def close(self) -> None:
+        with self._lock:
+            if self._proc is not None and self._pid == os.getpid():
+                self._proc.stdin.close()
+                self._proc.wait(timeout=5)
+            self._proc = None
+
+
+class GitRepo:
+    """History and blobs of the repository at `root`."""
+
+    def __init__(self, root: Path, auto_index: bool = False):
+        self.root = Path(root).resolve()
+        # Keep a whole-repo history index, rebuilt in the background
+        # whenever the repository state changes.
+        self.auto_index = auto_index
+        self.blobs = BlobReader(self.root)
+        self._lock = threading.Lock()
+        self._history: "OrderedDict[Tuple[str, str], History]" = OrderedDict()
+        # (state, {path: History}) from build_history_index().
+        self._index: Optional[Tuple[str, Dict[str, History]]] = None
+        self._indexing = False
+        self._index_thread: Optional[threading.Thread] = None
+        self.stats = {"history_hits": 0, "index_hits": 0, "git_log_calls": 0}
+
+    def is_repo(self) -> bool:
+        return (self.root / ".git").is_dir()
+
+    def state(self) -> Optional[str]:
+        """Changes whenever HEAD moves or the reflog is written."""
+        head = read_head(self.root)
+        if head is None:
+            return None
+        try:
+            st = (self.root / ".git" / "logs" / "HEAD").stat()
+            return f"{head}:{st.st_mtime_ns}:{st.st_size}"
+        except OSError:
+            return head
+
+    def file_history(self, rel_path: str) -> History:
+        """Commits touching `rel_path`, newest first."""
+        state = self.state()
+        with self._lock:
+            if self._index is not None and state is not None and self._index[0] == state:
+                self.stats["index_hits"] += 1
+                return self._index[1].get(rel_path, [])
+            if self.auto_index and state is not None and not (
+                    self._index_thread and self._index_thread.is_alive()):
+                self._index_thread = threading.Thread(
+                    target=self.build_history_index, name="git-history-index", daemon=True)
+                self._index_thread.start()
+            key = (state, rel_path)
+            if state is not None and key in self._history:
+                self._history.move_to_end(key)
+                self.stats["history_hits"] += 1
+                return self._history[key]
+        history = self._git_log(["--", rel_path])
+        if state is not None:
+            with self._lock:
+                self._history[key] = history
+                while len(self._history) > HISTORY_CACHE_FILES:
+                    self._history.popitem(last=False)
+        return history
+
+    def file_history_page(self, rel_path: str, after: Optional[str] = None,
+                          limit: int = 50) -> Tuple[History, bool]:
+        """
+        Up to `limit` commits touching `rel_path` that come after commit
+        `after` (from the top when None), plus whether more follow. Sliced
+        from the cached history or index when there is one; otherwise git
+        only walks as far as this page needs.
+        """
+        if after is not None and not re.fullmatch(r"[0-9a-f]{7,40}", after):
+            raise ValueError(f"Invalid commit: {after!r}")
+        state = self.state()
+        with self._lock:
+            full = None
+            if self._index is not None and state is not None and self._index[0] == state:
+                full = self._index[1].get(rel_path, [])
+            elif state is not None:
+                full = self._history.get((state, rel_path))
+        if full is not None:
+            start = 0
+            if after is not None:
+                start = next((i + 1 for i, (sha, _) in enumerate(full) if sha.startswith(after)), None)
+            if start is not None:
+                return full[start:start + limit], start + limit < len(full)
+        if after is None:
+            history = self._git_log(["-n", str(limit + 1), "--", rel_path])
+        else:
+            # `git log <after>` starts at `after` itself; drop it.
+            history = self._git_log(["-n", str(limit + 2), after, "--", rel_path])
+            if history and history[0][0].startswith(after):
+                history = history[1:]
+        return history[:limit], len(history) > limit
+
+    def _git_log(self, args: List[str]) -> History:
+        self.stats["git_log_calls"] += 1
+        process = subprocess.run(
+            ["git", "log", "--pretty=format:%H|%ci"] + args,
+            cwd=self.root, capture_output=True, text=True, check=False)
+        if process.returncode != 0:
+            return []
+        history = []
+        for line in process.stdout.splitlines():
+            sha, sep, date = line.partition("|")
+            if sep:
+                history.append((sha, date.strip()))
+            elif line:
+                logging.warning(f"Git log parse error: {line}")
+        return history
+
+    def build_history_index(self) -> int:
+        """
+        Index the history of every file in one `git log --name-only`
+        pass; returns the number of files indexed. Renames are not
+        followed, matching `git log -- <path>`.
+        """
+        state = self.state()
+        if state is None:
+            return 0
+        with self._lock:
+            if self._indexing or (self._index is not None and self._index[0] == state):
+                return len(self._index[1]) if self._index else 0
+            self._indexing = True
+        try:
+            self.stats["git_log_calls"] += 1
+            process = subprocess.run(
+                ["git", "log", "--no-renames", "--name-only", "--pretty=format:\x01%H|%ci"],
+                cwd=self.root, capture_output=True, text=True, check=False)
+            index: Dict[str, History] = {}
+            commit = None
+            for line in process.stdout.splitlines():
+                if line.startswith("\x01"):
+                    sha, _, date = line[1:].partition("|")
+                    commit = (sha, date.strip())
+                elif line and commit is not None:
+                    index.setdefault(line, []).append(commit)
+            if process.returncode == 0:
+                with self._lock:
+                    self._index = (state, index)
+                logging.info(f"Git history index: {len(index)} files.")
+            return len(index)
+        finally:
+            with self._lock:
+                self._indexing = False
+
+    def read_blob(self, rev: str, rel_path: str) -> Optional[bytes]:
+        return self.blobs.read(rev, rel_path)
+
+    def metrics(self) -> Dict[str, object]:
+        with self._lock:
+            m = dict(self.stats)
+            m["cached_histories"] = len(self._history)
+            m["indexed_files"] = len(self._index[1]) if self._index else 0
+        m["blobs"] = dict(self.blobs.stats, cached=len(self.blobs._cache),
+                          cached_bytes=self.blobs._cached_bytes)
+        return m
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+vibe_index.py
+
+Repository-wide symbol index for Vibe.
+
+Maps every function, class and method under a base directory to the file
+and line range that defines it, so callers can answer "where is
+`Foo.bar` defined?" without re-parsing the whole tree.
+
+The index is persisted as JSON under `<base>/.vibe_cache/` and refreshed
+incrementally: a file is only re-parsed when its mtime/size changed *and*
+its content hash differs from the stored one. The first build parses files
+in parallel.
+"""
+import ast
+import hashlib
+import json
+import os
+import tempfile
+import textwrap
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+INDEX_VERSION = 1
+CACHE_DIRNAME = ".vibe_cache"
+INDEX_FILENAME = "symbol_index.json"
+# find() rescans the tree at most this often when its answer looks current.
+REFRESH_INTERVAL = 30.0  # seconds
+
+# Directories never worth indexing (VCS internals, Vibe's own bookkeeping,
+# virtualenvs and tool caches).
+SKIP_DIRS = {
+    ".git", ".hg", ".svn", "VibeBackups", CACHE_DIRNAME, "__pycache__",
+    "node_modules", ".venv", "venv", ".tox", ".nox", ".mypy_cache",
+    ".pytest_cache", ".ruff_cache",
+}
+
+CACHE_GITIGNORE = "# Created by Vibe automatically.\n*\n"
+
+
+def ensure_cache_dir(directory: Path) -> Path:
+    """
+    Create a `.vibe_cache` directory inside a user's workspace, with a
+    `.gitignore` that ignores everything in it, so it never shows up as
+    untracked in their repository.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    gitignore = directory / ".gitignore"
+    if not gitignore.exists():
+        try:
+            gitignore.write_text(CACHE_GITIGNORE, encoding="utf-8")
+        except OSError:
+            pass  # only cosmetic
+    return directory
+
+
+# Below this many files a process pool costs more than it saves.
+PARALLEL_THRESHOLD = 64
+
+# (qualname, kind, start_line, end_line); lines are 1-indexed, inclusive,
+# and the start includes decorators.
+Symbol = Tuple[str, str, int, int]
+
+
+def extract_symbols(source: str) -> List[Symbol]:
+    """
+    Parse `source` and return every function, class and method it defines.
+    Nested classes are qualified with their enclosing class
+    (e.g. `Outer.Inner.method`); functions nested inside functions are
+    not indexed. Raises SyntaxError if the source cannot be parsed.
+    """
+    tree = ast.parse(source)
+    symbols: List[Symbol] = []
+
+    def visit(body: List[ast.stmt], prefix: str, in_class: bool) -> None:
+        for node in body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                start = node.lineno
+                if node.decorator_list:
+                    start = min(start, min(d.lineno for d in node.decorator_list))
+                qualname = prefix + node.name
+                if isinstance(node, ast.ClassDef):
+                    kind = "class"
+                else:
+                    kind = "method" if in_class else "function"
+                symbols.append((qualname, kind, start, node.end_lineno))
+                if isinstance(node, ast.ClassDef):
+                    visit(node.body, qualname + ".", True)
+
+    visit(tree.body, "", False)
+    return symbols
+
+
+def symbol_hashes(source: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Content hash of every symbol in `source`:
+    qualname -> {"kind", "start", "end", "hash", "count"}.
+
+    The hash covers the symbol's lines (decorators included) with their
+    common indentation removed, so moving or re-indenting a symbol is not
+    a change. A class's hash covers its methods too. A name defined more
+    than once (e.g. a property and its setter) is hashed over all its
+    definitions; start/end are those of the first and `count` says how
+    many there are. Raises SyntaxError like extract_symbols().
+    """
+    lines = source.splitlines(keepends=True)
+    table: Dict[str, Dict[str, Any]] = {}
+    for qualname, kind, start, end in extract_symbols(source):
+        body = textwrap.dedent("".join(lines[start - 1:end])).encode("utf-8")
+        entry = table.get(qualname)
+        if entry is None:
+            table[qualname] = {"kind": kind, "start": start, "end": end,
+                               "hash": hashlib.sha1(body).hexdigest(), "count": 1}
+        else:
+            entry["hash"] = hashlib.sha1(entry["hash"].encode("ascii") + body).hexdigest()
+            entry["count"] += 1
+    return table
+
+
+def _scan_file(args: Tuple[str, str]) -> Tuple[str, int, int, str, List[Symbol]]:
+    """
+    Worker for the (possibly parallel) parse step: stat, hash and parse a
+    single file. Unparseable files are indexed with no symbols.
+    """
+    rel, full = args
+    st = os.stat(full)
+    data = Path(full).read_bytes()
+    digest = hashlib.sha1(data).hexdigest()
+    try:
+        symbols = extract_symbols(data.decode("utf-8"))
+    except (SyntaxError, UnicodeDecodeError, ValueError):
+        symbols = []
+    return rel, st.st_mtime_ns, st.st_size, digest, symbols
+
+
+class SymbolIndex:
+    """
+    Persistent, incrementally refreshed symbol index over `base_dir`.
+
+    Typical use:
+
+        idx = SymbolIndex(repo)
+        idx.refresh()
+        idx.lookup("Foo.bar")  # -> [{"file": ..., "start": ..., ...}]
+    """
+
+    def __init__(self, base_dir: Path, index_path: Optional[Path] = None):
+        self.base_dir = Path(base_dir).resolve()
+        self.index_path = index_path or (self.base_dir / CACHE_DIRNAME / INDEX_FILENAME)
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._by_name: Optional[Dict[str, List[Tuple[str, Symbol]]]] = None
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._refreshed_at: Optional[float] = None
+
+    # ------------------------------------------------------------------
+    #  Persistence
+    # ------------------------------------------------------------------
+
+    def load(self) -> None:
+        """Load the on-disk index, ignoring a missing or incompatible file."""
+        self._loaded = True
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") != INDEX_VERSION:
+            return
+        self._files = {
+            rel: dict(entry, symbols=[tuple(s) for s in entry.get("symbols", [])])
+            for rel, entry in data.get("files", {}).items()
+        }
+        self._by_name = None
+
+    def save(self) -> None:
+        """Atomically write the index to disk."""
+        if self.index_path.parent.name == CACHE_DIRNAME:
+            ensure_cache_dir(self.index_path.parent)
+        else:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"version": INDEX_VERSION, "files": self._files}
+        fd, tmp = tempfile.mkstemp(dir=self.index_path.parent, prefix=".symbol_index_")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f, separators=(",", ":"))
+            os.replace(tmp, self.index_path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    # ------------------------------------------------------------------
+    #  Building
+    # ------------------------------------------------------------------
+
+    def iter_source_files(self) -> Iterator[Tuple[str, str]]:
+        """Yield (relative_posix_path, absolute_path) for every .py file."""
+        for root, dirs, files in os.walk(self.base_dir):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS and not d.endswith(".egg-info")]
+            for name in files:
+                if name.endswith(".py"):
+                    full = os.path.join(root, name)
+                    rel = os.path.relpath(full, self.base_dir).replace(os.sep, "/")
+                    yield rel, full
+
+    def refresh(self, parallel: bool = True) -> Dict[str, int]:
+        """
+        Bring the index up to date with the files on disk and save it.
+        Returns counts of files that were parsed, unchanged or removed.
+        """
+        with self._lock:
+            if not self._loaded:
+                self.load()
+            seen = set()
+            to_parse: List[Tuple[str, str]] = []
+            touched = 0
+            for rel, full in self.iter_source_files():
+                seen.add(rel)
+                entry = self._files.get(rel)
+                try:
+                    st = os.stat(full)
+                except OSError:
+                    continue
+                if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+                    continue
+                if entry and entry["size"] == st.st_size:
+                    # mtime moved (checkout, touch); only re-parse if content changed.
+                    try:
+                        digest = hashlib.sha1(Path(full).read_bytes()).hexdigest()
+                    except OSError:
+                        continue
+                    if digest == entry["sha1"]:
+                        entry["mtime_ns"] = st.st_mtime_ns
+                        touched += 1
+                        continue
+                to_parse.append((rel, full))
+
+            removed = [rel for rel in self._files if rel not in seen]
+            for rel in removed:
+                del self._files[rel]
+
+            for rel, mtime_ns, size, digest, symbols in self._parse_all(to_parse, parallel):
+                self._files[rel] = {
+                    "mtime_ns": mtime_ns, "size": size, "sha1": digest,
+                    "symbols": symbols,
+                }
+
+            if to_parse or removed or touched or not self.index_path.exists():
+                self.save()
+            self._by_name = None
+            self._refreshed_at = time.monotonic()
+            return {
+                "parsed": len(to_parse),
+                "unchanged": len(seen) - len(to_parse),
+                "removed": len(removed),
+                "files": len(self._files),
+            }
+
+    def _parse_all(self, jobs: List[Tuple[str, str]], parallel: bool):
+        results = []
+        if parallel and len(jobs) >= PARALLEL_THRESHOLD:
+            try:
+                with ProcessPoolExecutor() as pool:
+                    for res in pool.map(_scan_file, jobs, chunksize=32):
+                        results.append(res)
+                return results
+            except (OSError, RuntimeError):
+                # No usable process pool (restricted sandbox, frozen app):
+                # fall through to the serial path.
+                results = []
+        for job in jobs:
+            try:
+                results.append(_scan_file(job))
+            except OSError:
+                continue
+        return results
+
+    # ------------------------------------------------------------------
+    #  Queries
+    # ------------------------------------------------------------------
+
+    def _name_map(self) -> Dict[str, List[Tuple[str, Symbol]]]:
+        if self._by_name is None:
+            by_name: Dict[str, List[Tuple[str, Symbol]]] = {}
+            for rel, entry in self._files.items():
+                for sym in entry["symbols"]:
+                    qualname = sym[0]
+                    by_name.setdefault(qualname, []).append((rel, sym))
+                    short = qualname.rsplit(".", 1)[-1]
+                    if short != qualname:
+                        by_name.setdefault(short, []).append((rel, sym))
+            self._by_name = by_name
+        return self._by_name
+
+    def lookup(self, name: str, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Return every definition matching `name`. A dotted name matches the
+        qualified name exactly (`Foo.bar`); a bare name matches top-level
+        definitions and methods alike. `kind` filters on
+        function/class/method.
+        """
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self.load()
+        hits = []
+        for rel, (qualname, sym_kind, start, end) in self._name_map().get(name, []):
+            if kind and sym_kind != kind:
+                continue
+            hits.append({"file": rel, "name": qualname, "kind": sym_kind,
+                         "start": start, "end": end})
+        hits.sort(key=lambda h: (h["file"], h["start"]))
+        return hits
+
+    def is_fresh(self, rel: str) -> bool:
+        """True if the indexed entry for `rel` still matches the file on disk."""
+        entry = self._files.get(rel)
+        if not entry:
+            return False
+        try:
+            st = os.stat(self.base_dir / rel)
+        except OSError:
+            return False
+        return entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size
+
+    def find(self, name: str, kind: Optional[str] = None,
+             max_age: float = REFRESH_INTERVAL) -> List[Dict[str, Any]]:
+        """
+        lookup() for interactive callers such as /symbols. The tree is
+        only rescanned when there is no match, a match is stale, or the
+        last rescan is older than `max_age` seconds (which is what picks
+        up new definitions of a name that already has fresh ones).
+        """
+        hits = self.lookup(name, kind)
+        if (not hits or not all(self.is_fresh(h["file"]) for h in hits)
+                or self._refreshed_at is None
+                or time.monotonic() - self._refreshed_at > max_age):
+            self.refresh()
+            hits = self.lookup(name, kind)
+        return hits
+
+    def find_unique(self, name: str, kind: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Resolve `name` to exactly one definition. The persisted index is
+        consulted first and only refreshed when the answer is missing,
+        ambiguous or stale, so repeated lookups don't rescan the tree.
+        Raises LookupError if there is no unique match.
+        """
+        hits = self.lookup(name, kind)
+        if len(hits) != 1 or not self.is_fresh(hits[0]["file"]):
+            self.refresh()
+            hits = self.lookup(name, kind)
+        if not hits:
+            raise LookupError(f"Symbol '{name}' not found under {self.base_dir}")
+        if len(hits) > 1:
+            where = ", ".join(f"{h['file']}:{h['start']}" for h in hits)
+            raise LookupError(f"Symbol '{name}' is ambiguous ({where}); specify `file:`")
+        return hits[0]
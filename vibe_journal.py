@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+vibe_journal.py
+
+Undo/redo journal of the edits the server writes.
+
+Each entry is one save (a single file, or every file of a preview
+session commit) recorded as line hunks: `[start_a, lines_a, start_b,
+lines_b]` replaces `lines_a` at `start_a` of the old text with `lines_b`,
+which sit at `start_b` of the new text. The same hunks read backwards are
+the inverse edit, so undo and redo cost the size of the change, not a
+copy of the file. The hunk is the changed line range of the save, found
+by trimming the lines the old and new text share at either end in one
+linear pass (no line diff, which is quadratic at worst).
+
+Every file also records its line count before and after (None: the file
+does not exist). An edit is only replayed if the file has that many
+lines and holds the hunk's lines where the edit left them; anything else
+means the file has diverged. Changes elsewhere in the file are kept.
+
+The journal is an append-only JSON-lines log (records plus undo/redo
+markers), replayed on load and written under an exclusive file lock, so
+`server.py --workers N` processes share one history. It keeps at most
+`max_entries` entries and `max_bytes` of hunks, dropping the oldest, and
+is rewritten without the dropped and abandoned entries once the log
+grows to twice that.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows; --workers needs os.fork() there anyway
+    fcntl = None
+
+DEFAULT_MAX_ENTRIES = 200
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+
+Hunk = List[Any]  # [start_a, lines_a, start_b, lines_b]
+Entry = Dict[str, Any]
+
+
+class Diverged(Exception):
+    """The file no longer holds the text a journaled edit applies to."""
+
+    def __init__(self, files: List[str]):
+        super().__init__(f"Changed since the edit was journaled: {', '.join(files)}")
+        self.files = files
+
+
+def text_hash(text: Optional[str]) -> Optional[str]:
+    return None if text is None else hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _line_count(lines: Optional[List[str]]) -> Optional[int]:
+    return None if lines is None else len(lines)
+
+
+def changed_span(a: List[str], b: List[str]) -> Tuple[int, int, int]:
+    """(start, end_a, end_b): `a[start:end_a]` became `b[start:end_b]`."""
+    n = min(len(a), len(b))
+    start = 0
+    while start < n and a[start] == b[start]:
+        start += 1
+    tail = 0
+    while tail < n - start and a[-1 - tail] == b[-1 - tail]:
+        tail += 1
+    return start, len(a) - tail, len(b) - tail
+
+
+def file_edit(rel_path: str, old: Optional[str], new: Optional[str]) -> Dict[str, Any]:
+    """The journal record turning `old` into `new` (None: the file doesn't exist)."""
+    a = [] if old is None else old.splitlines(keepends=True)
+    b = [] if new is None else new.splitlines(keepends=True)
+    start, end_a, end_b = changed_span(a, b)
+    hunks = [[start, a[start:end_a], start, b[start:end_b]]] if a[start:end_a] != b[start:end_b] else []
+    return {"file": rel_path, "before": None if old is None else len(a),
+            "after": None if new is None else len(b), "hunks": hunks}
+
+
+def _unchanged(edit: Dict[str, Any]) -> bool:
+    return not edit["hunks"] and edit["before"] == edit["after"]
+
+
+def apply_edit(edit: Dict[str, Any], text: Optional[str], inverse: bool = False) -> Optional[str]:
+    """
+    `text` with `edit` (or its inverse) applied; None when that leaves the
+    file not existing. Raises Diverged unless `text` has the edit's line
+    count and holds the lines the edit replaces.
+    """
+    expected, result = (edit["after"], edit["before"]) if inverse else (edit["before"], edit["after"])
+    lines = None if text is None else text.splitlines(keepends=True)
+    if isinstance(expected, str):
+        # Journals written before line counts recorded whole-file hashes.
+        matches = text_hash(text) == expected
+    else:
+        replaced = [(h[2], h[3]) if inverse else (h[0], h[1]) for h in edit["hunks"]]
+        matches = _line_count(lines) == expected and all(
+            (lines or [])[start:start + len(old)] == old for start, old in replaced)
+    if not matches:
+        raise Diverged([edit["file"]])
+    if result is None:
+        return None
+    lines = lines or []
+    # Back to front, so earlier positions stay valid.
+    for start_a, lines_a, start_b, lines_b in reversed(edit["hunks"]):
+        start, old, new = (start_b, lines_b, lines_a) if inverse else (start_a, lines_a, lines_b)
+        lines[start:start + len(old)] = new
+    return "".join(lines)
+
+
+def _entry_bytes(entry: Entry) -> int:
+    return sum(len(line) for edit in entry["files"] for hunk in edit["hunks"]
+               for line in hunk[1] + hunk[3])
+
+
+class EditJournal:
+    """Bounded undo/redo history, persisted as an append-only log at `path`."""
+
+    def __init__(self, path: Path, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: List[Entry] = []
+        self._cursor = 0  # entries before the cursor are applied, after it undone
+        self._next_id = 1
+        self._log_lines = 0
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._lock = threading.RLock()
+        self._lock_path = self.path.with_name(self.path.name + ".lock")
+        self.stats = {"recorded": 0, "undone": 0, "redone": 0, "diverged": 0,
+                      "dropped": 0, "compactions": 0}
+
+    # -- persistence ---------------------------------------------------
+
+    @contextmanager
+    def _locked(self):
+        """This process's lock and, across processes, the log's file lock."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._lock_path, "a") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _sync(self) -> None:
+        """Replay the log if another process (or nobody yet) has read it."""
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return
+        self._entries, self._cursor, self._log_lines = [], 0, 0
+        if stamp is not None:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        op = json.loads(line)
+                    except ValueError:
+                        continue  # a torn final line from a crash
+                    self._log_lines += 1
+                    self._replay(op)
+        self._next_id = max((e["id"] for e in self._entries), default=0) + 1
+        self._stamp = stamp
+
+    def _replay(self, op: Dict[str, Any]) -> None:
+        kind = op.get("op")
+        if kind == "record":
+            self._push(op["entry"])
+        elif kind == "undo" and self._cursor > 0:
+            self._cursor -= 1
+        elif kind == "redo" and self._cursor < len(self._entries):
+            self._cursor += 1
+        elif kind == "state":
+            self._cursor = min(op["cursor"], len(self._entries))
+
+    def _push(self, entry: Entry) -> None:
+        # A new edit abandons whatever had been undone.
+        del self._entries[self._cursor:]
+        self._entries.append(entry)
+        total = sum(_entry_bytes(e) for e in self._entries)
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries
+                                          or total > self.max_bytes):
+            total -= _entry_bytes(self._entries.pop(0))
+            self.stats["dropped"] += 1
+        self._cursor = len(self._entries)
+
+    def _append(self, op: Dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(op) + "\n")
+        self._log_lines += 1
+        if self._log_lines > 2 * self.max_entries or (
+                self._file_stamp() or (0, 0))[1] > 2 * self.max_bytes:
+            self._compact()
+        self._stamp = self._file_stamp()
+
+    def _compact(self) -> None:
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for entry in self._entries:
+                f.write(json.dumps({"op": "record", "entry": entry}) + "\n")
+            f.write(json.dumps({"op": "state", "cursor": self._cursor}) + "\n")
+        os.replace(tmp, self.path)
+        self._log_lines = len(self._entries) + 1
+        self.stats["compactions"] += 1
+
+    # -- operations ----------------------------------------------------
+
+    def record(self, label: str, edits: List[Dict[str, Any]]) -> Optional[Entry]:
+        """Journal one save of the files in `edits` (from file_edit())."""
+        edits = [e for e in edits if not _unchanged(e)]
+        if not edits:
+            return None
+        with self._locked():
+            self._sync()
+            entry = {"id": self._next_id, "time": time.time(), "label": label, "files": edits}
+            self._next_id += 1
+            self._push(entry)
+            self._append({"op": "record", "entry": entry})
+            self.stats["recorded"] += 1
+            return entry
+
+    def undo(self, read, write) -> Optional[Entry]:
+        """Undo the latest applied entry; see _step()."""
+        return self._step(read, write, inverse=True)
+
+    def redo(self, read, write) -> Optional[Entry]:
+        return self._step(read, write, inverse=False)
+
+    def _step(self, read, write, inverse: bool) -> Optional[Entry]:
+        """
+        Apply the next entry in the given direction through `read(rel)`
+        (current text or None) and `write(rel, text or None)`. Returns the
+        entry, or None if there is nothing to undo/redo. Raises Diverged,
+        before writing anything, if any of its files has changed since.
+        """
+        with self._locked():
+            self._sync()
+            index = self._cursor - 1 if inverse else self._cursor
+            if not 0 <= index < len(self._entries):
+                return None
+            entry = self._entries[index]
+            results, diverged = [], []
+            for edit in entry["files"]:
+                try:
+                    results.append((edit["file"], apply_edit(edit, read(edit["file"]), inverse)))
+                except Diverged:
+                    diverged.append(edit["file"])
+            if diverged:
+                self.stats["diverged"] += 1
+                raise Diverged(diverged)
+            for rel_path, text in results:
+                write(rel_path, text)
+            self._cursor += -1 if inverse else 1
+            self._append({"op": "undo" if inverse else "redo"})
+            self.stats["undone" if inverse else "redone"] += 1
+            return entry
+
+    def history(self) -> Dict[str, Any]:
+        """Entry summaries, oldest first, and how many are currently applied."""
+        with self._locked():
+            self._sync()
+            entries = [{"id": e["id"], "time": e["time"], "label": e["label"],
+                        "files": [edit["file"] for edit in e["files"]],
+                        "applied": i < self._cursor}
+                       for i, e in enumerate(self._entries)]
+            return {"entries": entries, "can_undo": self._cursor > 0,
+                    "can_redo": self._cursor < len(self._entries)}
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            m = dict(self.stats)
+            m["entries"] = len(self._entries)
+            m["bytes"] = sum(_entry_bytes(e) for e in self._entries)
+        return m
@@ -0,0 +1,703 @@
+#!/usr/bin/env python3
+"""
+vibe_llm.py
+
+Shared plumbing for the LLM-backed routes in server.py.
+
+ResponseCache
+    Persistent cache of generated patches, keyed by provider, model,
+    system prompt version, user prompt and a hash of the file content that
+    was sent. Stored in SQLite so it survives restarts; evicts by age and
+    total size.
+
+PatchStreamParser
+    Incremental parser for streamed model output. Emits each patch section
+    as soon as it is complete and validated, and flags output that can no
+    longer turn into a valid bundle so generation can be cancelled early.
+
+SingleFlight
+    Coalesces identical in-flight generations: concurrent requests with
+    the same cache key wait on one upstream call and share its result.
+
+GenerationPool
+    Dedicated, bounded thread pool for provider calls, with per-request
+    deadlines and cancellation of abandoned streams, so slow generations
+    never occupy the threads that serve interactive routes.
+
+HedgePolicy / hedged_call
+    Tail-latency hedging: if the primary provider is slower than its
+    recent latency percentile, ask a secondary provider too and keep the
+    first valid answer.
+
+AdaptiveLimiter
+    Concurrency limit for batch jobs that backs off when the provider
+    rate-limits us and recovers as calls succeed.
+"""
+import hashlib
+import json
+import queue
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures import wait as wait_futures
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import vibe_cli
+
+DEFAULT_CACHE_TTL = 7 * 24 * 3600       # seconds
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_LLM_TIMEOUT = 120               # seconds
+DEFAULT_LLM_WORKERS = 4
+DEFAULT_HEDGE_PERCENTILE = 95
+DEFAULT_HEDGE_DELAY_MS = 8000           # until enough latencies are recorded
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    SQLite-backed LLM response cache with age- and size-based eviction.
+
+    Entries older than `ttl` seconds are never returned. When the stored
+    responses exceed `max_bytes`, the least recently used entries are
+    dropped first. Safe to share between threads (and, being a file,
+    between processes).
+    """
+
+    def __init__(self, path: Path, ttl: int = DEFAULT_CACHE_TTL,
+                 max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.stats = {"hits": 0, "misses": 0, "bypassed": 0, "stores": 0,
+                      "evictions": 0, "hit_ms_total": 0.0}
+
+    @staticmethod
+    def make_key(provider: str, model: str, system_prompt_version: str,
+                 prompt: str, sent_content_hash: str, mode: str = "") -> str:
+        raw = json.dumps([provider, model, system_prompt_version, prompt, sent_content_hash]
+                         + ([mode] if mode else []))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, provider TEXT, model TEXT, body TEXT,"
+                " size INTEGER, created REAL, accessed REAL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        t0 = time.perf_counter()
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            row = db.execute("SELECT body, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                self.stats["misses"] += 1
+                return None
+            db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            db.commit()
+            self.stats["hits"] += 1
+            self.stats["hit_ms_total"] += (time.perf_counter() - t0) * 1000
+        return json.loads(row[0])
+
+    def put(self, key: str, provider: str, model: str, value: Dict[str, Any]) -> None:
+        body = json.dumps(value)
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO responses (key, provider, model, body, size, created, accessed)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, provider, model, body, len(body), now, now))
+            self.stats["stores"] += 1
+            self._evict(db, now)
+            db.commit()
+
+    def record_bypass(self) -> None:
+        with self._lock:
+            self.stats["bypassed"] += 1
+
+    def _evict(self, db: sqlite3.Connection, now: float) -> None:
+        expired = db.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,)).rowcount
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        dropped = 0
+        if total > self.max_bytes:
+            for key, size in db.execute(
+                    "SELECT key, size FROM responses ORDER BY accessed ASC").fetchall():
+                if total <= self.max_bytes:
+                    break
+                db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                total -= size
+                dropped += 1
+        self.stats["evictions"] += max(expired, 0) + dropped
+
+    def clear(self) -> None:
+        with self._lock:
+            db = self._db()
+            db.execute("DELETE FROM responses")
+            db.commit()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            s = dict(self.stats)
+            try:
+                entries, size = self._db().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            except sqlite3.Error:
+                entries, size = None, None
+        lookups = s["hits"] + s["misses"]
+        return {
+            "hits": s["hits"], "misses": s["misses"], "bypassed": s["bypassed"],
+            "stores": s["stores"], "evictions": s["evictions"],
+            "hit_rate": round(s["hits"] / lookups, 4) if lookups else 0.0,
+            "avg_hit_ms": round(s["hit_ms_total"] / s["hits"], 3) if s["hits"] else 0.0,
+            "entries": entries, "bytes": size,
+            "ttl_seconds": self.ttl, "max_bytes": self.max_bytes,
+        }
+
+
+class PatchStreamParser:
+    """
+    Feed streamed model output with `feed()`; each call returns the list
+    of events made available by that chunk:
+
+        ("patch", {"index": i, "meta": {...}, "code": "..."})
+        ("error", {"message": "..."})
+
+    A section is complete once the next `patch_type:` line (or the closing
+    code fence, or the end of the stream) arrives. After an error, or once
+    the closing fence has been seen, `finished` is True and the caller
+    should stop consuming the provider stream.
+    """
+
+    # Prose allowed before the first patch section before we give up.
+    MAX_PREAMBLE_CHARS = 2000
+
+    def __init__(self, validate: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.validate = validate or vibe_cli.validate_spec
+        self.text = ""            # everything received so far
+        self._pending = ""        # incomplete trailing line
+        self._header: List[str] = []
+        self._section: List[str] = []
+        self._body_lines: List[str] = []  # completed sections
+        self._in_fence = False
+        self._preamble_chars = 0
+        self.patches: List[Tuple[Dict[str, Any], str]] = []
+        self.finished = False
+        self.failed = False
+        self.error: Optional[str] = None
+
+    @property
+    def patch_text(self) -> str:
+        """The bundle text received so far, without markdown fences."""
+        return "\n".join(self._header + self._body_lines).strip()
+
+    def feed(self, chunk: str) -> List[Tuple[str, Dict[str, Any]]]:
+        if self.finished or not chunk:
+            return []
+        self.text += chunk
+        data = self._pending + chunk
+        lines = data.split("\n")
+        self._pending = lines.pop()
+        events: List[Tuple[str, Dict[str, Any]]] = []
+        for line in lines:
+            events.extend(self._line(line))
+            if self.finished:
+                break
+        return events
+
+    def close(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Signal end of stream; flushes the last section."""
+        events: List[Tuple[str, Dict[str, Any]]] = []
+        if not self.finished and self._pending:
+            events.extend(self._line(self._pending))
+            self._pending = ""
+        if not self.finished:
+            events.extend(self._complete_section())
+            if not self.patches and not self.failed:
+                events.extend(self._fail("Model output contained no patch sections."))
+            self.finished = True
+        return events
+
+    # -- internals -------------------------------------------------------
+
+    def _line(self, line: str) -> List[Tuple[str, Dict[str, Any]]]:
+        stripped = line.strip()
+        # Only unindented fences count; code blocks are always indented.
+        if line.startswith("```"):
+            if not self._in_fence and not self._section and not self.patches:
+                self._in_fence = True          # opening ```yaml fence
+                return []
+            # Closing fence: anything after it is commentary we don't need.
+            events = self._complete_section()
+            self.finished = True
+            return events
+        if line.startswith("patch_type:"):
+            events = self._complete_section()
+            self._section = [line]
+            return events
+        if self._section:
+            self._section.append(line)
+            return []
+        # Before the first section: header, comments and blank lines only.
+        if re.match(r"^#\s*VibeSpec:", stripped) or not stripped or stripped.startswith("#"):
+            self._header.append(line)
+            return []
+        self._preamble_chars += len(line) + 1
+        if self._preamble_chars > self.MAX_PREAMBLE_CHARS:
+            return self._fail("Model output does not look like a Vibe Patch (no patch_type: found).")
+        return []
+
+    def _complete_section(self) -> List[Tuple[str, Dict[str, Any]]]:
+        if not self._section:
+            return []
+        section, self._section = self._section, []
+        self._body_lines.extend(section)
+        try:
+            parsed = vibe_cli.parse_patches("\n".join(self._header + section))
+            if len(parsed) != 1:
+                raise ValueError(f"expected one patch section, parsed {len(parsed)}")
+            meta, code = parsed[0]
+            self.validate(meta)
+        except Exception as e:
+            return self._fail(f"Patch {len(self.patches) + 1} is invalid: {e}")
+        self.patches.append((meta, code))
+        return [("patch", {"index": len(self.patches) - 1, "meta": meta, "code": code})]
+
+    def _fail(self, message: str) -> List[Tuple[str, Dict[str, Any]]]:
+        self.failed = True
+        self.finished = True
+        self.error = message
+        return [("error", {"message": message})]
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+    def wait(self, timeout: Optional[float] = None) -> Any:
+        if not self.done.wait(timeout):
+            raise TimeoutError("Timed out waiting for an identical in-flight generation.")
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class SingleFlight:
+    """
+    Per-key call coalescing. The first caller for a key (the leader) does
+    the work; callers arriving while it runs wait for and share its result
+    or exception. Nothing is remembered once the call finishes; that is the
+    response cache's job.
+
+        flight, leader = sf.acquire(key)
+        if leader:
+            try:
+                result = work()
+            except Exception as e:
+                sf.resolve(key, flight, error=e); raise
+            sf.resolve(key, flight, result=result)
+        else:
+            result = flight.wait(timeout)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self.stats = {"leaders": 0, "coalesced": 0}
+
+    def acquire(self, key: str) -> Tuple[_Flight, bool]:
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.waiters += 1
+                self.stats["coalesced"] += 1
+                return flight, False
+            flight = self._flights[key] = _Flight()
+            self.stats["leaders"] += 1
+            return flight, True
+
+    def resolve(self, key: str, flight: _Flight, result: Any = None,
+                error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        flight.result, flight.error = result, error
+        flight.done.set()
+
+    def do(self, key: str, fn: Callable[[], Any],
+           timeout: Optional[float] = None) -> Tuple[Any, bool]:
+        """Run `fn` once per concurrent `key`; returns (result, coalesced)."""
+        flight, leader = self.acquire(key)
+        if not leader:
+            return flight.wait(timeout), True
+        try:
+            result = fn()
+        except BaseException as e:
+            self.resolve(key, flight, error=e)
+            raise
+        self.resolve(key, flight, result=result)
+        return result, False
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            s = dict(self.stats)
+            s["in_flight"] = len(self._flights)
+        total = s["leaders"] + s["coalesced"]
+        s["coalesced_rate"] = round(s["coalesced"] / total, 4) if total else 0.0
+        return s
+
+
+class GenerationTimeout(Exception):
+    """A provider call did not finish within its deadline."""
+
+
+class GenerationBusy(Exception):
+    """Too many generations queued; the caller should retry later."""
+
+
+class GenerationPool:
+    """
+    Runs provider calls on `workers` dedicated threads.
+
+    At most `workers * 2` calls may be running or queued; beyond that
+    `call()`/`stream()` raise GenerationBusy immediately instead of tying
+    up another request thread. Each call has a deadline (`timeout`
+    seconds). When the consumer of a stream goes away or the deadline
+    passes, the caller gets its error at once, but the worker thread can
+    only stop between chunks: it closes the provider's iterator after the
+    next chunk arrives, or when the SDK's own (read) timeout fires. Until
+    then it still counts against `max_pending`.
+    """
+
+    def __init__(self, workers: int = DEFAULT_LLM_WORKERS,
+                 timeout: float = DEFAULT_LLM_TIMEOUT):
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.max_pending = self.workers * 2
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="llm")
+        self._lock = threading.Lock()
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "timeouts": 0,
+                      "cancelled": 0, "rejected": 0, "pending": 0}
+
+    def _count(self, key: str, delta: int = 1) -> None:
+        with self._lock:
+            self.stats[key] += delta
+
+    def _submit(self, fn: Callable[[], Any]):
+        with self._lock:
+            if self.stats["pending"] >= self.max_pending:
+                self.stats["rejected"] += 1
+                raise GenerationBusy(
+                    f"{self.stats['pending']} generations already in flight; try again shortly.")
+            self.stats["pending"] += 1
+            self.stats["submitted"] += 1
+
+        def run():
+            try:
+                return fn()
+            finally:
+                self._count("pending", -1)
+        return self._executor.submit(run)
+
+    def submit(self, fn: Callable[[], Any]):
+        """Queue `fn` and return its Future; the caller handles deadlines."""
+        future = self._submit(fn)
+
+        def count(f):
+            if f.cancelled() or isinstance(f.exception(), HedgeCancelled):
+                self._count("cancelled")
+            else:
+                self._count("failed" if f.exception() else "completed")
+        future.add_done_callback(count)
+        return future
+
+    def call(self, fn: Callable[..., Any], *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Run `fn(*args, **kwargs)` on the pool and wait for its result. On
+        timeout a queued call is cancelled, but one already running keeps
+        its thread until it returns; use stream() for calls that must stop.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        future = self._submit(lambda: fn(*args, **kwargs))
+        try:
+            result = future.result(timeout=timeout)
+        except FutureTimeout:
+            future.cancel()
+            self._count("timeouts")
+            raise GenerationTimeout(f"Provider did not answer within {timeout:g} s.")
+        except Exception:
+            self._count("failed")
+            raise
+        self._count("completed")
+        return result
+
+    def stream(self, make_iter: Callable[[], Iterator[str]],
+               timeout: Optional[float] = None) -> Iterator[str]:
+        """
+        Pull `make_iter()` on the pool and return a generator of its items.
+        Closing the returned generator (e.g. because the HTTP client
+        disconnected) or passing the deadline cancels the upstream
+        iterator: a queued stream never starts, and a running one is
+        closed when its next chunk (or the SDK's read timeout) arrives.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        items: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+        cancel = threading.Event()
+
+        def pump():
+            if cancel.is_set():
+                return
+            it = make_iter()
+            try:
+                for item in it:
+                    if cancel.is_set():
+                        return
+                    items.put(("item", item))
+                items.put(("end", None))
+            except BaseException as e:
+                items.put(("error", e))
+            finally:
+                close = getattr(it, "close", None)
+                if close:
+                    close()
+
+        self._submit(pump)
+        return self._drain(items, cancel, deadline, timeout)
+
+    def _drain(self, items, cancel, deadline, timeout):
+        outcome = "cancelled"
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining <= 0:
+                        raise queue.Empty
+                    kind, value = items.get(timeout=remaining)
+                except queue.Empty:
+                    outcome = "timeouts"
+                    raise GenerationTimeout(f"Provider did not finish within {timeout:g} s.")
+                if kind == "item":
+                    yield value
+                elif kind == "end":
+                    outcome = "completed"
+                    return
+                else:
+                    outcome = "failed"
+                    raise value
+        finally:
+            cancel.set()
+            self._count(outcome)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            s = dict(self.stats)
+        s.update({"workers": self.workers, "max_pending": self.max_pending,
+                  "timeout_seconds": self.timeout})
+        return s
+
+
+class HedgeCancelled(Exception):
+    """Raised inside a hedged arm once the other arm has won."""
+
+
+class HedgePolicy:
+    """
+    Tracks per-provider generation latency and decides how long to wait
+    for the primary before hedging: the `percentile` of the last `window`
+    calls, or `default_delay_ms` until `min_samples` exist. Calls that
+    were cancelled (they lost a hedge or hit the deadline) count with
+    their elapsed time, a lower bound; leaving them out would drop exactly
+    the slow tail and let the delay drift down. Also counts which
+    provider won hedged requests.
+    """
+
+    def __init__(self, percentile: float = DEFAULT_HEDGE_PERCENTILE,
+                 default_delay_ms: float = DEFAULT_HEDGE_DELAY_MS,
+                 min_samples: int = 20, window: int = 200):
+        self.percentile = percentile
+        self.default_delay_ms = default_delay_ms
+        self.min_samples = min_samples
+        self.window = window
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, deque] = {}
+        self.stats = {"requests": 0, "hedged": 0, "failed": 0, "censored": 0, "wins": {}}
+
+    def record_latency(self, provider: str, ms: float, censored: bool = False) -> None:
+        """`censored`: the call was cancelled after `ms`, so it would have taken longer."""
+        with self._lock:
+            self._latencies.setdefault(provider, deque(maxlen=self.window)).append(ms)
+            self.stats["censored"] += int(censored)
+
+    def _percentile(self, samples, pct: float) -> float:
+        ordered = sorted(samples)
+        idx = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+        return ordered[idx]
+
+    def delay_ms(self, provider: str) -> float:
+        with self._lock:
+            samples = list(self._latencies.get(provider, ()))
+        if len(samples) < self.min_samples:
+            return self.default_delay_ms
+        return self._percentile(samples, self.percentile)
+
+    def record_outcome(self, winner: Optional[str], hedged: bool) -> None:
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["hedged"] += int(hedged)
+            if winner is None:
+                self.stats["failed"] += 1
+            else:
+                self.stats["wins"][winner] = self.stats["wins"].get(winner, 0) + 1
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            s = {"requests": self.stats["requests"], "hedged": self.stats["hedged"],
+                 "failed": self.stats["failed"], "censored": self.stats["censored"],
+                 "wins": dict(self.stats["wins"])}
+            latencies = {name: list(v) for name, v in self._latencies.items()}
+        s["hedge_rate"] = round(s["hedged"] / s["requests"], 4) if s["requests"] else 0.0
+        s["percentile"] = self.percentile
+        s["providers"] = {
+            name: {"samples": len(v),
+                   "p50_ms": round(self._percentile(v, 50), 1) if v else None,
+                   f"p{self.percentile:g}_ms": round(self._percentile(v, self.percentile), 1) if v else None,
+                   "hedge_delay_ms": round(self.delay_ms(name), 1)}
+            for name, v in latencies.items()}
+        return s
+
+
+def hedged_call(pool: GenerationPool,
+                arms: List[Tuple[str, Callable[[threading.Event], Any]]],
+                delay: float, accept: Callable[[Any], None],
+                timeout: float,
+                on_cancel: Optional[Callable[[str, float], None]] = None) -> Tuple[str, Any, bool]:
+    """
+    Run arms[0] on `pool`; if it has no accepted answer after `delay`
+    seconds (or fails sooner), also start the next arm, and so on. Each
+    arm is called with a cancel Event it must honour (e.g. by closing its
+    provider stream). The first result for which `accept(result)` does not
+    raise wins and the other arms are cancelled; `on_cancel(name, ms)` is
+    called for each with how long it had been running.
+
+    Returns (arm name, result, hedged). Raises GenerationTimeout, or
+    ValueError carrying every arm's error if none produced a valid answer.
+    """
+    deadline = time.monotonic() + timeout
+    cancels = {name: threading.Event() for name, _ in arms}
+    running: Dict[Any, str] = {}
+    started: Dict[str, float] = {}
+    errors: List[str] = []
+    launched = 0
+
+    def launch():
+        nonlocal launched
+        name, fn = arms[launched]
+        started[name] = time.monotonic()
+        running[pool.submit(lambda: fn(cancels[name]))] = name
+        launched += 1
+
+    launch()
+    try:
+        while running or launched < len(arms):
+            if not running:
+                launch()            # every running arm failed: hedge now
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise GenerationTimeout(f"No provider answered within {timeout:g} s.")
+            wait_for = min(remaining, delay) if launched < len(arms) else remaining
+            done, _ = wait_futures(list(running), timeout=wait_for, return_when=FIRST_COMPLETED)
+            if not done:
+                if launched < len(arms):
+                    launch()
+                continue
+            for future in done:
+                name = running.pop(future)
+                try:
+                    result = future.result()
+                    accept(result)
+                except Exception as e:
+                    errors.append(f"{name}: {e}")
+                    continue
+                return name, result, launched > 1
+        raise ValueError("No provider produced a valid patch. " + "; ".join(errors))
+    finally:
+        for event in cancels.values():
+            event.set()
+        for future, name in running.items():
+            future.cancel()
+            if on_cancel is not None:
+                on_cancel(name, (time.monotonic() - started[name]) * 1000)
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit: at most `limit` holders at a time; a
+    rate-limited release halves the limit and pauses new acquisitions
+    (for `retry_after`, or an exponentially growing delay), and every
+    `recover_after` clean releases raise it by one, up to `max_limit`.
+    """
+
+    def __init__(self, max_limit: int, recover_after: int = 4,
+                 base_delay: float = 1.0, max_delay: float = 60.0):
+        self.max_limit = max(1, max_limit)
+        self.limit = self.max_limit
+        self.recover_after = recover_after
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._active = 0
+        self._streak = 0
+        self._backoffs = 0
+        self._pause_until = 0.0
+        self._cond = threading.Condition()
+        self.stats = {"rate_limited": 0, "min_limit": self.max_limit}
+
+    def acquire(self) -> None:
+        with self._cond:
+            while True:
+                wait = self._pause_until - time.monotonic()
+                if wait <= 0 and self._active < self.limit:
+                    self._active += 1
+                    return
+                self._cond.wait(timeout=wait if wait > 0 else None)
+
+    def release(self, rate_limited: bool = False, retry_after: Optional[float] = None) -> None:
+        with self._cond:
+            self._active -= 1
+            if rate_limited:
+                self.stats["rate_limited"] += 1
+                self._streak = 0
+                self.limit = max(1, self.limit // 2)
+                self.stats["min_limit"] = min(self.stats["min_limit"], self.limit)
+                delay = retry_after or min(self.max_delay, self.base_delay * 2 ** self._backoffs)
+                self._backoffs += 1
+                self._pause_until = max(self._pause_until, time.monotonic() + delay)
+            else:
+                self._backoffs = 0
+                self._streak += 1
+                if self._streak >= self.recover_after and self.limit < self.max_limit:
+                    self.limit += 1
+                    self._streak = 0
+            self._cond.notify_all()
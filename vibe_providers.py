@@ -0,0 +1,563 @@
+#!/usr/bin/env python3
+"""
+vibe_providers.py
+
+Pluggable LLM provider adapters behind a registry.
+
+Each adapter creates its SDK client once (lazily, or eagerly via
+`ProviderRegistry.warm_up`) and reuses it for every request, so HTTP
+connection pools and TLS sessions survive between generations. SDKs are
+imported only when a provider is first used, so a missing package only
+disables that provider.
+
+Adding a provider means subclassing ProviderAdapter and registering an
+instance; server.py never branches on provider names.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# (index, text, error) — exactly one of text/error is set.
+BatchResult = Tuple[int, Optional[str], Optional[str]]
+DEFAULT_BATCH_POLL_SECONDS = 15
+
+
+class ProviderError(Exception):
+    """A provider cannot serve a request; `status` is the HTTP status to report."""
+
+    def __init__(self, message: str, status: int = 500):
+        super().__init__(message)
+        self.status = status
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    """True for provider "429 / quota exhausted" errors from any SDK."""
+    if getattr(exc, "status_code", None) == 429:
+        return True
+    return type(exc).__name__ in ("RateLimitError", "ResourceExhausted", "TooManyRequests")
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """The Retry-After hint attached to a provider error, if any."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class GenerationRequest:
+    """
+    Everything an adapter needs to produce a patch. The first
+    `prefix_chars` of `user_message` (the file context) are the same for
+    every prompt against that file, so adapters mark system prompt + that
+    prefix as cacheable where the provider supports prompt caching.
+    """
+
+    def __init__(self, system_prompt: str, user_message: str,
+                 filename: Optional[str] = None, prompt: Optional[str] = None,
+                 max_tokens: int = 3500, prefix_chars: int = 0):
+        self.system_prompt = system_prompt
+        self.user_message = user_message
+        self.filename = filename
+        self.prompt = prompt
+        self.max_tokens = max_tokens
+        self.prefix_chars = prefix_chars
+
+    def user_parts(self) -> Tuple[str, str]:
+        """(cacheable file prefix, per-request remainder) of user_message."""
+        return self.user_message[:self.prefix_chars], self.user_message[self.prefix_chars:]
+
+    def prefix_key(self) -> str:
+        """Short hash of system prompt + file prefix, for cache routing."""
+        prefix, _ = self.user_parts()
+        return hashlib.sha256((self.system_prompt + "\0" + prefix).encode("utf-8")).hexdigest()[:16]
+
+
+class PromptCacheStats:
+    """Provider-reported prompt-cache usage and latency, split by hit/miss."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "hits": 0, "input_tokens": 0,
+                      "cached_tokens": 0, "cache_write_tokens": 0}
+        self._latency = {"hit": [0, 0.0], "miss": [0, 0.0]}
+
+    def record(self, input_tokens: int, cached_tokens: int = 0,
+               cache_write_tokens: int = 0, latency_ms: Optional[float] = None) -> None:
+        """`input_tokens` is the total prompt size, cached part included."""
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["input_tokens"] += input_tokens or 0
+            self.stats["cached_tokens"] += cached_tokens or 0
+            self.stats["cache_write_tokens"] += cache_write_tokens or 0
+            hit = bool(cached_tokens)
+            if hit:
+                self.stats["hits"] += 1
+            if latency_ms is not None:
+                bucket = self._latency["hit" if hit else "miss"]
+                bucket[0] += 1
+                bucket[1] += latency_ms
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            m = dict(self.stats)
+            latency = {k: (round(total / n, 1) if n else None)
+                       for k, (n, total) in self._latency.items()}
+        m["hit_rate"] = round(m["hits"] / m["requests"], 4) if m["requests"] else 0.0
+        m["cached_token_ratio"] = (round(m["cached_tokens"] / m["input_tokens"], 4)
+                                   if m["input_tokens"] else 0.0)
+        m["avg_latency_ms_hit"] = latency["hit"]
+        m["avg_latency_ms_miss"] = latency["miss"]
+        return m
+
+
+class ProviderAdapter:
+    """Base class: one long-lived client per provider."""
+
+    name = ""
+    display_name = ""
+
+    def __init__(self, model: str, api_key: Optional[str] = None,
+                 timeout: Optional[float] = None, read_timeout: Optional[float] = None):
+        self.model = model
+        self.api_key = api_key
+        # SDK-level request timeout, so abandoned calls don't hold a
+        # worker thread forever. `read_timeout` bounds each wait for the
+        # next chunk of a stream: GenerationPool only stops a stream between
+        # chunks, so this is what frees a thread whose provider has stalled.
+        self.timeout = timeout
+        self.read_timeout = read_timeout
+        self._client = None
+        self._client_lock = threading.Lock()
+        self.prompt_cache = PromptCacheStats()
+
+    def configured(self) -> bool:
+        return bool(self.api_key)
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    try:
+                        self._client = self._create_client()
+                    except ImportError as e:
+                        raise ProviderError(f"{self.display_name} SDK not installed or found: {e}", 500)
+                    logging.info(f"{self.display_name} client initialized (model {self.model}).")
+        return self._client
+
+    def _create_client(self):
+        raise NotImplementedError
+
+    def _http_timeout(self):
+        """`timeout=` for httpx-based SDKs: the request timeout, with `read_timeout` per read."""
+        if self.timeout and self.read_timeout:
+            import httpx
+            return httpx.Timeout(self.timeout, read=min(self.timeout, self.read_timeout))
+        return self.timeout or self.read_timeout
+
+    def generate(self, req: GenerationRequest) -> str:
+        raise NotImplementedError
+
+    def stream(self, req: GenerationRequest) -> Iterator[str]:
+        """Default: no native streaming, yield the whole response once."""
+        yield self.generate(req)
+
+    def warm_up(self) -> None:
+        """Create the client and open a connection with a cheap call."""
+        self.client
+
+    def _record_usage(self, started: float, input_tokens: Optional[int],
+                      cached_tokens: Optional[int] = 0, cache_write_tokens: Optional[int] = 0) -> None:
+        if input_tokens is None:
+            return
+        latency_ms = (time.perf_counter() - started) * 1000
+        self.prompt_cache.record(input_tokens, cached_tokens or 0, cache_write_tokens or 0, latency_ms)
+        logging.info(f"{self.display_name} prompt cache: {cached_tokens or 0}/{input_tokens} input "
+                     f"tokens cached, {cache_write_tokens or 0} written, {latency_ms:.0f} ms.")
+
+    # Providers with an asynchronous batch API (cheaper, higher rate
+    # limits, results in minutes to hours) override batch_generate.
+    supports_batch = False
+
+    def batch_generate(self, reqs: List[GenerationRequest],
+                       poll_seconds: float = DEFAULT_BATCH_POLL_SECONDS,
+                       timeout: float = 24 * 3600) -> Iterator[BatchResult]:
+        """Submit `reqs` as one provider batch job; yield results by index."""
+        raise NotImplementedError(f"{self.display_name} has no batch API")
+
+    def _wait_for_batch(self, poll, done, poll_seconds: float, timeout: float):
+        deadline = time.monotonic() + timeout
+        job = poll()
+        while not done(job):
+            if time.monotonic() > deadline:
+                raise ProviderError(f"{self.display_name} batch job did not finish within {timeout:g} s.", 504)
+            time.sleep(poll_seconds)
+            job = poll()
+        return job
+
+
+class GeminiProvider(ProviderAdapter):
+    """
+    Gemini through google.generativeai.
+
+    Prompt caching here is implicit only: Gemini 2.x reuses repeated prompt
+    prefixes on its own, and putting the system prompt and file context
+    first is all this adapter does for it. Unlike Anthropic, there is no
+    explicit cache (no CachedContent is created), so hits are best-effort
+    and not guaranteed; `cached_tokens` in the metrics shows what Gemini
+    actually reused. The system prompt alone (about 2.5k tokens) is below
+    the minimum size explicit caches accept on some models, and a stored
+    cache is billed for as long as it lives.
+    """
+    name = "gemini"
+    display_name = "Gemini"
+
+    def _create_client(self):
+        import google.generativeai as genai
+        genai.configure(api_key=self.api_key)
+        return genai.GenerativeModel(self.model)
+
+    def _request_options(self) -> Dict[str, Any]:
+        # A deadline on the whole call, streamed or not, so a stalled
+        # stream ends by then at the latest.
+        return {"timeout": self.timeout} if self.timeout else {}
+
+    def _record_response_usage(self, started: float, response) -> None:
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            self._record_usage(started, getattr(usage, "prompt_token_count", None),
+                               getattr(usage, "cached_content_token_count", 0))
+
+    def generate(self, req: GenerationRequest) -> str:
+        started = time.perf_counter()
+        response = self.client.generate_content(
+            f"{req.system_prompt}\n\n{req.user_message}",
+            request_options=self._request_options())
+        self._record_response_usage(started, response)
+        return response.text
+
+    def stream(self, req: GenerationRequest) -> Iterator[str]:
+        started = time.perf_counter()
+        response = self.client.generate_content(
+            f"{req.system_prompt}\n\n{req.user_message}", stream=True,
+            request_options=self._request_options())
+        for chunk in response:
+            text = getattr(chunk, "text", "")
+            if text:
+                yield text
+        self._record_response_usage(started, response)
+
+    def warm_up(self) -> None:
+        import google.generativeai as genai
+        self.client
+        genai.get_model(f"models/{self.model}")
+
+
+class AnthropicProvider(ProviderAdapter):
+    name = "anthropic"
+    display_name = "Anthropic"
+
+    def _create_client(self):
+        from anthropic import Anthropic
+        timeout = self._http_timeout()
+        if timeout:
+            return Anthropic(api_key=self.api_key, timeout=timeout)
+        return Anthropic(api_key=self.api_key)
+
+    def _params(self, req: GenerationRequest) -> Dict[str, Any]:
+        """
+        Messages API parameters with prompt-cache breakpoints after the
+        system prompt and after the file context, so repeat prompts on a
+        file (and repair re-prompts) only pay for the request text.
+        Prefixes under the model's minimum cacheable size are simply not
+        cached.
+        """
+        prefix, rest = req.user_parts()
+        content = []
+        if prefix:
+            content.append({"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}})
+        if rest or not prefix:
+            content.append({"type": "text", "text": rest})
+        return {"model": self.model, "max_tokens": req.max_tokens,
+                "system": [{"type": "text", "text": req.system_prompt,
+                            "cache_control": {"type": "ephemeral"}}],
+                "messages": [{"role": "user", "content": content}]}
+
+    def _record_message_usage(self, started: float, message) -> None:
+        usage = getattr(message, "usage", None)
+        if usage is None:
+            return
+        read = getattr(usage, "cache_read_input_tokens", 0) or 0
+        written = getattr(usage, "cache_creation_input_tokens", 0) or 0
+        # input_tokens counts only the uncached tail of the prompt.
+        self._record_usage(started, (usage.input_tokens or 0) + read + written, read, written)
+
+    def generate(self, req: GenerationRequest) -> str:
+        started = time.perf_counter()
+        message = self.client.messages.create(**self._params(req))
+        self._record_message_usage(started, message)
+        return message.content[0].text
+
+    supports_batch = True
+
+    def batch_generate(self, reqs: List[GenerationRequest],
+                       poll_seconds: float = DEFAULT_BATCH_POLL_SECONDS,
+                       timeout: float = 24 * 3600) -> Iterator[BatchResult]:
+        batches = self.client.messages.batches
+        job = batches.create(requests=[
+            {"custom_id": str(i), "params": self._params(req)}
+            for i, req in enumerate(reqs)])
+        logging.info(f"Anthropic batch {job.id} submitted ({len(reqs)} requests).")
+        try:
+            self._wait_for_batch(lambda: batches.retrieve(job.id),
+                                 lambda b: b.processing_status == "ended", poll_seconds, timeout)
+        except BaseException:
+            batches.cancel(job.id)
+            raise
+        for item in batches.results(job.id):
+            result = item.result
+            if result.type == "succeeded":
+                yield int(item.custom_id), result.message.content[0].text, None
+            else:
+                yield int(item.custom_id), None, f"{result.type}: {getattr(result, 'error', '')}"
+
+    def stream(self, req: GenerationRequest) -> Iterator[str]:
+        started = time.perf_counter()
+        with self.client.messages.stream(**self._params(req)) as stream:
+            for text in stream.text_stream:
+                yield text
+            self._record_message_usage(started, stream.get_final_message())
+
+    def warm_up(self) -> None:
+        self.client.models.list(limit=1)
+
+
+class OpenAIProvider(ProviderAdapter):
+    name = "openai"
+    display_name = "OpenAI"
+
+    def _create_client(self):
+        from openai import OpenAI
+        timeout = self._http_timeout()
+        if timeout:
+            return OpenAI(api_key=self.api_key, timeout=timeout)
+        return OpenAI(api_key=self.api_key)
+
+    def _messages(self, req: GenerationRequest) -> List[Dict[str, str]]:
+        return [{"role": "system", "content": req.system_prompt},
+                {"role": "user", "content": req.user_message}]
+
+    def _cache_options(self, req: GenerationRequest) -> Dict[str, Any]:
+        # OpenAI caches prompt prefixes automatically; the key routes
+        # requests for the same file to the same cache even though every
+        # prompt starts with the same system message.
+        return {"extra_body": {"prompt_cache_key": f"vibe-{req.prefix_key()}"}}
+
+    def _record_completion_usage(self, started: float, usage) -> None:
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        self._record_usage(started, usage.prompt_tokens, getattr(details, "cached_tokens", 0))
+
+    def generate(self, req: GenerationRequest) -> str:
+        started = time.perf_counter()
+        completion = self.client.chat.completions.create(
+            model=self.model, messages=self._messages(req), **self._cache_options(req))
+        self._record_completion_usage(started, getattr(completion, "usage", None))
+        return completion.choices[0].message.content
+
+    supports_batch = True
+
+    def batch_generate(self, reqs: List[GenerationRequest],
+                       poll_seconds: float = DEFAULT_BATCH_POLL_SECONDS,
+                       timeout: float = 24 * 3600) -> Iterator[BatchResult]:
+        lines = [json.dumps({"custom_id": str(i), "method": "POST", "url": "/v1/chat/completions",
+                             "body": {"model": self.model, "messages": self._messages(req),
+                                      "prompt_cache_key": f"vibe-{req.prefix_key()}"}})
+                 for i, req in enumerate(reqs)]
+        upload = self.client.files.create(
+            file=("vibe_batch.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch")
+        job = self.client.batches.create(input_file_id=upload.id, endpoint="/v1/chat/completions",
+                                         completion_window="24h")
+        logging.info(f"OpenAI batch {job.id} submitted ({len(reqs)} requests).")
+        try:
+            job = self._wait_for_batch(
+                lambda: self.client.batches.retrieve(job.id),
+                lambda b: b.status in ("completed", "failed", "expired", "cancelled"),
+                poll_seconds, timeout)
+        except BaseException:
+            self.client.batches.cancel(job.id)
+            raise
+        seen = set()
+        if job.output_file_id:
+            for line in self.client.files.content(job.output_file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                index = int(item["custom_id"])
+                seen.add(index)
+                response = item.get("response") or {}
+                if item.get("error") or response.get("status_code") != 200:
+                    yield index, None, str(item.get("error") or response.get("body"))
+                else:
+                    yield index, response["body"]["choices"][0]["message"]["content"], None
+        for index in range(len(reqs)):
+            if index not in seen:
+                yield index, None, f"batch {job.status}: no result"
+
+    def stream(self, req: GenerationRequest) -> Iterator[str]:
+        started = time.perf_counter()
+        stream = self.client.chat.completions.create(
+            model=self.model, messages=self._messages(req), stream=True,
+            stream_options={"include_usage": True}, **self._cache_options(req))
+        try:
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+                # The usage chunk comes last, with no choices.
+                self._record_completion_usage(started, getattr(chunk, "usage", None))
+        finally:
+            stream.close()
+
+    def warm_up(self) -> None:
+        self.client.models.retrieve(self.model)
+
+
+class MockProvider(ProviderAdapter):
+    """
+    Local, deterministic provider for tests and offline benchmarks. Replies
+    with an add_block patch echoing the prompt, after an optional simulated
+    latency.
+    """
+    name = "mock"
+    display_name = "Mock"
+
+    def __init__(self, model: str = "mock", latency_ms: int = 0):
+        super().__init__(model, api_key="mock")
+        self.latency_ms = latency_ms
+        self._seen_prefixes = set()
+
+    def _record_mock_usage(self, started: float, req: GenerationRequest) -> None:
+        # Simulate a provider prefix cache (~4 chars per token) so the
+        # reporting path can be exercised offline.
+        prefix, _ = req.user_parts()
+        key = req.prefix_key()
+        cached = (len(req.system_prompt) + len(prefix)) // 4 if key in self._seen_prefixes else 0
+        self._seen_prefixes.add(key)
+        self._record_usage(started, (len(req.system_prompt) + len(req.user_message)) // 4, cached)
+
+    def _create_client(self):
+        return object()
+
+    def _reply(self, req: GenerationRequest) -> str:
+        summary = " ".join(str(req.prompt or "").split())[:60]
+        return (
+            "```yaml\n"
+            "# VibeSpec: 1.6\n"
+            "patch_type: add_block\n"
+            f"file: {req.filename or 'unspecified_file.py'}\n"
+            "position: end\n"
+            "--- code: |\n"
+            f"    # mock patch: {summary}\n"
+            "```"
+        )
+
+    def generate(self, req: GenerationRequest) -> str:
+        started = time.perf_counter()
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        self._record_mock_usage(started, req)
+        return self._reply(req)
+
+    supports_batch = True
+
+    def batch_generate(self, reqs: List[GenerationRequest],
+                       poll_seconds: float = DEFAULT_BATCH_POLL_SECONDS,
+                       timeout: float = 24 * 3600) -> Iterator[BatchResult]:
+        for i, req in enumerate(reqs):
+            yield i, self.generate(req), None
+
+    def stream(self, req: GenerationRequest) -> Iterator[str]:
+        started = time.perf_counter()
+        text = self._reply(req)
+        chunks = [text[i:i + 16] for i in range(0, len(text), 16)]
+        for chunk in chunks:
+            if self.latency_ms:
+                time.sleep(self.latency_ms / 1000 / len(chunks))
+            yield chunk
+        self._record_mock_usage(started, req)
+
+
+class ProviderRegistry:
+    """Name → adapter map shared by all routes."""
+
+    def __init__(self):
+        self._providers: Dict[str, ProviderAdapter] = {}
+
+    def register(self, adapter: ProviderAdapter) -> None:
+        self._providers[adapter.name] = adapter
+
+    def names(self) -> List[str]:
+        return list(self._providers)
+
+    def get(self, name: str) -> ProviderAdapter:
+        """Return a usable adapter or raise ProviderError (400/503)."""
+        adapter = self._providers.get(name)
+        if adapter is None:
+            raise ProviderError(f"Unsupported LLM provider: {name}", 400)
+        if not adapter.configured():
+            raise ProviderError(f"{adapter.display_name} API key not configured on server", 503)
+        return adapter
+
+    def status(self) -> Dict[str, bool]:
+        return {name: adapter.configured() for name, adapter in self._providers.items()}
+
+    def prompt_cache_metrics(self) -> Dict[str, Dict[str, Any]]:
+        return {name: adapter.prompt_cache.metrics()
+                for name, adapter in self._providers.items() if adapter.configured()}
+
+    def warm_up(self, background: bool = True) -> Optional[threading.Thread]:
+        """
+        Create clients for every configured provider and make one cheap
+        call each, so the first real request doesn't pay for connection
+        setup. Failures are logged, never raised.
+        """
+        def run():
+            for adapter in self._providers.values():
+                if not adapter.configured():
+                    continue
+                t0 = time.perf_counter()
+                try:
+                    adapter.warm_up()
+                    logging.info(f"{adapter.display_name} warm-up done in "
+                                 f"{(time.perf_counter() - t0) * 1000:.0f} ms.")
+                except Exception as e:
+                    logging.warning(f"{adapter.display_name} warm-up failed: {e}")
+
+        if not background:
+            run()
+            return None
+        thread = threading.Thread(target=run, name="llm-warmup", daemon=True)
+        thread.start()
+        return thread
+
+
+def build_registry(keys: Dict[str, Optional[str]], models: Dict[str, str],
+                   mock_enabled: bool = False, mock_latency_ms: int = 0,
+                   timeout: Optional[float] = None,
+                   read_timeout: Optional[float] = None) -> ProviderRegistry:
+    """The standard registry: Gemini, Anthropic, OpenAI and (optionally) mock."""
+    registry = ProviderRegistry()
+    registry.register(GeminiProvider(models["gemini"], keys.get("gemini"), timeout, read_timeout))
+    registry.register(AnthropicProvider(models["anthropic"], keys.get("anthropic"), timeout, read_timeout))
+    registry.register(OpenAIProvider(models["openai"], keys.get("openai"), timeout, read_timeout))
+    if mock_enabled:
+        registry.register(MockProvider(models.get("mock", "mock"), mock_latency_ms))
+    return registry
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+vibe_session.py
+
+Server-side preview sessions for /apply.
+
+A session records, for each file a previewed patch touched, the content
+the preview was computed from (its text and hash, the /file ETag) and the
+preview as a line edit of that text (see vibe_journal), so each file is
+held once. Committing a session therefore only needs its id; the file
+contents never travel back from the browser. Further patches can be
+applied on top of a session, and its files committed one at a time or
+all together; committed files leave the session, and a session with none
+left is discarded. Sessions expire `ttl` seconds after they were last
+used.
+
+If a file changed on disk after it was previewed, `rebase()` replays the
+preview's edits onto the new content with a line-based three-way merge:
+edits to different parts of the file combine, and edits to the same
+lines are reported as conflicts.
+
+With a `directory`, each session is a JSON file there, so every
+`server.py --workers N` process sees the same sessions; otherwise they
+are kept in memory.
+"""
+import difflib
+import json
+import os
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from vibe_journal import apply_edit, file_edit
+
+DEFAULT_TTL = 30 * 60
+DEFAULT_MAX_SESSIONS = 256
+
+Session = Dict[str, Any]
+
+
+def preview_file(base: Optional[str], base_text: Optional[str],
+                 text: Optional[str]) -> Dict[str, Any]:
+    """A session's entry for one file: its base and the preview as an edit of it."""
+    return {"base": base, "base_text": base_text, "edit": file_edit("", base_text, text)}
+
+
+def preview_text(entry: Dict[str, Any]) -> Optional[str]:
+    """The previewed text of a session file (None: the file would not exist)."""
+    return apply_edit(entry["edit"], entry["base_text"])
+
+
+def _changes(base: List[str], other: List[str]) -> List[Tuple[int, int, List[str]]]:
+    """(start, end, replacement) line ranges of `base` that `other` changed."""
+    matcher = difflib.SequenceMatcher(None, base, other, autojunk=False)
+    return [(i1, i2, other[j1:j2]) for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+            if tag != "equal"]
+
+
+def _overlap(a: Tuple[int, int, List[str]], b: Tuple[int, int, List[str]]) -> bool:
+    if a[0] < b[1] and b[0] < a[1]:
+        return True
+    # Two insertions at one point have no defined order.
+    return a[0] == a[1] == b[0] == b[1]
+
+
+def rebase(base: str, ours: str, theirs: str) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+    """
+    Three-way merge of `ours` (the preview) and `theirs` (what is on disk
+    now), both derived from `base`. Returns (merged text, []) or, if the
+    two touch the same lines differently, (None, conflicts) where each
+    conflict gives the 1-based base line range and both sides' lines.
+    """
+    base_lines = base.splitlines(keepends=True)
+    mine = _changes(base_lines, ours.splitlines(keepends=True))
+    other = _changes(base_lines, theirs.splitlines(keepends=True))
+    conflicts = []
+    merged = list(other)
+    for change in mine:
+        if change in other:
+            continue  # the same edit was made on disk
+        clashes = [c for c in other if _overlap(change, c)]
+        if clashes:
+            start = min([change[0]] + [c[0] for c in clashes])
+            end = max([change[1]] + [c[1] for c in clashes])
+            conflicts.append({"base": [start + 1, end], "ours": change[2],
+                              "theirs": [line for c in clashes for line in c[2]]})
+        else:
+            merged.append(change)
+    if conflicts:
+        return None, conflicts
+    # Back to front; at one position an insertion goes before a replacement.
+    for start, end, lines in sorted(merged, key=lambda c: (c[0], c[1]), reverse=True):
+        base_lines[start:end] = lines
+    return "".join(base_lines), []
+
+
+class SessionStore:
+    """Preview sessions by id, expired after `ttl` seconds without use."""
+
+    def __init__(self, directory: Optional[Path] = None, ttl: int = DEFAULT_TTL,
+                 max_sessions: int = DEFAULT_MAX_SESSIONS):
+        self.directory = Path(directory) if directory else None
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._memory: "OrderedDict[str, Session]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"created": 0, "expired": 0, "evicted": 0}
+
+    def create(self) -> Session:
+        """A new, empty session (stored once it is first saved)."""
+        now = time.time()
+        with self._lock:
+            self.stats["created"] += 1
+        return {"id": secrets.token_hex(16), "created": now, "expires": now + self.ttl,
+                "patches": 0, "files": {}}
+
+    def _path(self, session_id: str) -> Path:
+        return self.directory / f"{session_id}.json"
+
+    def get(self, session_id: str) -> Optional[Session]:
+        """The session, or None if it is unknown or has expired."""
+        if not session_id or not re.fullmatch(r"[0-9a-f]{32}", session_id):
+            return None
+        with self._lock:
+            if self.directory is None:
+                session = self._memory.get(session_id)
+            else:
+                try:
+                    session = json.loads(self._path(session_id).read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    session = None
+            if session is not None and session["expires"] < time.time():
+                self.stats["expired"] += 1
+                self._remove(session_id)
+                return None
+        return session
+
+    def save(self, session: Session) -> None:
+        """Store `session` and extend its lifetime by `ttl`."""
+        session["expires"] = time.time() + self.ttl
+        with self._lock:
+            if self.directory is None:
+                self._memory[session["id"]] = session
+                self._memory.move_to_end(session["id"])
+            else:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                path = self._path(session["id"])
+                tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp.write_text(json.dumps(session), encoding="utf-8")
+                os.replace(tmp, path)
+            self._prune()
+
+    def discard(self, session_id: str) -> bool:
+        if not session_id or not re.fullmatch(r"[0-9a-f]{32}", session_id):
+            return False
+        with self._lock:
+            return self._remove(session_id)
+
+    def _remove(self, session_id: str) -> bool:
+        if self.directory is None:
+            return self._memory.pop(session_id, None) is not None
+        try:
+            self._path(session_id).unlink()
+            return True
+        except OSError:
+            return False
+
+    def _prune(self) -> None:
+        """Drop expired sessions, then the least recently used beyond the limit."""
+        now = time.time()
+        if self.directory is None:
+            for sid in [sid for sid, s in self._memory.items() if s["expires"] < now]:
+                del self._memory[sid]
+                self.stats["expired"] += 1
+            while len(self._memory) > self.max_sessions:
+                self._memory.popitem(last=False)
+                self.stats["evicted"] += 1
+            return
+        # A session file's mtime is when it was last saved.
+        files = []
+        for path in self.directory.glob("*.json"):
+            try:
+                files.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+        files.sort()
+        excess = len(files) - self.max_sessions
+        for i, (mtime, path) in enumerate(files):
+            expired = mtime + self.ttl < now
+            if not expired and i >= excess:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            self.stats["expired" if expired else "evicted"] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            m = dict(self.stats)
+            if self.directory is None:
+                m["sessions"] = len(self._memory)
+            else:
+                m["sessions"] = len(list(self.directory.glob("*.json"))) if self.directory.is_dir() else 0
+        m["shared"] = self.directory is not None
+        return m
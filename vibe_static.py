@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+vibe_static.py
+
+Precompressed, content-addressed static assets for the Vibe UI (Monaco).
+
+`StaticAssets` hashes each file under a root directory and keeps gzip and
+(when the optional `brotli` package is installed) brotli variants in a
+cache directory, named by content hash, so each asset version is
+compressed once rather than per request or per restart. server.py's
+/static route uses `lookup()` to pick a variant, answers If-None-Match
+with 304 from the cached hash without reading the file, and marks URLs
+carrying the current `version()` as immutable.
+
+Build the variants ahead of time (e.g. when packaging) with:
+
+    python vibe_static.py [static_dir]
+"""
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+COMPRESSIBLE_SUFFIXES = {".js", ".css", ".html", ".json", ".map", ".svg", ".txt", ".md", ".ttf"}
+MIN_COMPRESS_BYTES = 1024
+# Variants that don't save at least this fraction are not worth serving.
+MIN_SAVING = 0.1
+# Preference order when the client accepts several encodings.
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+class Asset:
+    """One static file: its content hash and where its variants live."""
+
+    __slots__ = ("path", "size", "mtime_ns", "digest", "mimetype", "variants")
+
+    def __init__(self, path: Path, size: int, mtime_ns: int, digest: str,
+                 variants: Dict[str, Path]):
+        self.path = path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.digest = digest
+        self.mimetype = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        self.variants = variants
+
+    def etag(self, encoding: str = "identity") -> str:
+        # Strong ETags must differ per representation.
+        return self.digest if encoding == "identity" else f"{self.digest}-{encoding}"
+
+    def matches(self, etags: Iterable[str]) -> bool:
+        """True if any If-None-Match tag names this content in any encoding."""
+        return any(tag == self.digest or tag.startswith(self.digest + "-") for tag in etags)
+
+    def negotiate(self, accepted: Iterable[str]) -> Tuple[str, Path]:
+        """(encoding, path) of the best variant the client accepts."""
+        accepted = set(accepted)
+        for encoding, _ in ENCODINGS:
+            path = self.variants.get(encoding)
+            if encoding in accepted and path is not None and path.is_file():
+                return encoding, path
+        return "identity", self.path
+
+
+class StaticAssets:
+    """Content-hash manifest of a static directory plus its compressed variants."""
+
+    def __init__(self, root: Path, cache_dir: Path):
+        self.root = Path(root).resolve()
+        self.cache_dir = Path(cache_dir)
+        self._assets: Dict[str, Asset] = {}
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def lookup(self, rel_path: str) -> Optional[Asset]:
+        """The asset at `rel_path`, re-hashed only when its size or mtime changed."""
+        path = (self.root / rel_path).resolve()
+        if not path.is_relative_to(self.root):
+            return None
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        if not path.is_file():
+            return None
+        key = path.relative_to(self.root).as_posix()
+        with self._lock:
+            asset = self._assets.get(key)
+        if asset is not None and (asset.size, asset.mtime_ns) == (st.st_size, st.st_mtime_ns):
+            return asset
+        asset = self._scan(path, st)
+        with self._lock:
+            if key in self._assets:
+                self._version = None
+            self._assets[key] = asset
+        return asset
+
+    def _scan(self, path: Path, st: os.stat_result) -> Asset:
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                sha.update(block)
+        digest = sha.hexdigest()[:20]
+        variants = {}
+        if path.suffix.lower() in COMPRESSIBLE_SUFFIXES and st.st_size >= MIN_COMPRESS_BYTES:
+            variants = {encoding: self.cache_dir / f"{digest}{suffix}" for encoding, suffix in ENCODINGS}
+        return Asset(path, st.st_size, st.st_mtime_ns, digest, variants)
+
+    def files(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in sorted(filenames):
+                yield (Path(dirpath) / name).relative_to(self.root).as_posix()
+
+    def version(self) -> str:
+        """Hash over every asset's content hash; changes whenever any asset does."""
+        with self._lock:
+            if self._version is not None:
+                return self._version
+        digests = sorted(f"{rel}:{asset.digest}" for rel in self.files()
+                         if (asset := self.lookup(rel)) is not None)
+        version = hashlib.sha256("\n".join(digests).encode("utf-8")).hexdigest()[:12]
+        with self._lock:
+            self._version = version
+        return version
+
+    def build(self) -> int:
+        """Write missing gzip/brotli variants for every asset; returns how many were written."""
+        written = 0
+        for rel in self.files():
+            asset = self.lookup(rel)
+            if asset is not None and asset.variants:
+                written += self._compress(asset)
+        self.version()
+        if written:
+            logging.info(f"Static assets: wrote {written} compressed variant(s) to {self.cache_dir}.")
+        return written
+
+    def _compress(self, asset: Asset) -> int:
+        written = 0
+        data = None
+        for encoding, path in list(asset.variants.items()):
+            if path.is_file() or path.with_suffix(path.suffix + ".skip").is_file():
+                continue
+            if encoding == "br" and brotli is None:
+                continue
+            if data is None:
+                data = asset.path.read_bytes()
+            if encoding == "br":
+                compressed = brotli.compress(data, quality=11)
+            else:
+                compressed = gzip.compress(data, compresslevel=9, mtime=0)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            if len(compressed) > len(data) * (1 - MIN_SAVING):
+                # Remember the verdict so restarts don't recompress.
+                path.with_suffix(path.suffix + ".skip").touch()
+                continue
+            tmp = path.with_suffix(path.suffix + f".{os.getpid()}.tmp")
+            tmp.write_bytes(compressed)
+            os.replace(tmp, path)
+            written += 1
+        return written
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    root = Path(sys.argv[1] if len(sys.argv) > 1 else Path(__file__).parent / "static")
+    assets = StaticAssets(root, root.parent / ".vibe_cache" / "static")
+    assets.build()
+    print(f"{root}: version {assets.version()}, brotli {'on' if brotli else 'off'}")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+vibe_store.py
+
+Small key/value cache shared by server worker processes.
+
+Values are JSON-serialisable and live under a namespace ("autopep8",
+"patches", "versions", ...). Every process keeps a bounded in-memory LRU;
+when a `path` is given, entries are also written to a SQLite file, so
+workers started with `server.py --workers N` reuse each other's results.
+Keys are expected to be content hashes (or include everything the value
+depends on), so entries never need invalidating, only evicting.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+DEFAULT_MEMORY_ENTRIES = 2048
+DEFAULT_MAX_ENTRIES = 20000
+# Run size-based eviction on SQLite every N writes.
+PRUNE_EVERY = 256
+
+
+class SharedStore:
+    """In-process LRU in front of an optional SQLite file."""
+
+    def __init__(self, path: Optional[Path] = None,
+                 memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = Path(path) if path else None
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._writes = 0
+        self.stats = {"memory_hits": 0, "shared_hits": 0, "misses": 0, "stores": 0}
+
+    def _db(self) -> Optional[sqlite3.Connection]:
+        if self.path is None:
+            return None
+        # A connection must never cross a fork.
+        if self._conn is None or self._conn_pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " ns TEXT, key TEXT, value TEXT, accessed REAL,"
+                " PRIMARY KEY (ns, key))")
+            conn.commit()
+            self._conn, self._conn_pid = conn, os.getpid()
+        return self._conn
+
+    def _remember(self, mkey: tuple, raw: str) -> None:
+        self._memory[mkey] = raw
+        self._memory.move_to_end(mkey)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        mkey = (namespace, key)
+        with self._lock:
+            raw = self._memory.get(mkey)
+            if raw is not None:
+                self._memory.move_to_end(mkey)
+                self.stats["memory_hits"] += 1
+                return json.loads(raw)
+            db = self._db()
+            row = None
+            if db is not None:
+                try:
+                    row = db.execute("SELECT value FROM entries WHERE ns = ? AND key = ?",
+                                     (namespace, key)).fetchone()
+                except sqlite3.Error:
+                    row = None
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["shared_hits"] += 1
+            self._remember(mkey, row[0])
+        return json.loads(row[0])
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        raw = json.dumps(value)
+        with self._lock:
+            self._remember((namespace, key), raw)
+            self.stats["stores"] += 1
+            db = self._db()
+            if db is None:
+                return
+            try:
+                db.execute("INSERT OR REPLACE INTO entries (ns, key, value, accessed)"
+                           " VALUES (?, ?, ?, ?)", (namespace, key, raw, time.time()))
+                self._writes += 1
+                if self._writes % PRUNE_EVERY == 0:
+                    self._prune(db)
+                db.commit()
+            except sqlite3.Error:
+                # The shared file is an optimisation; losing a write is fine.
+                pass
+
+    def _prune(self, db: sqlite3.Connection) -> None:
+        count = db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        if count > self.max_entries:
+            db.execute(
+                "DELETE FROM entries WHERE rowid IN ("
+                " SELECT rowid FROM entries ORDER BY accessed ASC LIMIT ?)",
+                (count - self.max_entries,))
+
+    def get_or_compute(self, namespace: str, key: str, compute: Callable[[], Any]) -> Any:
+        value = self.get(namespace, key)
+        if value is None:
+            value = compute()
+            self.set(namespace, key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            db = self._db()
+            if db is not None:
+                db.execute("DELETE FROM entries")
+                db.commit()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            s = dict(self.stats)
+            s["memory_entries"] = len(self._memory)
+        lookups = s["memory_hits"] + s["shared_hits"] + s["misses"]
+        hits = s["memory_hits"] + s["shared_hits"]
+        s["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        s["shared"] = self.path is not None
+        s["pid"] = os.getpid()
+        return s
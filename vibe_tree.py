@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+vibe_tree.py
+
+Lazy, cached directory listings of the workspace for the /tree endpoint.
+
+Only the directory being expanded is read, with a single `os.scandir`
+pass, so browsing a huge monorepo costs one directory at a time. Each
+listing is cached until the directory's mtime (or a .gitignore that
+applies to it) changes. Entries matched by .gitignore, and the
+directories the symbol index skips (VCS internals, VibeBackups, caches),
+are left out.
+"""
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from vibe_index import SKIP_DIRS
+
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+# Directory listings kept in memory.
+MAX_CACHED_DIRS = 4096
+
+
+def _translate(pattern: str) -> str:
+    """Regex for one gitignore glob, matched against a '/'-separated path."""
+    out, i = [], 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 1:]:
+            end = pattern.index("]", i + 1)
+            body = pattern[i + 1:end].replace("\\", "\\\\")
+            out.append("[^" + body[1:] + "]" if body.startswith("!") else "[" + body + "]")
+            i = end + 1
+        elif pattern[i] == "\\" and i + 1 < len(pattern):
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(out)
+
+
+class IgnoreRules:
+    """The patterns of one .gitignore, relative to the directory holding it."""
+
+    def __init__(self, text: str):
+        self.rules: List[Tuple[re.Pattern, bool, bool]] = []  # (regex, negated, dir_only)
+        for line in text.splitlines():
+            line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            # A slash anywhere but the end anchors the pattern to this directory.
+            anchored = "/" in line
+            line = line.lstrip("/")
+            prefix = "" if anchored else "(?:.*/)?"
+            self.rules.append((re.compile(f"^{prefix}{_translate(line)}$"), negated, dir_only))
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """True if ignored, False if re-included by a `!` rule, None if no rule applies."""
+        verdict = None
+        for regex, negated, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                verdict = not negated
+        return verdict
+
+
+class WorkspaceTree:
+    """Per-directory listings of `base_dir`, cached by mtime."""
+
+    def __init__(self, base_dir: Path):
+        self.base_dir = Path(base_dir).resolve()
+        self._listings: "OrderedDict[str, Tuple[tuple, List[Dict[str, Any]]]]" = OrderedDict()
+        self._rules: Dict[Path, Tuple[int, IgnoreRules]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "scans": 0}
+
+    def _ignore_file(self, path: Path) -> Tuple[int, Optional[IgnoreRules]]:
+        """(mtime_ns, rules) for an ignore file; (0, None) if it doesn't exist."""
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            return 0, None
+        with self._lock:
+            cached = self._rules.get(path)
+        if cached is None or cached[0] != mtime:
+            try:
+                rules = IgnoreRules(path.read_text(encoding="utf-8", errors="replace"))
+            except OSError:
+                return 0, None
+            cached = (mtime, rules)
+            with self._lock:
+                self._rules[path] = cached
+        return cached
+
+    def _rule_chain(self, rel_dir: str) -> List[Tuple[str, int, IgnoreRules]]:
+        """(directory the rules are relative to, mtime, rules), root first."""
+        chain = []
+        mtime, rules = self._ignore_file(self.base_dir / ".git" / "info" / "exclude")
+        if rules is not None:
+            chain.append(("", mtime, rules))
+        parts = [p for p in rel_dir.split("/") if p]
+        for depth in range(len(parts) + 1):
+            owner = "/".join(parts[:depth])
+            mtime, rules = self._ignore_file(self.base_dir / owner / ".gitignore")
+            if rules is not None:
+                chain.append((owner, mtime, rules))
+        return chain
+
+    def _ignored(self, chain, rel_path: str, is_dir: bool) -> bool:
+        ignored = False
+        for owner, _, rules in chain:
+            sub = rel_path[len(owner) + 1:] if owner else rel_path
+            verdict = rules.match(sub, is_dir)
+            if verdict is not None:
+                ignored = verdict
+        return ignored
+
+    def resolve(self, rel_dir: str) -> Optional[Path]:
+        """The directory for `rel_dir`, or None if it is missing or outside base_dir."""
+        path = (self.base_dir / rel_dir).resolve()
+        if not path.is_relative_to(self.base_dir) or not path.is_dir():
+            return None
+        return path
+
+    def list_dir(self, rel_dir: str = "", cursor: int = 0,
+                 limit: int = DEFAULT_PAGE_SIZE) -> Optional[Dict[str, Any]]:
+        """
+        One page of a directory: directories first, then files, each
+        sorted case-insensitively. `next_cursor` is None on the last page.
+        Returns None if `rel_dir` is not a directory under base_dir.
+        """
+        path = self.resolve(rel_dir)
+        if path is None:
+            return None
+        rel_dir = path.relative_to(self.base_dir).as_posix()
+        rel_dir = "" if rel_dir == "." else rel_dir
+        entries = self._entries(path, rel_dir)
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        cursor = max(0, cursor)
+        end = cursor + limit
+        # Sizes cost a stat() each, so only the page being shown pays. They
+        # go on copies: an in-place edit doesn't touch the directory's
+        # mtime, so a size stored in the cached listing would go stale.
+        page = [dict(entry) for entry in entries[cursor:end]]
+        for entry in page:
+            if entry["type"] == "file":
+                try:
+                    entry["size"] = (path / entry["name"]).stat().st_size
+                except OSError:
+                    entry["size"] = None
+        return {"path": rel_dir, "entries": page, "total": len(entries),
+                "next_cursor": end if end < len(entries) else None}
+
+    def _entries(self, path: Path, rel_dir: str) -> List[Dict[str, Any]]:
+        chain = self._rule_chain(rel_dir)
+        stamp = (path.stat().st_mtime_ns, tuple((owner, mtime) for owner, mtime, _ in chain))
+        with self._lock:
+            cached = self._listings.get(rel_dir)
+            if cached is not None and cached[0] == stamp:
+                self._listings.move_to_end(rel_dir)
+                self.stats["hits"] += 1
+                return cached[1]
+        dirs, files = [], []
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+                if is_dir and (entry.name in SKIP_DIRS or entry.name.endswith(".egg-info")):
+                    continue
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                if self._ignored(chain, rel_path, is_dir):
+                    continue
+                if is_dir:
+                    dirs.append({"name": entry.name, "path": rel_path, "type": "dir"})
+                else:
+                    files.append({"name": entry.name, "path": rel_path, "type": "file"})
+        dirs.sort(key=lambda e: e["name"].lower())
+        files.sort(key=lambda e: e["name"].lower())
+        entries = dirs + files
+        with self._lock:
+            self.stats["scans"] += 1
+            self._listings[rel_dir] = (stamp, entries)
+            self._listings.move_to_end(rel_dir)
+            while len(self._listings) > MAX_CACHED_DIRS:
+                self._listings.popitem(last=False)
+        return entries
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+vibe_watch.py
+
+Change notifications for the files open in the UI (server.py's /events).
+
+`FileWatcher` keeps a reference-counted set of watched files shared by
+all subscribers and a single background thread. On Linux it uses inotify
+(through ctypes; no extra package) on the files' parent directories, so
+replace-by-rename saves, `git checkout` and deletions are all seen;
+elsewhere, or if inotify is unavailable, it falls back to polling
+`stat()`. A change is only reported when the file's content hash (from
+the `fingerprint` callable, e.g. the /file ETag) actually differs.
+"""
+import ctypes
+import ctypes.util
+import logging
+import os
+import queue
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+DEFAULT_POLL_INTERVAL = 1.0
+# Writes arrive as bursts of events; wait this long for a burst to settle.
+SETTLE_SECONDS = 0.05
+
+# inotify(7)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_IGNORED = 0x00008000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM |
+              IN_MOVED_TO | IN_CREATE | IN_DELETE)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Minimal ctypes binding: directory watches and event reads."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, directory: Path) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read(self, timeout: float) -> List[Tuple[int, int, str]]:
+        """(wd, mask, name) events, waiting at most `timeout` seconds."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        data = os.read(self.fd, 64 * 1024)
+        events, offset = [], 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class Subscription:
+    """One client's view: the files it watches and a queue of their changes."""
+
+    def __init__(self, paths: Iterable[Path]):
+        self.paths: Set[Path] = set(paths)
+        self.events: "queue.Queue[Tuple[Path, Optional[str]]]" = queue.Queue()
+
+    def get(self, timeout: float) -> Optional[Tuple[Path, Optional[str]]]:
+        """Next (path, new hash or None if deleted), or None after `timeout`."""
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class FileWatcher:
+    """Shared watcher; subscribers get (path, hash) events for their files."""
+
+    def __init__(self, fingerprint: Callable[[Path], Optional[str]],
+                 poll_interval: float = DEFAULT_POLL_INTERVAL, use_inotify: bool = True):
+        self.fingerprint = fingerprint
+        self.poll_interval = poll_interval
+        self._use_inotify = use_inotify and sys.platform.startswith("linux")
+        self._lock = threading.Lock()
+        self._subs: List[Subscription] = []
+        # path -> (subscriber count, last known hash, last stat stamp)
+        self._files: Dict[Path, List] = {}
+        self._dir_watches: Dict[Path, int] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._inotify: Optional[_Inotify] = None
+        self.backend = "poll"
+        self.stats = {"changes": 0, "checks": 0}
+
+    def _stamp(self, path: Path):
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        if self._use_inotify and self._inotify is None:
+            try:
+                self._inotify = _Inotify()
+                self.backend = "inotify"
+            except (OSError, AttributeError) as e:
+                logging.info(f"inotify unavailable ({e}); polling for file changes.")
+                self._use_inotify = False
+        self._thread = threading.Thread(target=self._run, name="vibe-file-watcher", daemon=True)
+        self._thread.start()
+
+    def subscribe(self, paths: Iterable[Path]) -> Subscription:
+        sub = Subscription(paths)
+        # Hash new files before taking the lock, as _check() does, so other
+        # subscribers and the watcher thread don't wait on large files.
+        # Stat first: a change made while hashing then shows up as a new
+        # stamp on the next check.
+        with self._lock:
+            new = [path for path in sub.paths if path not in self._files]
+        initial = {}
+        for path in new:
+            stamp = self._stamp(path)
+            initial[path] = (self.fingerprint(path), stamp)
+        with self._lock:
+            self._start()
+            self._subs.append(sub)
+            for path in sub.paths:
+                entry = self._files.get(path)
+                if entry is not None:
+                    entry[0] += 1
+                    continue
+                if path not in initial:
+                    # Unsubscribed by its last watcher meanwhile; that hash is stale.
+                    initial[path] = (None, None)
+                digest, stamp = initial[path]
+                self._files[path] = [1, digest, stamp]
+                self._watch_dir(path.parent)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            if sub not in self._subs:
+                return
+            self._subs.remove(sub)
+            for path in sub.paths:
+                entry = self._files.get(path)
+                if entry is None:
+                    continue
+                entry[0] -= 1
+                if entry[0] <= 0:
+                    del self._files[path]
+                    if not any(p.parent == path.parent for p in self._files):
+                        self._unwatch_dir(path.parent)
+
+    def current(self, path: Path) -> Optional[str]:
+        """Last known hash of a watched file."""
+        with self._lock:
+            entry = self._files.get(path)
+            if entry:
+                return entry[1]
+        return self.fingerprint(path)
+
+    def _watch_dir(self, directory: Path) -> None:
+        if self._inotify is None or directory in self._dir_watches:
+            return
+        try:
+            self._dir_watches[directory] = self._inotify.add_watch(directory)
+        except OSError as e:
+            # The poll pass below still covers files in this directory.
+            logging.warning(f"Cannot watch {directory}: {e}")
+
+    def _unwatch_dir(self, directory: Path) -> None:
+        wd = self._dir_watches.pop(directory, None)
+        if wd is not None and self._inotify is not None:
+            self._inotify.rm_watch(wd)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                if self._inotify is not None:
+                    self._wait_inotify()
+                else:
+                    time.sleep(self.poll_interval)
+                    with self._lock:
+                        candidates = list(self._files)
+                    self._check(candidates)
+            except Exception:
+                logging.error("File watcher iteration failed", exc_info=True)
+                time.sleep(self.poll_interval)
+
+    def _wait_inotify(self) -> None:
+        events = self._inotify.read(timeout=self.poll_interval)
+        if not events:
+            # Files in directories we could not watch are polled instead.
+            with self._lock:
+                unwatched = [p for p in self._files if p.parent not in self._dir_watches]
+            self._check(unwatched)
+            return
+        time.sleep(SETTLE_SECONDS)
+        events += self._inotify.read(timeout=0)
+        with self._lock:
+            by_wd = {wd: d for d, wd in self._dir_watches.items()}
+            candidates = {by_wd[wd] / name for wd, mask, name in events
+                          if wd in by_wd and name and not mask & IN_IGNORED}
+            candidates = [p for p in candidates if p in self._files]
+        self._check(candidates)
+
+    def _check(self, paths: Iterable[Path]) -> None:
+        for path in paths:
+            stamp = self._stamp(path)
+            with self._lock:
+                entry = self._files.get(path)
+                self.stats["checks"] += 1
+                if entry is None or entry[2] == stamp:
+                    continue
+                entry[2] = stamp
+            digest = self.fingerprint(path) if stamp is not None else None
+            with self._lock:
+                entry = self._files.get(path)
+                if entry is None or entry[1] == digest:
+                    continue
+                entry[1] = digest
+                self.stats["changes"] += 1
+                subs = [s for s in self._subs if path in s.paths]
+            for sub in subs:
+                sub.events.put((path, digest))
+
+    def metrics(self) -> Dict[str, object]:
+        with self._lock:
+            return {"backend": self.backend, "watched_files": len(self._files),
+                    "watched_dirs": len(self._dir_watches), "subscribers": len(self._subs),
+                    **self.stats}